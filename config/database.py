@@ -14,6 +14,7 @@ from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 import json
 
@@ -445,6 +446,75 @@ class DatabaseManager:
             self.connection.rollback()
             return False
 
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one cursor and commit them together"""
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                yield cursor
+                self.connection.commit()
+            except Exception as e:
+                logger.error(f"Transaction rolled back: {e}")
+                self.connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def max_rows_per_insert(self, column_count: int) -> int:
+        """Rows that fit in one multi-row INSERT for this driver"""
+        # SQL Server: 2100 parameters and 1000 row constructors per statement
+        # SQLite: 999 host parameters on older builds
+        max_params = 2000 if self.db_type == "mssql" else 999
+        return max(1, min(1000, max_params // max(1, column_count)))
+
+    def insert_rows(
+        self,
+        cursor,
+        table: str,
+        columns: List[str],
+        rows: List[tuple],
+        output_columns: List[str] = None,
+    ) -> List[tuple]:
+        """Multi-row INSERT in driver-sized chunks on an open cursor
+
+        When ``output_columns`` is given the inserted values of those columns
+        (typically the identity plus a natural key) are returned for every
+        row, so callers can remap generated IDs in bulk.
+        """
+        if not rows:
+            return []
+
+        column_list = ", ".join(columns)
+        row_placeholder = "(" + ", ".join("?" for _ in columns) + ")"
+        chunk_size = self.max_rows_per_insert(len(columns))
+        returned = []
+
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset : offset + chunk_size]
+            values = ", ".join(row_placeholder for _ in chunk)
+            params = [value for row in chunk for value in row]
+
+            if output_columns and self.db_type == "mssql":
+                output = ", ".join(f"INSERTED.{col}" for col in output_columns)
+                query = (
+                    f"INSERT INTO {table} ({column_list}) OUTPUT {output} "
+                    f"VALUES {values}"
+                )
+            elif output_columns:
+                query = (
+                    f"INSERT INTO {table} ({column_list}) VALUES {values} "
+                    f"RETURNING {', '.join(output_columns)}"
+                )
+            else:
+                query = f"INSERT INTO {table} ({column_list}) VALUES {values}"
+
+            cursor.execute(query, params)
+            if output_columns:
+                returned.extend(tuple(row) for row in cursor.fetchall())
+
+        return returned
+
     def backup_database(self, backup_path: str = None) -> bool:
         """Create database backup"""
         try:
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+modules/activity_store.py
+SDX Project Manager - Time-Bucketed Activity Store
+Append-only project/task activity with monthly partitions, hot retention and archive compaction
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Union
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+
+# Activity streams: base table and the entity column it is keyed by
+ACTIVITY_STREAMS = {
+    "project": ("ProjectActivity", "ProjectID"),
+    "task": ("TaskActivity", "TaskID"),
+}
+
+
+def _month_start(value: Union[date, datetime]) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _shift_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class ActivityStore:
+    """Append-only activity log split into monthly buckets
+
+    SQLite keeps one table per month (``ProjectActivity_202610``); SQL Server
+    keeps the base table on a monthly partition scheme. Recent-activity reads
+    only scan the hot window (the last ``hot_months`` months, newest bucket
+    first), and ``compact`` moves older buckets into ``<Base>Archive``.
+    """
+
+    ARCHIVE_BATCH_SIZE = 5000
+
+    def __init__(self, db_manager, stream: str = "project", hot_months: int = 3):
+        if stream not in ACTIVITY_STREAMS:
+            raise ValueError(f"Unknown activity stream: {stream}")
+
+        self.db = db_manager
+        self.stream = stream
+        self.base_table, self.entity_column = ACTIVITY_STREAMS[stream]
+        self.archive_table = f"{self.base_table}Archive"
+        self.hot_months = max(1, hot_months)
+        self.columns = [
+            self.entity_column,
+            "UserID",
+            "ActivityType",
+            "Description",
+            "ActivityDate",
+        ]
+        self._buckets: Optional[set] = None
+        # Buckets created on a caller's cursor; cached only once seen committed
+        self._unconfirmed: set = set()
+        self._archive_ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def partitioned_tables(self) -> bool:
+        """SQL Server partitions the base table instead of splitting tables"""
+        return getattr(self.db, "db_type", "mssql") == "mssql"
+
+    # =============================================================================
+    # Writes
+    # =============================================================================
+
+    def append(
+        self,
+        entity_id: int,
+        user_id: int,
+        activity_type: str,
+        description: str,
+        activity_date: Optional[datetime] = None,
+    ) -> bool:
+        """Append one activity record to its month bucket"""
+        try:
+            activity_date = activity_date or datetime.now()
+            table = self.bucket_for(activity_date)
+            self.db.execute_query(
+                f"""
+                INSERT INTO {table}
+                ({', '.join(self.columns)})
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [entity_id, user_id, activity_type, description, activity_date],
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to append {self.stream} activity: {str(e)}")
+            return False
+
+    def append_many(self, cursor, rows: List[tuple]):
+        """Append rows of (entity_id, user_id, type, description, date) on a cursor"""
+        by_table: Dict[str, List[tuple]] = {}
+        for row in rows:
+            by_table.setdefault(self.bucket_for(row[4], cursor), []).append(row)
+
+        for table, table_rows in by_table.items():
+            self.db.insert_rows(cursor, table, self.columns, table_rows)
+
+    def bucket_for(self, when: Union[date, datetime], cursor=None) -> str:
+        """Table that holds activity for the month of ``when``"""
+        if self.partitioned_tables:
+            return self.base_table
+
+        table = self._bucket_name(_month_start(when))
+        if table not in self._known_buckets():
+            self._create_bucket(table, cursor)
+        return table
+
+    # =============================================================================
+    # Reads
+    # =============================================================================
+
+    def recent(
+        self,
+        entity_id: Optional[int] = None,
+        limit: int = 50,
+        include_archive: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Newest activity for one entity, or across all entities
+
+        Walks hot buckets newest first and stops once ``limit`` rows are found,
+        so a busy current month answers from a single bucket.
+        """
+        try:
+            rows: List[Dict[str, Any]] = []
+            for table in self._read_sources(include_archive):
+                rows.extend(
+                    self._read_table(
+                        table, entity_id, limit - len(rows), not include_archive
+                    )
+                )
+                if len(rows) >= limit:
+                    break
+            return rows[:limit]
+
+        except Exception as e:
+            logger.error(f"Failed to read {self.stream} activity: {str(e)}")
+            return []
+
+    def _read_sources(self, include_archive: bool) -> List[str]:
+        """Tables to scan, newest first"""
+        if self.partitioned_tables:
+            sources = [self.base_table]
+        else:
+            # Cold buckets awaiting compaction are only read for full history
+            cutoff = "" if include_archive else self._bucket_name(self._hot_cutoff())
+            sources = sorted(
+                (b for b in self._known_buckets(refresh=True) if b >= cutoff),
+                reverse=True,
+            )
+        if include_archive:
+            self._ensure_archive()
+            sources.append(self.archive_table)
+        return sources
+
+    def _read_table(
+        self, table: str, entity_id: Optional[int], limit: int, hot_only: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Top rows from one source, with the hot window applied on the base table"""
+        conditions = []
+        params: List[Any] = []
+        if entity_id is not None:
+            conditions.append(f"a.{self.entity_column} = ?")
+            params.append(entity_id)
+        if hot_only and self.partitioned_tables and table == self.base_table:
+            # Lets SQL Server eliminate cold partitions
+            conditions.append("a.ActivityDate >= ?")
+            params.append(self._hot_cutoff())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        if self.partitioned_tables:
+            query = f"""
+                SELECT TOP ({int(limit)}) a.*, u.FirstName + ' ' + u.LastName as UserName
+                FROM {table} a
+                LEFT JOIN Users u ON a.UserID = u.UserID
+                {where}
+                ORDER BY a.ActivityDate DESC
+            """
+        else:
+            query = f"""
+                SELECT a.*, u.FirstName || ' ' || u.LastName as UserName
+                FROM {table} a
+                LEFT JOIN Users u ON a.UserID = u.UserID
+                {where}
+                ORDER BY a.ActivityDate DESC
+                LIMIT {int(limit)}
+            """
+
+        return [dict(row) for row in self.db.fetch_all(query, params)]
+
+    # =============================================================================
+    # Retention and Compaction
+    # =============================================================================
+
+    def compact(self, today: Optional[date] = None) -> int:
+        """Move activity older than the hot window into the archive table"""
+        try:
+            cutoff = self._hot_cutoff(today)
+            started = time.perf_counter()
+            self._ensure_archive()
+
+            if self.partitioned_tables:
+                moved = self._compact_partitions(cutoff)
+            else:
+                moved = self._compact_buckets(cutoff)
+
+            logger.info(
+                f"Compacted {moved} {self.stream} activity rows older than {cutoff} "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            return moved
+
+        except Exception as e:
+            logger.error(f"Failed to compact {self.stream} activity: {str(e)}")
+            return 0
+
+    def _compact_buckets(self, cutoff: date) -> int:
+        """Copy each cold monthly table into the archive and drop it"""
+        column_list = ", ".join(self.columns)
+        cutoff_name = self._bucket_name(cutoff)
+        moved = 0
+
+        buckets = self._known_buckets(refresh=True)
+        for table in sorted(b for b in buckets if b < cutoff_name):
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {self.archive_table} ({column_list}) "
+                    f"SELECT {column_list} FROM {table}"
+                )
+                moved += max(cursor.rowcount, 0)
+                cursor.execute(f"DROP TABLE {table}")
+            with self._lock:
+                self._buckets.discard(table)
+
+        return moved
+
+    def _compact_partitions(self, cutoff: date) -> int:
+        """Move cold rows in batches, then merge the emptied partition ranges"""
+        column_list = ", ".join(self.columns)
+        deleted_columns = ", ".join(f"DELETED.{c}" for c in self.columns)
+        moved = 0
+
+        while True:
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    f"""
+                    DELETE TOP ({self.ARCHIVE_BATCH_SIZE}) FROM {self.base_table}
+                    OUTPUT {deleted_columns} INTO {self.archive_table} ({column_list})
+                    WHERE ActivityDate < ?
+                    """,
+                    [cutoff],
+                )
+                batch = cursor.rowcount
+            moved += max(batch, 0)
+            if batch < self.ARCHIVE_BATCH_SIZE:
+                break
+
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                """
+                SELECT CAST(prv.value AS DATE)
+                FROM sys.partition_range_values prv
+                JOIN sys.partition_functions pf ON prv.function_id = pf.function_id
+                WHERE pf.name = ? AND CAST(prv.value AS DATE) < ?
+                """,
+                [self._partition_function, cutoff],
+            )
+            for (boundary,) in cursor.fetchall():
+                cursor.execute(
+                    f"ALTER PARTITION FUNCTION {self._partition_function}() "
+                    f"MERGE RANGE ('{boundary:%Y-%m-%d}')"
+                )
+
+        return moved
+
+    def maintain_partitions(self, months_ahead: int = 2, today: Optional[date] = None):
+        """Make sure buckets exist for the coming months"""
+        try:
+            current = _month_start(today or date.today())
+            for offset in range(months_ahead + 1):
+                month = _shift_months(current, offset)
+                if self.partitioned_tables:
+                    self._split_partition(month)
+                else:
+                    self.bucket_for(month)
+
+        except Exception as e:
+            logger.error(f"Failed to maintain {self.stream} activity partitions: {str(e)}")
+
+    def migrate_legacy(self) -> int:
+        """Distribute rows from an unbucketed SQLite base table into month buckets"""
+        if self.partitioned_tables:
+            return 0
+
+        try:
+            legacy = self.db.fetch_one(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                [self.base_table],
+            )
+            if not legacy:
+                return 0
+
+            column_list = ", ".join(self.columns)
+            months = self.db.fetch_all(
+                f"SELECT DISTINCT strftime('%Y%m', ActivityDate) as Period "
+                f"FROM {self.base_table} WHERE ActivityDate IS NOT NULL"
+            )
+            moved = 0
+            with self.db.transaction() as cursor:
+                for row in months:
+                    period = row["Period"]
+                    table = self.bucket_for(
+                        date(int(period[:4]), int(period[4:]), 1), cursor
+                    )
+                    cursor.execute(
+                        f"INSERT INTO {table} ({column_list}) SELECT {column_list} "
+                        f"FROM {self.base_table} WHERE strftime('%Y%m', ActivityDate) = ?",
+                        [period],
+                    )
+                    moved += max(cursor.rowcount, 0)
+                cursor.execute(
+                    f"DELETE FROM {self.base_table} WHERE ActivityDate IS NOT NULL"
+                )
+            return moved
+
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy {self.stream} activity: {str(e)}")
+            return 0
+
+    # =============================================================================
+    # Bucket Helpers
+    # =============================================================================
+
+    @property
+    def _partition_function(self) -> str:
+        return f"pf_{self.base_table}Month"
+
+    @property
+    def _partition_scheme(self) -> str:
+        return f"ps_{self.base_table}Month"
+
+    def _hot_cutoff(self, today: Optional[date] = None) -> date:
+        """First day of the oldest hot month"""
+        return _shift_months(_month_start(today or date.today()), 1 - self.hot_months)
+
+    def _bucket_name(self, month: date) -> str:
+        return f"{self.base_table}_{month:%Y%m}"
+
+    def _known_buckets(self, refresh: bool = False) -> set:
+        """Monthly tables that exist, loaded from the catalog
+
+        The catalog is read once, and again on ``refresh`` while a bucket
+        created inside a caller's transaction has not been confirmed.
+        """
+        with self._lock:
+            if self._buckets is None or (refresh and self._unconfirmed):
+                rows = self.db.fetch_all(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+                    [f"{self.base_table}_[0-9][0-9][0-9][0-9][0-9][0-9]"],
+                )
+                self._buckets = {row["name"] for row in rows}
+                self._unconfirmed.clear()
+            return set(self._buckets)
+
+    def _create_bucket(self, table: str, cursor=None):
+        """Create a monthly SQLite table with its entity/date index"""
+        statements = [
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                ActivityID INTEGER PRIMARY KEY AUTOINCREMENT,
+                {self.entity_column} INTEGER NOT NULL,
+                UserID INTEGER,
+                ActivityType VARCHAR(50),
+                Description TEXT,
+                ActivityDate DATETIME NOT NULL
+            )
+            """,
+            f"CREATE INDEX IF NOT EXISTS IX_{table}_Entity "
+            f"ON {table}({self.entity_column}, ActivityDate DESC)",
+            f"CREATE INDEX IF NOT EXISTS IX_{table}_Date ON {table}(ActivityDate DESC)",
+        ]
+        if cursor is not None:
+            # A rollback of the caller's transaction drops the table again,
+            # so the name is not cached until a catalog read confirms it
+            for statement in statements:
+                cursor.execute(statement)
+            with self._lock:
+                self._unconfirmed.add(table)
+            return
+
+        for statement in statements:
+            self.db.execute_query(statement)
+        with self._lock:
+            self._buckets.add(table)
+            self._unconfirmed.discard(table)
+
+    def _ensure_archive(self):
+        """Create the archive table on SQLite (SQL Server ships it in setup.sql)"""
+        if self.partitioned_tables or self._archive_ready:
+            return
+        self.db.execute_query(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.archive_table} (
+                ActivityID INTEGER PRIMARY KEY AUTOINCREMENT,
+                {self.entity_column} INTEGER NOT NULL,
+                UserID INTEGER,
+                ActivityType VARCHAR(50),
+                Description TEXT,
+                ActivityDate DATETIME NOT NULL
+            )
+            """
+        )
+        self.db.execute_query(
+            f"CREATE INDEX IF NOT EXISTS IX_{self.archive_table}_Entity "
+            f"ON {self.archive_table}({self.entity_column}, ActivityDate DESC)"
+        )
+        self._archive_ready = True
+
+    def _split_partition(self, month: date):
+        """Add a monthly boundary to the SQL Server partition function"""
+        boundary = f"{month:%Y-%m-%d}"
+        self.db.execute_query(
+            f"""
+            IF NOT EXISTS (
+                SELECT 1 FROM sys.partition_range_values prv
+                JOIN sys.partition_functions pf ON prv.function_id = pf.function_id
+                WHERE pf.name = '{self._partition_function}'
+                AND CAST(prv.value AS DATE) = '{boundary}'
+            )
+            BEGIN
+                ALTER PARTITION SCHEME {self._partition_scheme} NEXT USED [PRIMARY];
+                ALTER PARTITION FUNCTION {self._partition_function}() SPLIT RANGE ('{boundary}');
+            END
+            """
+        )
+
+
+class ActivityMaintenance:
+    """Background upkeep for the activity streams
+
+    Runs ``migrate_legacy`` once, then ``maintain_partitions`` and ``compact``
+    every ``interval_hours`` on a daemon thread.
+    """
+
+    def __init__(
+        self,
+        stores: List[ActivityStore],
+        interval_hours: float = 24,
+        months_ahead: int = 2,
+    ):
+        self.stores = stores
+        self.interval_seconds = max(interval_hours, 0.1) * 3600
+        self.months_ahead = months_ahead
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ActivityMaintenance":
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-maintenance", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self, migrate: bool = False, today: Optional[date] = None) -> int:
+        """One maintenance pass; returns the number of rows archived"""
+        moved = 0
+        for store in self.stores:
+            if migrate:
+                store.migrate_legacy()
+            store.maintain_partitions(self.months_ahead, today)
+            moved += store.compact(today)
+        return moved
+
+    def _run(self):
+        migrate = True
+        while not self._stopping.is_set():
+            try:
+                self.run_once(migrate)
+                migrate = False
+            except Exception as e:
+                logger.error(f"Activity maintenance failed: {str(e)}")
+            self._stopping.wait(self.interval_seconds)
+
+
+def get_activity_settings() -> Dict[str, Any]:
+    """Retention settings from the ``[activity]`` secrets section"""
+    settings = {
+        "hot_months": 3,
+        "maintenance_interval_hours": 24,
+        "partition_months_ahead": 2,
+    }
+    try:
+        if hasattr(st, "secrets") and "activity" in st.secrets:
+            for key, value in st.secrets.activity.items():
+                if key in settings:
+                    settings[key] = value
+    except Exception as e:
+        logger.warning(f"Activity configuration failed: {e}")
+    return settings
+
+
+# Shared stores so maintenance and readers see the same bucket catalog
+_activity_stores: Dict[str, ActivityStore] = {}
+_activity_maintenance: Optional[ActivityMaintenance] = None
+_store_lock = threading.Lock()
+
+
+def get_activity_store(db_manager, stream: str = "project") -> ActivityStore:
+    """Get the shared store for a stream, starting maintenance on first use"""
+    global _activity_maintenance
+
+    if stream not in ACTIVITY_STREAMS:
+        raise ValueError(f"Unknown activity stream: {stream}")
+
+    if stream not in _activity_stores:
+        with _store_lock:
+            if stream not in _activity_stores:
+                settings = get_activity_settings()
+                for name in ACTIVITY_STREAMS:
+                    _activity_stores[name] = ActivityStore(
+                        db_manager, name, int(settings["hot_months"])
+                    )
+                _activity_maintenance = ActivityMaintenance(
+                    list(_activity_stores.values()),
+                    interval_hours=float(settings["maintenance_interval_hours"]),
+                    months_ahead=int(settings["partition_months_ahead"]),
+                ).start()
+
+    return _activity_stores[stream]
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+modules/cost_ledger.py
+SDX Project Manager - Project Cost Ledger
+Write-time costing of time entries with per-project monthly running totals
+"""
+
+import logging
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Time entries logged before the ledger existed are costed once per process
+_ledger_backfilled = False
+_backfill_lock = threading.Lock()
+
+
+def period_of(value: Union[date, datetime]) -> int:
+    """Month bucket key in YYYYMM form"""
+    return value.year * 100 + value.month
+
+
+def _shift_period(period: int, months: int) -> int:
+    """Move a YYYYMM period by a number of months"""
+    index = (period // 100) * 12 + (period % 100 - 1) + months
+    return (index // 12) * 100 + index % 12 + 1
+
+
+class CostLedger:
+    """Records the cost of each time entry when it is written
+
+    Entries keep the hourly rate that applied when the work was logged, so
+    later rate changes never rewrite history. ProjectCostTotals holds running
+    per-project, per-month sums; budget spent, burn, variance and forecast
+    are range reads over those rows instead of TimeTracking x Users joins.
+    """
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    # =============================================================================
+    # Writes
+    # =============================================================================
+
+    def record_time_entry(self, tracking_id: int) -> Optional[Dict[str, Any]]:
+        """Cost a completed TimeTracking row and add it to the monthly totals"""
+        try:
+            entry = self.db.fetch_one(
+                """
+                SELECT tt.TrackingID, tt.TaskID, tt.UserID, tt.StartTime,
+                       tt.DurationMinutes, t.ProjectID,
+                       COALESCE(u.HourlyRate, 0) as HourlyRate,
+                       (SELECT COUNT(*) FROM CostLedgerEntries cle
+                        WHERE cle.TrackingID = tt.TrackingID) as AlreadyRecorded
+                FROM TimeTracking tt
+                JOIN Tasks t ON tt.TaskID = t.TaskID
+                JOIN Users u ON tt.UserID = u.UserID
+                WHERE tt.TrackingID = ? AND tt.Status = 'Completed'
+                """,
+                [tracking_id],
+            )
+
+            if not entry or entry["AlreadyRecorded"]:
+                return None
+
+            work_date = entry["StartTime"]
+            if isinstance(work_date, str):
+                work_date = datetime.fromisoformat(work_date)
+            hours = Decimal(str(entry["DurationMinutes"] or 0)) / Decimal(60)
+            rate = Decimal(str(entry["HourlyRate"]))
+            cost = (hours * rate).quantize(Decimal("0.01"))
+            hours = hours.quantize(Decimal("0.01"))
+            period = period_of(work_date)
+
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO CostLedgerEntries
+                    (TrackingID, ProjectID, TaskID, UserID, WorkDate, PeriodMonth,
+                     Hours, HourlyRate, Cost, CreatedAt)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        tracking_id,
+                        entry["ProjectID"],
+                        entry["TaskID"],
+                        entry["UserID"],
+                        work_date.date() if isinstance(work_date, datetime) else work_date,
+                        period,
+                        float(hours),
+                        float(rate),
+                        float(cost),
+                        datetime.now(),
+                    ],
+                )
+                self._add_to_totals(
+                    cursor, entry["ProjectID"], period, float(hours), float(cost), 1
+                )
+
+            return {
+                "TrackingID": tracking_id,
+                "ProjectID": entry["ProjectID"],
+                "PeriodMonth": period,
+                "Hours": float(hours),
+                "HourlyRate": float(rate),
+                "Cost": float(cost),
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to record time entry cost: {str(e)}")
+            return None
+
+    def backfill(self, project_id: Optional[int] = None) -> int:
+        """Cost completed time entries that predate the ledger
+
+        Historical rows are costed at today's rates since earlier rates were
+        never stored; totals for the affected projects are rebuilt afterwards.
+        """
+        try:
+            if getattr(self.db, "db_type", "mssql") == "mssql":
+                date_expr = "CAST(tt.StartTime AS DATE)"
+                month_expr = "YEAR(tt.StartTime) * 100 + MONTH(tt.StartTime)"
+            else:
+                date_expr = "DATE(tt.StartTime)"
+                month_expr = "CAST(strftime('%Y%m', tt.StartTime) AS INTEGER)"
+            query = f"""
+                INSERT INTO CostLedgerEntries
+                (TrackingID, ProjectID, TaskID, UserID, WorkDate, PeriodMonth,
+                 Hours, HourlyRate, Cost, CreatedAt)
+                SELECT tt.TrackingID, t.ProjectID, tt.TaskID, tt.UserID,
+                       {date_expr}, {month_expr},
+                       ROUND(tt.DurationMinutes / 60.0, 2),
+                       COALESCE(u.HourlyRate, 0),
+                       ROUND(tt.DurationMinutes / 60.0 * COALESCE(u.HourlyRate, 0), 2),
+                       ?
+                FROM TimeTracking tt
+                JOIN Tasks t ON tt.TaskID = t.TaskID
+                JOIN Users u ON tt.UserID = u.UserID
+                WHERE tt.Status = 'Completed'
+                AND NOT EXISTS (
+                    SELECT 1 FROM CostLedgerEntries cle WHERE cle.TrackingID = tt.TrackingID
+                )
+            """
+            params: List[Any] = [datetime.now()]
+            if project_id is not None:
+                query += " AND t.ProjectID = ?"
+                params.append(project_id)
+
+            with self.db.transaction() as cursor:
+                cursor.execute(query, params)
+                inserted = cursor.rowcount
+
+            if inserted:
+                self.rebuild_totals(project_id)
+            return max(inserted, 0)
+
+        except Exception as e:
+            logger.error(f"Failed to backfill cost ledger: {str(e)}")
+            return 0
+
+    def rebuild_totals(self, project_id: Optional[int] = None) -> bool:
+        """Recompute running totals from ledger entries"""
+        try:
+            where = "WHERE ProjectID = ?" if project_id is not None else ""
+            params = [project_id] if project_id is not None else []
+
+            with self.db.transaction() as cursor:
+                cursor.execute(f"DELETE FROM ProjectCostTotals {where}", params)
+                cursor.execute(
+                    f"""
+                    INSERT INTO ProjectCostTotals
+                    (ProjectID, PeriodMonth, Hours, Cost, EntryCount, UpdatedAt)
+                    SELECT ProjectID, PeriodMonth, SUM(Hours), SUM(Cost), COUNT(*), ?
+                    FROM CostLedgerEntries
+                    {where}
+                    GROUP BY ProjectID, PeriodMonth
+                    """,
+                    [datetime.now()] + params,
+                )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to rebuild cost totals: {str(e)}")
+            return False
+
+    def _add_to_totals(
+        self,
+        cursor,
+        project_id: int,
+        period: int,
+        hours: float,
+        cost: float,
+        entries: int,
+    ):
+        """Update-then-insert upsert of a monthly total row"""
+        now = datetime.now()
+        cursor.execute(
+            """
+            UPDATE ProjectCostTotals
+            SET Hours = Hours + ?, Cost = Cost + ?, EntryCount = EntryCount + ?,
+                UpdatedAt = ?
+            WHERE ProjectID = ? AND PeriodMonth = ?
+            """,
+            [hours, cost, entries, now, project_id, period],
+        )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                """
+                INSERT INTO ProjectCostTotals
+                (ProjectID, PeriodMonth, Hours, Cost, EntryCount, UpdatedAt)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [project_id, period, hours, cost, entries, now],
+            )
+
+    # =============================================================================
+    # Reads
+    # =============================================================================
+
+    def get_project_spent(
+        self,
+        project_id: int,
+        start_period: Optional[int] = None,
+        end_period: Optional[int] = None,
+    ) -> Decimal:
+        """Total cost for a project, optionally within a YYYYMM range"""
+        try:
+            query = """
+                SELECT COALESCE(SUM(Cost), 0) as TotalSpent
+                FROM ProjectCostTotals
+                WHERE ProjectID = ?
+            """
+            params: List[Any] = [project_id]
+            if start_period is not None:
+                query += " AND PeriodMonth >= ?"
+                params.append(start_period)
+            if end_period is not None:
+                query += " AND PeriodMonth <= ?"
+                params.append(end_period)
+
+            result = self.db.fetch_one(query, params)
+            return Decimal(str(result["TotalSpent"] if result else 0))
+
+        except Exception as e:
+            logger.error(f"Failed to get project spent: {str(e)}")
+            return Decimal("0")
+
+    def get_spent_by_project(
+        self, project_ids: Optional[List[int]] = None
+    ) -> Dict[int, float]:
+        """Total cost for many projects in one grouped read"""
+        try:
+            query = "SELECT ProjectID, SUM(Cost) as TotalSpent FROM ProjectCostTotals"
+            params: List[Any] = []
+            if project_ids:
+                query += f" WHERE ProjectID IN ({', '.join('?' for _ in project_ids)})"
+                params = list(project_ids)
+            query += " GROUP BY ProjectID"
+
+            return {
+                row["ProjectID"]: float(row["TotalSpent"] or 0)
+                for row in self.db.fetch_all(query, params)
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get spent by project: {str(e)}")
+            return {}
+
+    def get_burn(
+        self,
+        project_id: int,
+        start_period: Optional[int] = None,
+        end_period: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Monthly burn with cumulative cost for a project"""
+        try:
+            query = """
+                SELECT PeriodMonth, Hours, Cost, EntryCount
+                FROM ProjectCostTotals
+                WHERE ProjectID = ?
+            """
+            params: List[Any] = [project_id]
+            if start_period is not None:
+                query += " AND PeriodMonth >= ?"
+                params.append(start_period)
+            if end_period is not None:
+                query += " AND PeriodMonth <= ?"
+                params.append(end_period)
+            query += " ORDER BY PeriodMonth"
+
+            burn = []
+            cumulative = 0.0
+            for row in self.db.fetch_all(query, params):
+                cumulative += float(row["Cost"] or 0)
+                burn.append(
+                    {
+                        "PeriodMonth": row["PeriodMonth"],
+                        "Hours": float(row["Hours"] or 0),
+                        "Cost": float(row["Cost"] or 0),
+                        "EntryCount": row["EntryCount"],
+                        "CumulativeCost": cumulative,
+                    }
+                )
+            return burn
+
+        except Exception as e:
+            logger.error(f"Failed to get project burn: {str(e)}")
+            return []
+
+    def get_budget_variance(self, project_id: int, budget: float) -> Dict[str, Any]:
+        """Spent vs budget for a project"""
+        spent = float(self.get_project_spent(project_id))
+        budget = float(budget or 0)
+        return {
+            "budget": budget,
+            "spent": spent,
+            "remaining": budget - spent,
+            "variance_pct": (spent / budget - 1) * 100 if budget > 0 else 0.0,
+            "utilization_pct": spent / budget * 100 if budget > 0 else 0.0,
+        }
+
+    def forecast(
+        self,
+        project_id: int,
+        budget: float,
+        end_date: Optional[Union[date, datetime]] = None,
+        lookback_months: int = 3,
+        today: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Estimate at completion from the recent average monthly burn"""
+        today = today or date.today()
+        current = period_of(today)
+        recent = self.get_burn(
+            project_id, start_period=_shift_period(current, -(lookback_months - 1))
+        )
+        spent = float(self.get_project_spent(project_id))
+        monthly_burn = (
+            sum(row["Cost"] for row in recent) / lookback_months if recent else 0.0
+        )
+
+        months_left = 0
+        if end_date:
+            end_period = period_of(end_date)
+            months_left = max(
+                0,
+                (end_period // 100 - current // 100) * 12
+                + (end_period % 100 - current % 100),
+            )
+
+        estimate = spent + monthly_burn * months_left
+        budget = float(budget or 0)
+        months_to_exhaust = (
+            (budget - spent) / monthly_burn
+            if monthly_burn > 0 and budget > spent
+            else None
+        )
+
+        return {
+            "spent": spent,
+            "monthly_burn": monthly_burn,
+            "months_remaining": months_left,
+            "estimate_at_completion": estimate,
+            "variance_at_completion": budget - estimate,
+            "months_to_budget_exhaustion": months_to_exhaust,
+        }
+
+
+def backfill_cost_ledger(db_manager) -> int:
+    """Cost pre-ledger time entries the first time a process reads totals
+
+    ``CostLedger.backfill`` skips entries already in the ledger, so running
+    it again in a later process only costs the scan.
+    """
+    global _ledger_backfilled
+
+    if _ledger_backfilled:
+        return 0
+    with _backfill_lock:
+        if _ledger_backfilled:
+            return 0
+        inserted = CostLedger(db_manager).backfill()
+        _ledger_backfilled = True
+
+    if inserted:
+        logger.info(f"Backfilled {inserted} time entries into the cost ledger")
+    return inserted
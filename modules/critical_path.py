@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+modules/critical_path.py
+SDX Project Manager - Critical Path Method Engine
+Linear-time topological sort, forward/backward pass, float and critical chain over task dependency graphs
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+
+from modules.schedule import ColumnarSchedule, from_day
+
+logger = logging.getLogger(__name__)
+
+
+# Dependency types, encoded as small integers on the edge arrays
+FINISH_TO_START = 0
+START_TO_START = 1
+FINISH_TO_FINISH = 2
+START_TO_FINISH = 3
+
+DEPENDENCY_TYPES = {
+    "finish_to_start": FINISH_TO_START,
+    "start_to_start": START_TO_START,
+    "finish_to_finish": FINISH_TO_FINISH,
+    "start_to_finish": START_TO_FINISH,
+    "FS": FINISH_TO_START,
+    "SS": START_TO_START,
+    "FF": FINISH_TO_FINISH,
+    "SF": START_TO_FINISH,
+}
+
+
+def dependency_type_code(value: Optional[str]) -> int:
+    """Map a TaskDependencies.DependencyType value to its edge code"""
+    return DEPENDENCY_TYPES.get(value or "finish_to_start", FINISH_TO_START)
+
+
+@dataclass
+class CPMResult:
+    """Early/late schedule, float and critical chain in day offsets"""
+
+    ids: List[Any]
+    order: np.ndarray
+    early_start: np.ndarray
+    early_finish: np.ndarray
+    late_start: np.ndarray
+    late_finish: np.ndarray
+    total_float: np.ndarray
+    free_float: np.ndarray
+    critical_path: List[int]
+    project_duration: int
+    base_date: Optional[date] = None
+    successor_count: np.ndarray = field(default_factory=lambda: np.zeros(0, "int64"))
+
+    @property
+    def critical(self) -> np.ndarray:
+        return self.total_float <= 0
+
+    def offset_to_date(self, offset: int) -> Optional[date]:
+        if self.base_date is None:
+            return None
+        return self.base_date + timedelta(days=int(offset))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One dict per task; finish dates are inclusive like GanttItem.end_date"""
+        records = []
+        critical = self.critical
+        for i, item_id in enumerate(self.ids):
+            records.append(
+                {
+                    "id": item_id,
+                    "early_start": self.offset_to_date(self.early_start[i]),
+                    "early_finish": self.offset_to_date(self.early_finish[i] - 1),
+                    "late_start": self.offset_to_date(self.late_start[i]),
+                    "late_finish": self.offset_to_date(self.late_finish[i] - 1),
+                    "total_float": int(self.total_float[i]),
+                    "free_float": int(self.free_float[i]),
+                    "critical": bool(critical[i]),
+                }
+            )
+        return records
+
+
+class CriticalPathEngine:
+    """Critical path method over a dependency graph in O(tasks + dependencies)
+
+    Tasks are integer indices with durations in days. Edges are parallel
+    arrays of predecessor, successor, lag and dependency type. An optional
+    earliest start per task (its scheduled start) acts as a start-no-earlier-
+    than constraint, so the forward pass never pulls work before its plan.
+    """
+
+    def compute(
+        self,
+        durations: Sequence[int],
+        predecessors: Sequence[int],
+        successors: Sequence[int],
+        lags: Optional[Sequence[int]] = None,
+        dependency_types: Optional[Sequence[int]] = None,
+        earliest_start: Optional[Sequence[int]] = None,
+        ids: Optional[List[Any]] = None,
+        base_date: Optional[date] = None,
+    ) -> CPMResult:
+        """Run the topological sort, forward pass and backward pass"""
+        dur = np.asarray(durations, dtype="int64")
+        n = len(dur)
+        pred = np.asarray(predecessors, dtype="int64")
+        succ = np.asarray(successors, dtype="int64")
+        m = len(pred)
+        lag = np.zeros(m, "int64") if lags is None else np.asarray(lags, "int64")
+        kind = (
+            np.zeros(m, "int64")
+            if dependency_types is None
+            else np.asarray(dependency_types, "int64")
+        )
+
+        # CSR successor index: edges of node p are edge_succ[offsets[p]:offsets[p+1]]
+        edge_order = np.argsort(pred, kind="stable")
+        counts = np.bincount(pred, minlength=n) if m else np.zeros(n, "int64")
+        offsets = np.zeros(n + 1, "int64")
+        np.cumsum(counts, out=offsets[1:])
+
+        order = self._topological_order(n, offsets, succ[edge_order], succ, ids)
+
+        # Plain lists keep the per-edge inner loops fast
+        dur_l = dur.tolist()
+        off_l = offsets.tolist()
+        e_succ = succ[edge_order].tolist()
+        e_lag = lag[edge_order].tolist()
+        e_kind = kind[edge_order].tolist()
+
+        es = (
+            [0] * n
+            if earliest_start is None
+            else np.asarray(earliest_start, "int64").tolist()
+        )
+        driver = [-1] * n
+
+        # Forward pass
+        for p in order:
+            es_p = es[p]
+            ef_p = es_p + dur_l[p]
+            for e in range(off_l[p], off_l[p + 1]):
+                s = e_succ[e]
+                k = e_kind[e]
+                if k == FINISH_TO_START:
+                    candidate = ef_p + e_lag[e]
+                elif k == START_TO_START:
+                    candidate = es_p + e_lag[e]
+                elif k == FINISH_TO_FINISH:
+                    candidate = ef_p + e_lag[e] - dur_l[s]
+                else:
+                    candidate = es_p + e_lag[e] - dur_l[s]
+                if candidate > es[s] or (candidate == es[s] and driver[s] < 0):
+                    es[s] = candidate
+                    driver[s] = p
+
+        ef = [es[i] + dur_l[i] for i in range(n)]
+        finish = max(ef) if n else 0
+
+        # Backward pass
+        lf = [finish] * n
+        free = [0] * n
+        for p in reversed(order):
+            lf_p = lf[p]
+            ff_p = None
+            for e in range(off_l[p], off_l[p + 1]):
+                s = e_succ[e]
+                k = e_kind[e]
+                ls_s = lf[s] - dur_l[s]
+                if k == FINISH_TO_START:
+                    candidate = ls_s - e_lag[e]
+                    slack = es[s] - e_lag[e] - ef[p]
+                elif k == START_TO_START:
+                    candidate = ls_s - e_lag[e] + dur_l[p]
+                    slack = es[s] - e_lag[e] - es[p]
+                elif k == FINISH_TO_FINISH:
+                    candidate = lf[s] - e_lag[e]
+                    slack = ef[s] - e_lag[e] - ef[p]
+                else:
+                    candidate = lf[s] - e_lag[e] + dur_l[p]
+                    slack = ef[s] - e_lag[e] - es[p]
+                if candidate < lf_p:
+                    lf_p = candidate
+                if ff_p is None or slack < ff_p:
+                    ff_p = slack
+            lf[p] = lf_p
+            free[p] = finish - ef[p] if ff_p is None else ff_p
+
+        es_a = np.asarray(es, "int64")
+        ef_a = np.asarray(ef, "int64")
+        lf_a = np.asarray(lf, "int64")
+        ls_a = lf_a - dur
+        total_float = ls_a - es_a
+        free_float = np.minimum(np.asarray(free, "int64"), total_float)
+
+        return CPMResult(
+            ids=list(ids) if ids is not None else list(range(n)),
+            order=np.asarray(order, "int64"),
+            early_start=es_a,
+            early_finish=ef_a,
+            late_start=ls_a,
+            late_finish=lf_a,
+            total_float=total_float,
+            free_float=free_float,
+            critical_path=self._critical_chain(ef, finish, total_float, driver, order),
+            project_duration=int(finish - (min(es) if n else 0)),
+            base_date=base_date,
+            successor_count=counts.astype("int64"),
+        )
+
+    @staticmethod
+    def _topological_order(
+        n: int,
+        offsets: np.ndarray,
+        sorted_succ: np.ndarray,
+        succ: np.ndarray,
+        ids: Optional[List[Any]],
+    ) -> List[int]:
+        """Kahn's algorithm; raises ValueError when the graph has a cycle"""
+        indegree = (
+            np.bincount(succ, minlength=n).tolist() if len(succ) else [0] * n
+        )
+        off_l = offsets.tolist()
+        succ_l = sorted_succ.tolist()
+
+        order = [i for i in range(n) if indegree[i] == 0]
+        head = 0
+        while head < len(order):
+            p = order[head]
+            head += 1
+            for e in range(off_l[p], off_l[p + 1]):
+                s = succ_l[e]
+                indegree[s] -= 1
+                if indegree[s] == 0:
+                    order.append(s)
+
+        if len(order) != n:
+            cyclic = [i for i in range(n) if indegree[i] > 0]
+            names = [ids[i] if ids is not None else i for i in cyclic[:10]]
+            raise ValueError(
+                f"Dependency cycle detected among {len(cyclic)} tasks: {names}"
+            )
+        return order
+
+    @staticmethod
+    def _critical_chain(
+        ef: List[int],
+        finish: int,
+        total_float: np.ndarray,
+        driver: List[int],
+        order: List[int],
+    ) -> List[int]:
+        """Walk driving predecessors back from the task that sets the finish"""
+        end = next((i for i in reversed(order) if ef[i] == finish), None)
+        if end is None:
+            return []
+
+        chain = [end]
+        node = driver[end]
+        while node >= 0 and total_float[node] <= 0:
+            chain.append(node)
+            node = driver[node]
+        chain.reverse()
+        return chain
+
+    # =============================================================================
+    # Gantt Adapters
+    # =============================================================================
+
+    def analyze_items(self, gantt_items: List[Any]) -> Optional[CPMResult]:
+        """Run CPM over the task items of a Gantt dataset"""
+        return self.analyze_schedule(ColumnarSchedule.from_items(gantt_items))
+
+    def analyze_schedule(self, schedule: ColumnarSchedule) -> Optional[CPMResult]:
+        """Run CPM over the task rows of a columnar schedule"""
+        network = schedule_network(schedule)
+        if network is None:
+            return None
+        return self.compute(**network)
+
+
+def schedule_network(schedule: ColumnarSchedule) -> Optional[Dict[str, Any]]:
+    """CPM inputs for the task rows of a columnar schedule
+
+    Project summary rows are skipped; edges (with their types and lags) come
+    from the schedule's CSR dependency index, remapped to task positions. Returns ``compute`` keyword
+    arguments, or None when the schedule has no tasks.
+    """
+    task_rows = np.flatnonzero(~schedule.is_project)
+    if not len(task_rows):
+        return None
+
+    position = np.full(len(schedule), -1, dtype="int64")
+    position[task_rows] = np.arange(len(task_rows))
+
+    preds, succs = schedule.edges()
+    preds, succs = position[preds], position[succs]
+    keep = (preds >= 0) & (succs >= 0) & (preds != succs)
+
+    start = schedule.start[task_rows]
+    base = int(start.min())
+
+    return {
+        "durations": schedule.durations[task_rows],
+        "predecessors": preds[keep],
+        "successors": succs[keep],
+        "lags": schedule.dep_lag[keep].astype("int64"),
+        "dependency_types": schedule.dep_type[keep].astype("int64"),
+        "earliest_start": start - base,
+        "ids": [schedule.ids[r] for r in task_rows.tolist()],
+        "base_date": from_day(base),
+    }
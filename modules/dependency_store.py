@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+modules/dependency_store.py
+SDX Project Manager - Task Dependency Store
+Normalized predecessor/successor edges with bulk loading and in-memory cycle checks
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DEPENDENCY_TYPE = "finish_to_start"
+VALID_DEPENDENCY_TYPES = {
+    "finish_to_start",
+    "start_to_start",
+    "finish_to_finish",
+    "start_to_finish",
+}
+
+# Edge columns read by every graph consumer; both covering indexes include them
+EDGE_COLUMNS = "td.TaskID, td.DependsOnTaskID, td.DependencyType, td.LagDays"
+
+# Projects or tasks per edge query (keeps IN lists under driver limits)
+EDGE_LOOKUP_CHUNK = 900
+
+# Tasks.Dependencies is copied into TaskDependencies once per process
+_legacy_migrated = False
+_migration_lock = threading.Lock()
+
+
+class DependencyStore:
+    """Single source of task dependency edges (TaskDependencies)
+
+    A row means ``TaskID`` (successor) depends on ``DependsOnTaskID``
+    (predecessor) with a dependency type and lag. Reads go through one of
+    the two covering indexes: by successor for a project's edge list, by
+    predecessor for dependents. Cycle checks load the project's edges once
+    and walk them in memory instead of issuing a recursive CTE.
+    """
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    # =============================================================================
+    # Bulk Loading
+    # =============================================================================
+
+    def load_project_edges(self, project_ids: List[int]) -> List[Dict[str, Any]]:
+        """Every edge whose successor belongs to one of ``project_ids``"""
+        project_ids = list(dict.fromkeys(project_ids))
+        if not project_ids:
+            return []
+        try:
+            edges = []
+            for offset in range(0, len(project_ids), EDGE_LOOKUP_CHUNK):
+                chunk = project_ids[offset : offset + EDGE_LOOKUP_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"""
+                    SELECT {EDGE_COLUMNS}
+                    FROM Tasks t
+                    JOIN TaskDependencies td ON td.TaskID = t.TaskID
+                    WHERE t.ProjectID IN ({placeholders})
+                """
+                edges.extend(dict(row) for row in self.db.fetch_all(query, chunk))
+            return edges
+
+        except Exception as e:
+            logger.error(f"Failed to load project dependencies: {str(e)}")
+            return []
+
+    def load_task_edges(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Edges whose successor is one of ``task_ids``"""
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return []
+        try:
+            edges = []
+            for offset in range(0, len(task_ids), EDGE_LOOKUP_CHUNK):
+                chunk = task_ids[offset : offset + EDGE_LOOKUP_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"""
+                    SELECT {EDGE_COLUMNS}
+                    FROM TaskDependencies td
+                    WHERE td.TaskID IN ({placeholders})
+                """
+                edges.extend(dict(row) for row in self.db.fetch_all(query, chunk))
+            return edges
+
+        except Exception as e:
+            logger.error(f"Failed to load task dependencies: {str(e)}")
+            return []
+
+    @staticmethod
+    def adjacency(edges: List[Dict[str, Any]]) -> Dict[int, List[int]]:
+        """Predecessor lists keyed by successor task"""
+        predecessors: Dict[int, List[int]] = {}
+        for edge in edges:
+            predecessors.setdefault(edge["TaskID"], []).append(edge["DependsOnTaskID"])
+        return predecessors
+
+    # =============================================================================
+    # Cycle Checks
+    # =============================================================================
+
+    def creates_cycle(self, task_id: int, depends_on_task_id: int) -> bool:
+        """Whether ``task_id`` depending on ``depends_on_task_id`` closes a cycle
+
+        That happens when ``task_id`` is already reachable from
+        ``depends_on_task_id`` by following predecessors. The project's tasks
+        and edges come back in one query; tasks from other projects reached
+        along the way are fetched a frontier at a time.
+        """
+        if task_id == depends_on_task_id:
+            return True
+
+        rows = self.db.fetch_all(
+            f"""
+            SELECT t.TaskID AS ProjectTaskID, {EDGE_COLUMNS}
+            FROM Tasks t
+            LEFT JOIN TaskDependencies td ON td.TaskID = t.TaskID
+            WHERE t.ProjectID = (SELECT ProjectID FROM Tasks WHERE TaskID = ?)
+            """,
+            [depends_on_task_id],
+        )
+        loaded: Set[int] = set()
+        predecessors: Dict[int, List[int]] = {}
+        for row in rows:
+            loaded.add(row["ProjectTaskID"])
+            if row["DependsOnTaskID"] is not None:
+                predecessors.setdefault(row["TaskID"], []).append(
+                    row["DependsOnTaskID"]
+                )
+
+        seen = {depends_on_task_id}
+        frontier = [depends_on_task_id]
+        while frontier:
+            missing = [node for node in frontier if node not in loaded]
+            if missing:
+                for edge in self.load_task_edges(missing):
+                    predecessors.setdefault(edge["TaskID"], []).append(
+                        edge["DependsOnTaskID"]
+                    )
+                loaded.update(missing)
+
+            next_frontier = []
+            for node in frontier:
+                for pred in predecessors.get(node, ()):
+                    if pred == task_id:
+                        return True
+                    if pred not in seen:
+                        seen.add(pred)
+                        next_frontier.append(pred)
+            frontier = next_frontier
+
+        return False
+
+    @staticmethod
+    def find_cycle_edges(
+        edges: Iterable[Tuple[int, int]],
+        existing: Optional[Dict[int, List[int]]] = None,
+    ) -> List[Tuple[int, int]]:
+        """New (task, depends_on) edges that would close a cycle, in order
+
+        Edges are accepted one by one on top of ``existing`` predecessor
+        lists; rejected edges are not added.
+        """
+        predecessors = {k: list(v) for k, v in (existing or {}).items()}
+        rejected = []
+        for task_id, depends_on in edges:
+            stack = [depends_on]
+            seen = {depends_on}
+            cyclic = task_id == depends_on
+            while stack and not cyclic:
+                node = stack.pop()
+                for pred in predecessors.get(node, ()):
+                    if pred == task_id:
+                        cyclic = True
+                        break
+                    if pred not in seen:
+                        seen.add(pred)
+                        stack.append(pred)
+            if cyclic:
+                rejected.append((task_id, depends_on))
+            else:
+                predecessors.setdefault(task_id, []).append(depends_on)
+        return rejected
+
+    # =============================================================================
+    # Writes
+    # =============================================================================
+
+    def add_many(
+        self,
+        edges: List[Tuple[int, int, str, int]],
+        created_by: Optional[int] = None,
+    ) -> int:
+        """Insert (task, depends_on, type, lag) edges that are not present yet
+
+        Duplicates are skipped by one lookup against the successor index;
+        the remaining rows go in as multi-row INSERTs in one transaction.
+        Returns the number of edges inserted.
+        """
+        if not edges:
+            return 0
+        try:
+            existing = {
+                (edge["TaskID"], edge["DependsOnTaskID"])
+                for edge in self.load_task_edges(e[0] for e in edges)
+            }
+            now = datetime.now()
+            rows = []
+            for task_id, depends_on, dependency_type, lag_days in edges:
+                key = (task_id, depends_on)
+                if key in existing:
+                    continue
+                existing.add(key)
+                if dependency_type not in VALID_DEPENDENCY_TYPES:
+                    dependency_type = DEFAULT_DEPENDENCY_TYPE
+                rows.append(
+                    (task_id, depends_on, dependency_type, lag_days or 0, created_by, now)
+                )
+
+            if rows:
+                with self.db.transaction() as cursor:
+                    self.db.insert_rows(
+                        cursor,
+                        "TaskDependencies",
+                        [
+                            "TaskID",
+                            "DependsOnTaskID",
+                            "DependencyType",
+                            "LagDays",
+                            "CreatedBy",
+                            "CreatedAt",
+                        ],
+                        rows,
+                    )
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Failed to add task dependencies: {str(e)}")
+            return 0
+
+    def remove(self, task_id: int, depends_on_task_id: int) -> None:
+        self.db.execute_query(
+            "DELETE FROM TaskDependencies WHERE TaskID = ? AND DependsOnTaskID = ?",
+            [task_id, depends_on_task_id],
+        )
+
+    def migrate_legacy(self, project_id: Optional[int] = None) -> int:
+        """Copy comma-separated Tasks.Dependencies values into the edge table"""
+        try:
+            query = "SELECT TaskID, ProjectID, Dependencies FROM Tasks WHERE Dependencies IS NOT NULL"
+            params: List[Any] = []
+            if project_id:
+                query += " AND ProjectID = ?"
+                params.append(project_id)
+
+            edges = []
+            for row in self.db.fetch_all(query, params):
+                for dep in str(row["Dependencies"]).split(","):
+                    dep = dep.strip()
+                    if dep.isdigit() and int(dep) != row["TaskID"]:
+                        edges.append((row["TaskID"], int(dep)))
+
+            if not edges:
+                return 0
+
+            existing = self.adjacency(
+                self.load_task_edges(task_id for task_id, _ in edges)
+            )
+            rejected = set(self.find_cycle_edges(edges, existing))
+            return self.add_many(
+                [
+                    (task_id, dep, DEFAULT_DEPENDENCY_TYPE, 0)
+                    for task_id, dep in edges
+                    if (task_id, dep) not in rejected
+                ]
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy dependencies: {str(e)}")
+            return 0
+
+
+def migrate_legacy_dependencies(db_manager) -> int:
+    """Copy legacy Tasks.Dependencies edges the first time a process needs edges
+
+    Readers only use TaskDependencies, so this runs before the first Gantt
+    or task manager is built. ``add_many`` skips edges already copied.
+    """
+    global _legacy_migrated
+
+    if _legacy_migrated:
+        return 0
+    with _migration_lock:
+        if _legacy_migrated:
+            return 0
+        migrated = DependencyStore(db_manager).migrate_legacy()
+        _legacy_migrated = True
+
+    if migrated:
+        logger.info(f"Migrated {migrated} legacy task dependencies")
+    return migrated
@@ -31,6 +31,8 @@ warnings.filterwarnings("ignore")
 
 from utils.error_handler import safe_execute, handle_error, validate_input
 from utils.ui_components import UIComponents
+from modules.project_health import ProjectHealthScorer
+from modules.cost_ledger import period_of
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +72,9 @@ class AdvancedAnalyticsEngine:
         self.db = db_manager
         self.ui = UIComponents()
         self.cache = {}  # Simple caching mechanism
+        self.health_scorer = ProjectHealthScorer(
+            {"task_count": "TotalTasks", "budget_spent": "ActualCost"}
+        )
         self.report_templates = {}
         self._init_report_templates()
 
@@ -234,7 +239,8 @@ class AdvancedAnalyticsEngine:
             if not projects_data:
                 return {"summary": {"message": "ไม่มีข้อมูลโครงการในช่วงเวลาที่เลือก"}}
 
-            df = pd.DataFrame(projects_data)
+            df = self.health_scorer.score_frame(pd.DataFrame(projects_data))
+            health_summary = self.health_scorer.summarize(df)
 
             # Calculate summary metrics
             summary = {
@@ -260,6 +266,9 @@ class AdvancedAnalyticsEngine:
                 "total_tasks": df["TotalTasks"].sum(),
                 "total_completed_tasks": df["CompletedTasks"].sum(),
                 "total_overdue_tasks": df["OverdueTasks"].sum(),
+                "avg_health_score": health_summary["avg_health_score"],
+                "overdue_projects": health_summary["overdue_projects"],
+                "at_risk_projects": health_summary["at_risk_projects"],
             }
 
             # Generate charts
@@ -419,17 +428,22 @@ class AdvancedAnalyticsEngine:
         try:
             start_date, end_date = config.date_range
 
-            # Get budget data
+            # Get budget data, with actual cost read from the cost ledger totals
             query = """
-                SELECT p.ProjectID, p.Name, p.Budget, p.ActualCost, p.Status,
+                SELECT p.ProjectID, p.Name, p.Budget, c.ActualCost, p.Status,
                        p.StartDate, p.EndDate, p.CompletionPercentage,
-                       CASE WHEN p.Budget > 0 THEN (p.ActualCost / p.Budget) * 100 ELSE 0 END as BudgetUtilization,
-                       CASE WHEN p.Budget > 0 THEN ((p.ActualCost - p.Budget) / p.Budget) * 100 ELSE 0 END as BudgetVariance,
+                       CASE WHEN p.Budget > 0 THEN (c.ActualCost / p.Budget) * 100 ELSE 0 END as BudgetUtilization,
+                       CASE WHEN p.Budget > 0 THEN ((c.ActualCost - p.Budget) / p.Budget) * 100 ELSE 0 END as BudgetVariance,
                        DATEDIFF(day, p.StartDate, GETDATE()) as ProjectAgeInDays,
                        CASE WHEN p.EndDate IS NOT NULL 
                             THEN DATEDIFF(day, p.StartDate, p.EndDate) 
                             ELSE NULL END as PlannedDurationInDays
                 FROM Projects p
+                CROSS APPLY (
+                    SELECT COALESCE(SUM(pct.Cost), p.ActualCost, 0) as ActualCost
+                    FROM ProjectCostTotals pct
+                    WHERE pct.ProjectID = p.ProjectID
+                ) c
                 WHERE p.CreatedDate BETWEEN ? AND ?
                 AND p.Budget > 0
                 ORDER BY p.Budget DESC
@@ -538,6 +552,31 @@ class AdvancedAnalyticsEngine:
                 "title": "การกระจายของความแปรปรวนงบประมาณ",
             }
 
+            # Monthly burn across the reported projects (range read on ledger totals)
+            project_ids = df["ProjectID"].tolist()
+            burn_query = f"""
+                SELECT PeriodMonth, SUM(Cost) as Cost
+                FROM ProjectCostTotals
+                WHERE PeriodMonth BETWEEN ? AND ?
+                AND ProjectID IN ({", ".join("?" for _ in project_ids)})
+                GROUP BY PeriodMonth
+                ORDER BY PeriodMonth
+            """
+            burn = self.db.execute_query(
+                burn_query,
+                (period_of(start_date), period_of(end_date), *project_ids),
+            )
+            if burn:
+                burn_df = pd.DataFrame(burn)
+                charts["monthly_burn"] = {
+                    "type": "line",
+                    "data": {
+                        "x": burn_df["PeriodMonth"].astype(str).tolist(),
+                        "y": burn_df["Cost"].cumsum().tolist(),
+                    },
+                    "title": "ค่าใช้จ่ายสะสมรายเดือน",
+                }
+
             return {
                 "summary": summary,
                 "charts": charts,
@@ -6,24 +6,32 @@ Advanced timeline visualization with interactive features
 """
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union, BinaryIO
 import logging
 import numpy as np
 from dataclasses import dataclass
 import json
+import io
+import os
 
 from utils.ui_components import UIComponents
 from utils.error_handler import safe_execute, handle_error
 from utils.performance_monitor import monitor_performance
+from modules.critical_path import CriticalPathEngine, dependency_type_code
+from modules.dependency_store import DependencyStore, migrate_legacy_dependencies
+from modules.resource_conflicts import ResourceConflictDetector
+from modules.gantt_figures import GanttFigureBuilder, GanttViewport
+from modules.schedule import ColumnarSchedule, from_day, to_day
+from modules.rescheduler import IncrementalRescheduler
+from modules.gantt_export import GanttExporter, EXPORT_FORMATS
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class GanttItem:
     """Gantt chart item data structure"""
 
@@ -48,6 +56,8 @@ class GanttChartManager:
     def __init__(self, db_manager):
         self.db = db_manager
         self.ui = UIComponents()
+        self.cpm_engine = CriticalPathEngine()
+        self.conflict_detector = ResourceConflictDetector()
         self.color_schemes = {
             "status": {
                 "Planning": "#94a3b8",
@@ -70,285 +80,240 @@ class GanttChartManager:
                 "Research": "#ec4899",
             },
         }
+        self.figure_builder = GanttFigureBuilder(self.color_schemes["status"])
+        self.dependency_store = DependencyStore(db_manager)
+        migrate_legacy_dependencies(db_manager)
+        self._rescheduler: Optional[Tuple[ColumnarSchedule, Any]] = None
+        self.exporter = GanttExporter()
 
-    @monitor_performance("gantt_data_load", "gantt")
     def get_gantt_data(
         self,
         project_id: Optional[int] = None,
         date_range: Optional[Tuple[date, date]] = None,
     ) -> List[GanttItem]:
-        """Load and prepare Gantt chart data"""
+        """Load Gantt data as GanttItem objects (see get_schedule)"""
+        schedule = self.get_schedule(project_id, date_range)
+        colors = self.color_schemes["status"]
+        return [
+            GanttItem(**record, color=colors.get(record["status"]), milestones=[])
+            for record in schedule.records()
+        ]
+
+    @monitor_performance("gantt_data_load", "gantt")
+    def get_schedule(
+        self,
+        project_id: Optional[int] = None,
+        date_range: Optional[Tuple[date, date]] = None,
+    ) -> ColumnarSchedule:
+        """Load and prepare Gantt chart data as a columnar schedule
+
+        Projects (with manager names), tasks and dependency edges (with type
+        and lag, read through DependencyStore in chunks of 900 projects) are
+        fetched in three queries for most portfolios, with the date window
+        applied in SQL against the indexed date columns. Rows are appended
+        straight into column lists; no per-row objects are created.
+        """
         try:
-            # Base query for projects and tasks
+            # Shared project predicate: not cancelled, dated, inside the window
+            conditions = [
+                "p.Status != 'Cancelled'",
+                "p.StartDate IS NOT NULL",
+                "p.EndDate IS NOT NULL",
+            ]
+            params: List[Any] = []
             if project_id:
-                projects_query = """
-                    SELECT ProjectID, Name, StartDate, EndDate, Status, Priority, 
-                           CompletionPercentage, ManagerID, ClientName, Description
-                    FROM Projects 
-                    WHERE ProjectID = ? AND Status != 'Cancelled'
-                """
-                projects = self.db.execute_query(projects_query, (project_id,))
-            else:
-                projects_query = """
-                    SELECT ProjectID, Name, StartDate, EndDate, Status, Priority,
-                           CompletionPercentage, ManagerID, ClientName, Description
-                    FROM Projects 
-                    WHERE Status != 'Cancelled'
-                """
-                projects = self.db.execute_query(projects_query)
-
-            gantt_items = []
-
-            # Process projects
-            for project in projects:
-                if not project["StartDate"] or not project["EndDate"]:
-                    continue
-
-                # Apply date range filter if specified
-                if date_range:
-                    start_filter, end_filter = date_range
-                    if (
-                        project["EndDate"] < start_filter
-                        or project["StartDate"] > end_filter
-                    ):
-                        continue
-
-                # Get project manager name
-                manager_query = """
-                    SELECT FirstName + ' ' + LastName as ManagerName 
-                    FROM Users WHERE UserID = ?
-                """
-                manager_result = self.db.execute_query(
-                    manager_query, (project["ManagerID"],)
+                conditions.append("p.ProjectID = ?")
+                params.append(project_id)
+            if date_range:
+                start_filter, end_filter = date_range
+                conditions.append("p.EndDate >= ? AND p.StartDate <= ?")
+                params.extend([start_filter, end_filter])
+            project_where = " AND ".join(conditions)
+
+            task_conditions = ["t.Status != 'Cancelled'", "t.DueDate IS NOT NULL"]
+            task_params = list(params)
+            if date_range:
+                task_conditions.append(
+                    "t.DueDate >= ? AND COALESCE(t.StartDate, p.StartDate) <= ?"
                 )
-                manager_name = (
-                    manager_result[0]["ManagerName"] if manager_result else "Unassigned"
+                task_params.extend([start_filter, end_filter])
+            task_where = " AND ".join(task_conditions)
+
+            projects_query = f"""
+                SELECT p.ProjectID, p.Name, p.StartDate, p.EndDate, p.Status, p.Priority,
+                       p.CompletionPercentage, p.ManagerID, p.ClientName, p.Description,
+                       u.FirstName + ' ' + u.LastName as ManagerName
+                FROM Projects p
+                LEFT JOIN Users u ON p.ManagerID = u.UserID
+                WHERE {project_where}
+                ORDER BY p.StartDate, p.ProjectID
+            """
+            projects = self.db.execute_query(projects_query, tuple(params))
+            if not projects:
+                return ColumnarSchedule.empty()
+
+            tasks_query = f"""
+                SELECT t.TaskID, t.ProjectID, t.Title, t.StartDate, t.DueDate, t.Status,
+                       t.Priority, t.CompletionPercentage,
+                       t.Description, t.EstimatedHours, t.ActualHours,
+                       u.FirstName + ' ' + u.LastName as AssigneeName,
+                       u.Department
+                FROM Tasks t
+                JOIN Projects p ON t.ProjectID = p.ProjectID
+                LEFT JOIN Users u ON t.AssignedToID = u.UserID
+                WHERE {project_where} AND {task_where}
+                ORDER BY t.ProjectID, t.DueDate
+            """
+            tasks = self.db.execute_query(tasks_query, tuple(task_params)) or []
+
+            # Edges of the loaded projects; ones whose successor is outside
+            # the window are never looked up
+            edges = self.dependency_store.load_project_edges(
+                [project["ProjectID"] for project in projects]
+            )
+            # Successor -> (predecessor IDs, type codes, lags)
+            dependency_map: Dict[int, Tuple[List[str], List[int], List[int]]] = {}
+            for dep in edges:
+                preds, types, lags = dependency_map.setdefault(dep["TaskID"], ([], [], []))
+                preds.append(f"task_{dep['DependsOnTaskID']}")
+                types.append(dependency_type_code(dep.get("DependencyType")))
+                lags.append(dep.get("LagDays") or 0)
+
+            tasks_by_project: Dict[int, List[Dict[str, Any]]] = {}
+            for task in tasks:
+                tasks_by_project.setdefault(task["ProjectID"], []).append(task)
+
+            columns: Dict[str, List[Any]] = {
+                "ids": [],
+                "names": [],
+                "starts": [],
+                "finishes": [],
+                "completion": [],
+                "is_project": [],
+                "statuses": [],
+                "priorities": [],
+                "resources": [],
+                "descriptions": [],
+                "dependencies": [],
+                "dependency_types": [],
+                "dependency_lags": [],
+            }
+            no_edges = ((), (), ())
+
+            def append(item_id, name, start, finish, row, resource, is_project, edges):
+                columns["ids"].append(item_id)
+                columns["names"].append(name)
+                columns["starts"].append(start)
+                columns["finishes"].append(finish)
+                columns["completion"].append(row.get("CompletionPercentage", 0))
+                columns["is_project"].append(is_project)
+                columns["statuses"].append(
+                    row.get("Status", "Planning" if is_project else "To Do")
                 )
+                columns["priorities"].append(row.get("Priority", "Medium"))
+                columns["resources"].append(resource or "Unassigned")
+                columns["descriptions"].append(row.get("Description", ""))
+                columns["dependencies"].append(edges[0])
+                columns["dependency_types"].append(edges[1])
+                columns["dependency_lags"].append(edges[2])
 
-                # Create project item
-                project_item = GanttItem(
-                    id=f"project_{project['ProjectID']}",
-                    name=f"📁 {project['Name']}",
-                    start_date=(
-                        project["StartDate"].date()
-                        if isinstance(project["StartDate"], datetime)
-                        else project["StartDate"]
-                    ),
-                    end_date=(
-                        project["EndDate"].date()
-                        if isinstance(project["EndDate"], datetime)
-                        else project["EndDate"]
-                    ),
-                    completion=project.get("CompletionPercentage", 0),
-                    priority=project.get("Priority", "Medium"),
-                    status=project.get("Status", "Planning"),
-                    resource=manager_name,
-                    dependencies=[],
-                    category="Project",
-                    color=self.color_schemes["status"].get(
-                        project.get("Status", "Planning")
-                    ),
-                    description=project.get("Description", ""),
-                    milestones=[],
+            for project in projects:
+                project_start = self._as_date(project["StartDate"])
+                append(
+                    f"project_{project['ProjectID']}",
+                    f"📁 {project['Name']}",
+                    project_start,
+                    self._as_date(project["EndDate"]),
+                    project,
+                    project.get("ManagerName"),
+                    True,
+                    no_edges,
                 )
-                gantt_items.append(project_item)
-
-                # Get tasks for this project
-                tasks_query = """
-                    SELECT t.TaskID, t.Title, t.StartDate, t.DueDate, t.Status, 
-                           t.Priority, t.CompletionPercentage, t.Dependencies,
-                           t.Description, t.EstimatedHours, t.ActualHours,
-                           u.FirstName + ' ' + u.LastName as AssigneeName,
-                           u.Department
-                    FROM Tasks t
-                    LEFT JOIN Users u ON t.AssignedToID = u.UserID
-                    WHERE t.ProjectID = ? AND t.Status != 'Cancelled'
-                    ORDER BY t.DueDate
-                """
-                tasks = self.db.execute_query(tasks_query, (project["ProjectID"],))
-
-                for task in tasks:
-                    if not task["DueDate"]:
-                        continue
 
+                for task in tasks_by_project.get(project["ProjectID"], []):
                     # Use StartDate if available, otherwise use project start date
-                    task_start = task["StartDate"]
-                    if not task_start:
-                        task_start = project["StartDate"]
-
-                    if isinstance(task_start, datetime):
-                        task_start = task_start.date()
-                    if isinstance(task["DueDate"], datetime):
-                        task_due = task["DueDate"].date()
-                    else:
-                        task_due = task["DueDate"]
-
-                    # Parse dependencies
-                    dependencies = []
-                    if task.get("Dependencies"):
-                        try:
-                            dep_ids = task["Dependencies"].split(",")
-                            dependencies = [
-                                f"task_{dep.strip()}" for dep in dep_ids if dep.strip()
-                            ]
-                        except:
-                            dependencies = []
-
-                    # Create task item
-                    task_item = GanttItem(
-                        id=f"task_{task['TaskID']}",
-                        name=f"   ✓ {task['Title']}",
-                        start_date=task_start,
-                        end_date=task_due,
-                        completion=task.get("CompletionPercentage", 0),
-                        priority=task.get("Priority", "Medium"),
-                        status=task.get("Status", "To Do"),
-                        resource=task.get("AssigneeName", "Unassigned"),
-                        dependencies=dependencies,
-                        category="Task",
-                        color=self.color_schemes["status"].get(
-                            task.get("Status", "To Do")
-                        ),
-                        description=task.get("Description", ""),
-                        milestones=[],
+                    task_start = (
+                        self._as_date(task["StartDate"])
+                        if task["StartDate"]
+                        else project_start
+                    )
+
+                    append(
+                        f"task_{task['TaskID']}",
+                        f"   ✓ {task['Title']}",
+                        task_start,
+                        self._as_date(task["DueDate"]),
+                        task,
+                        task.get("AssigneeName"),
+                        False,
+                        dependency_map.get(task["TaskID"], no_edges),
                     )
-                    gantt_items.append(task_item)
 
-            return gantt_items
+            return ColumnarSchedule.from_columns(**columns)
 
         except Exception as e:
             logger.error(f"Error loading Gantt data: {e}")
-            return []
+            return ColumnarSchedule.empty()
+
+    @staticmethod
+    def _as_schedule(data: Any) -> ColumnarSchedule:
+        """Accept either a ColumnarSchedule or a list of GanttItem objects"""
+        if isinstance(data, ColumnarSchedule):
+            return data
+        return ColumnarSchedule.from_items(data or [])
+
+    @staticmethod
+    def _as_date(value: Any) -> date:
+        """Normalize datetime/ISO string values from the driver to date"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, str):
+            return datetime.fromisoformat(value).date()
+        return value
 
     def create_interactive_gantt(
-        self, gantt_items: List[GanttItem], view_mode: str = "months"
+        self,
+        gantt_items: Union[ColumnarSchedule, List[GanttItem]],
+        view_mode: str = "months",
+        use_webgl: Optional[bool] = None,
+        viewport: Optional[GanttViewport] = None,
+        show_progress: bool = True,
+        measure_payload: bool = False,
+        milestone_loader: Optional[
+            Callable[[List[int]], Dict[int, List[Dict[str, Any]]]]
+        ] = None,
     ) -> go.Figure:
-        """Create interactive Gantt chart with advanced features"""
+        """Create interactive Gantt chart with advanced features
+
+        With a ``viewport`` only its window of outline rows is rendered, so
+        figure size and height are bounded by the page, not the portfolio.
+        ``milestone_loader`` is called once with the rendered project IDs
+        and returns their milestones keyed by project.
+        ``measure_payload`` serializes the figure to record its size; it is
+        for diagnostics and benchmarks only.
+        """
         if not gantt_items:
             return self.create_empty_gantt()
 
         try:
-            # Prepare data for Plotly
-            df_data = []
-
-            for item in gantt_items:
-                # Calculate duration
-                duration = (item.end_date - item.start_date).days + 1
-
-                # Create hover text
-                hover_text = f"""
-                <b>{item.name}</b><br>
-                <b>ระยะเวลา:</b> {item.start_date.strftime('%d/%m/%Y')} - {item.end_date.strftime('%d/%m/%Y')}<br>
-                <b>ความคืบหน้า:</b> {item.completion}%<br>
-                <b>สถานะ:</b> {item.status}<br>
-                <b>ความสำคัญ:</b> {item.priority}<br>
-                <b>ผู้รับผิดชอบ:</b> {item.resource}<br>
-                <b>ระยะเวลา:</b> {duration} วัน
-                """
-
-                if item.description:
-                    hover_text += f"<br><b>รายละเอียด:</b> {item.description[:100]}..."
-
-                df_data.append(
-                    {
-                        "Task": item.name,
-                        "Start": item.start_date,
-                        "Finish": item.end_date,
-                        "Completion": item.completion,
-                        "Status": item.status,
-                        "Priority": item.priority,
-                        "Resource": item.resource,
-                        "Category": item.category,
-                        "Color": item.color,
-                        "Duration": duration,
-                        "Hover": hover_text,
-                        "ID": item.id,
-                    }
-                )
-
-            df = pd.DataFrame(df_data)
+            df = self._as_schedule(gantt_items).to_frame()
+            total_rows = len(df)
+            if viewport is not None:
+                df, total_rows = self.figure_builder.apply_viewport(df, viewport)
 
-            # Create figure
-            fig = px.timeline(
+            fig = self.figure_builder.build(
                 df,
-                x_start="Start",
-                x_end="Finish",
-                y="Task",
-                color="Status",
-                color_discrete_map=self.color_schemes["status"],
-                hover_name="Task",
-                hover_data={
-                    "Start": True,
-                    "Finish": True,
-                    "Completion": True,
-                    "Resource": True,
-                    "Priority": True,
-                    "Duration": True,
-                },
-                title="📈 Gantt Chart - Project Timeline",
+                use_webgl=use_webgl,
+                show_progress=show_progress,
+                show_labels=show_progress,
+                measure_payload=measure_payload,
             )
+            self.figure_builder.last_stats["total_rows"] = total_rows
 
-            # Enhance layout
-            fig.update_layout(
-                height=max(600, len(df) * 40),
-                font=dict(family="Inter, sans-serif", size=12),
-                title_font_size=20,
-                title_font_color="#1e3c72",
-                showlegend=True,
-                legend=dict(
-                    orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1
-                ),
-                xaxis=dict(
-                    title="Timeline",
-                    showgrid=True,
-                    gridcolor="rgba(0,0,0,0.1)",
-                    gridwidth=1,
-                ),
-                yaxis=dict(
-                    title="",
-                    showgrid=True,
-                    gridcolor="rgba(0,0,0,0.1)",
-                    gridwidth=1,
-                    autorange="reversed",
-                ),
-                plot_bgcolor="white",
-                paper_bgcolor="white",
-            )
-
-            # Add completion percentage annotations
-            for i, row in df.iterrows():
-                if row["Completion"] > 0:
-                    # Calculate position for completion indicator
-                    total_duration = (row["Finish"] - row["Start"]).days + 1
-                    completed_duration = total_duration * (row["Completion"] / 100)
-                    completion_date = row["Start"] + timedelta(days=completed_duration)
-
-                    fig.add_shape(
-                        type="line",
-                        x0=completion_date,
-                        x1=completion_date,
-                        y0=i - 0.4,
-                        y1=i + 0.4,
-                        line=dict(color="rgba(0,0,0,0.6)", width=3),
-                        layer="above",
-                    )
-
-                    # Add completion percentage text
-                    fig.add_annotation(
-                        x=completion_date,
-                        y=i,
-                        text=f"{row['Completion']:.0f}%",
-                        showarrow=False,
-                        font=dict(color="white", size=10, family="Inter"),
-                        bgcolor="rgba(0,0,0,0.7)",
-                        bordercolor="white",
-                        borderwidth=1,
-                    )
-
-            # Add today line
-            today = datetime.now().date()
+            # Add today line (epoch ms: add_vline cannot average date values)
+            today = pd.Timestamp(datetime.now().date())
             fig.add_vline(
-                x=today,
+                x=today.value // 1_000_000,
                 line_dash="dash",
                 line_color="red",
                 line_width=2,
@@ -356,8 +321,14 @@ class GanttChartManager:
                 annotation_position="top",
             )
 
-            # Add milestone markers if any
-            self.add_milestones_to_gantt(fig, gantt_items)
+            # Add milestone markers: GanttItem lists carry them, schedules
+            # load them for the rendered projects
+            if isinstance(gantt_items, list):
+                self.add_milestones_to_gantt(
+                    fig, [gantt_items[i] for i in df.index]
+                )
+            elif milestone_loader is not None:
+                self.add_project_milestones(fig, df, milestone_loader)
 
             return fig
 
@@ -392,164 +363,184 @@ class GanttChartManager:
         return fig
 
     def add_milestones_to_gantt(
-        self, fig: go.Figure, gantt_items: List[GanttItem]
+        self, fig: go.Figure, gantt_items: List[GanttItem], row_offset: int = 0
     ) -> None:
-        """Add milestone markers to Gantt chart"""
+        """Add milestone markers to Gantt chart as a single trace"""
         try:
-            for item in gantt_items:
-                if item.milestones:
-                    for milestone in item.milestones:
-                        milestone_date = milestone.get("date")
-                        milestone_name = milestone.get("name", "Milestone")
-
-                        if milestone_date:
-                            fig.add_scatter(
-                                x=[milestone_date],
-                                y=[item.name],
-                                mode="markers",
-                                marker=dict(
-                                    symbol="diamond",
-                                    size=15,
-                                    color="gold",
-                                    line=dict(color="orange", width=2),
-                                ),
-                                name=milestone_name,
-                                hovertemplate=f"<b>{milestone_name}</b><br>วันที่: {milestone_date}<extra></extra>",
-                                showlegend=False,
-                            )
+            xs, ys, names = [], [], []
+            for row, item in enumerate(gantt_items, start=row_offset):
+                for milestone in item.milestones or []:
+                    if milestone.get("date"):
+                        xs.append(milestone["date"])
+                        ys.append(row)
+                        names.append(milestone.get("name", "Milestone"))
+
+            self._add_milestone_trace(fig, xs, ys, names)
         except Exception as e:
             logger.error(f"Error adding milestones: {e}")
 
-    def create_resource_timeline(self, gantt_items: List[GanttItem]) -> go.Figure:
-        """Create resource utilization timeline"""
+    def add_project_milestones(
+        self,
+        fig: go.Figure,
+        df: pd.DataFrame,
+        milestone_loader: Callable[[List[int]], Dict[int, List[Dict[str, Any]]]],
+    ) -> None:
+        """Mark milestones on the project rows of a rendered frame"""
         try:
-            # Group by resource
-            resource_data = {}
-
-            for item in gantt_items:
-                if item.resource not in resource_data:
-                    resource_data[item.resource] = []
-
-                resource_data[item.resource].append(
-                    {
-                        "name": item.name,
-                        "start": item.start_date,
-                        "end": item.end_date,
-                        "status": item.status,
-                        "category": item.category,
-                    }
-                )
-
-            fig = go.Figure()
+            rows = {}
+            for row, (item_id, category) in enumerate(zip(df["ID"], df["Category"])):
+                if category == "Project":
+                    rows[int(str(item_id).split("_", 1)[1])] = row
+            if not rows:
+                return
+
+            xs, ys, names = [], [], []
+            for project_id, milestones in milestone_loader(list(rows)).items():
+                for milestone in milestones:
+                    if milestone.get("DueDate"):
+                        xs.append(self._as_date(milestone["DueDate"]))
+                        ys.append(rows[project_id])
+                        names.append(
+                            f"{milestone.get('Name', 'Milestone')} "
+                            f"({milestone.get('ProgressPercentage', 0):.0f}%)"
+                        )
 
-            colors = px.colors.qualitative.Set3
-            y_pos = 0
+            self._add_milestone_trace(fig, xs, ys, names)
+        except Exception as e:
+            logger.error(f"Error adding project milestones: {e}")
 
-            for resource, tasks in resource_data.items():
-                color_idx = y_pos % len(colors)
+    @staticmethod
+    def _add_milestone_trace(
+        fig: go.Figure, xs: List[Any], ys: List[int], names: List[str]
+    ) -> None:
+        """All milestone markers of a figure as one diamond trace"""
+        if xs:
+            fig.add_scatter(
+                x=xs,
+                y=ys,
+                mode="markers",
+                marker=dict(
+                    symbol="diamond",
+                    size=15,
+                    color="gold",
+                    line=dict(color="orange", width=2),
+                ),
+                text=names,
+                hovertemplate="<b>%{text}</b><br>วันที่: %{x}<extra></extra>",
+                showlegend=False,
+            )
 
-                for task in tasks:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[task["start"], task["end"]],
-                            y=[resource, resource],
-                            mode="lines",
-                            line=dict(color=colors[color_idx], width=8),
-                            name=task["name"],
-                            hovertemplate=f"<b>{task['name']}</b><br>ผู้รับผิดชอบ: {resource}<br>ระยะเวลา: {task['start']} - {task['end']}<extra></extra>",
-                            showlegend=False,
-                        )
-                    )
+    def create_resource_timeline(
+        self,
+        gantt_items: Union[ColumnarSchedule, List[GanttItem]],
+        use_webgl: Optional[bool] = None,
+    ) -> go.Figure:
+        """Create resource utilization timeline
 
-                y_pos += 1
+        One trace per resource plus a per-day utilization heatmap, so team
+        timelines with thousands of assignments stay interactive.
+        """
+        try:
+            schedule = self._as_schedule(gantt_items)
+            if schedule.is_project.all():
+                return self.create_empty_gantt()
+            df = schedule.to_frame()
 
-            fig.update_layout(
-                title="📊 Resource Utilization Timeline",
-                xaxis_title="Timeline",
-                yaxis_title="Resources",
-                height=max(400, len(resource_data) * 60),
-                font=dict(family="Inter, sans-serif"),
-                title_font_size=18,
-                title_font_color="#1e3c72",
+            return self.figure_builder.build_resource_timeline(
+                df,
+                use_webgl=use_webgl,
+                capacity=self.conflict_detector.capacity,
             )
 
-            return fig
-
         except Exception as e:
             logger.error(f"Error creating resource timeline: {e}")
             return self.create_empty_gantt()
 
     def create_critical_path_analysis(
-        self, gantt_items: List[GanttItem]
+        self, gantt_items: Union[ColumnarSchedule, List[GanttItem]]
     ) -> Dict[str, Any]:
         """Analyze critical path and bottlenecks"""
         try:
             analysis = {
                 "critical_tasks": [],
+                "critical_path": [],
                 "bottlenecks": [],
                 "resource_conflicts": [],
+                "peak_load": {},
+                "over_allocation": [],
                 "timeline_risks": [],
+                "schedule": [],
+                "project_finish": None,
             }
 
-            # Find overdue items
+            schedule = self._as_schedule(gantt_items)
             today = date.today()
+            today_day = to_day(today)
+            names = schedule.names
+
+            # Critical path method over the task dependency graph
+            try:
+                cpm = self.cpm_engine.analyze_schedule(schedule)
+            except ValueError as e:
+                logger.warning(f"Critical path skipped: {e}")
+                cpm = None
+
+            if cpm is not None:
+                analysis["project_finish"] = cpm.offset_to_date(
+                    int(cpm.early_finish.max()) - 1
+                )
+                analysis["schedule"] = cpm.to_records()
+                rows = [schedule.index_of(item_id) for item_id in cpm.ids]
 
-            for item in gantt_items:
-                # Critical tasks (high priority, not completed, due soon)
-                if (
-                    item.priority in ["High", "Critical"]
-                    and item.completion < 100
-                    and item.end_date <= today + timedelta(days=7)
+                for record, row, successors in zip(
+                    analysis["schedule"], rows, cpm.successor_count.tolist()
                 ):
-                    analysis["critical_tasks"].append(
-                        {
-                            "name": item.name,
-                            "due_date": item.end_date,
-                            "completion": item.completion,
-                            "days_remaining": (item.end_date - today).days,
-                        }
-                    )
+                    record["name"] = names[row]
+                    completion = float(schedule.completion[row])
+                    if record["critical"] and completion < 100:
+                        due_date = from_day(schedule.finish[row])
+                        analysis["critical_tasks"].append(
+                            {
+                                "name": names[row],
+                                "due_date": due_date,
+                                "completion": completion,
+                                "days_remaining": (due_date - today).days,
+                                "total_float": record["total_float"],
+                            }
+                        )
+                        # Critical work that gates several successors
+                        if successors >= 2:
+                            analysis["bottlenecks"].append(
+                                {
+                                    "name": names[row],
+                                    "successors": successors,
+                                    "due_date": due_date,
+                                }
+                            )
 
-                # Timeline risks (overdue or at risk)
-                if item.end_date < today and item.completion < 100:
-                    analysis["timeline_risks"].append(
-                        {
-                            "name": item.name,
-                            "due_date": item.end_date,
-                            "days_overdue": (today - item.end_date).days,
-                            "completion": item.completion,
-                        }
-                    )
+                analysis["critical_path"] = [
+                    names[rows[i]] for i in cpm.critical_path
+                ]
+
+            # Timeline risks (overdue or at risk)
+            overdue = np.flatnonzero(
+                (schedule.finish < today_day) & (schedule.completion < 100)
+            )
+            for row in overdue.tolist():
+                analysis["timeline_risks"].append(
+                    {
+                        "name": names[row],
+                        "due_date": from_day(schedule.finish[row]),
+                        "days_overdue": int(today_day - schedule.finish[row]),
+                        "completion": float(schedule.completion[row]),
+                    }
+                )
 
             # Resource conflicts (same person assigned to overlapping tasks)
-            resource_tasks = {}
-            for item in gantt_items:
-                if item.resource not in resource_tasks:
-                    resource_tasks[item.resource] = []
-                resource_tasks[item.resource].append(item)
-
-            for resource, tasks in resource_tasks.items():
-                if len(tasks) > 1:
-                    # Check for overlapping tasks
-                    for i, task1 in enumerate(tasks):
-                        for task2 in tasks[i + 1 :]:
-                            if (
-                                task1.start_date <= task2.end_date
-                                and task2.start_date <= task1.end_date
-                            ):
-                                analysis["resource_conflicts"].append(
-                                    {
-                                        "resource": resource,
-                                        "task1": task1.name,
-                                        "task2": task2.name,
-                                        "overlap_start": max(
-                                            task1.start_date, task2.start_date
-                                        ),
-                                        "overlap_end": min(
-                                            task1.end_date, task2.end_date
-                                        ),
-                                    }
-                                )
+            conflicts = self.conflict_detector.detect_schedule(schedule)
+            analysis["resource_conflicts"] = conflicts["conflicts"]
+            analysis["peak_load"] = conflicts["peak_load"]
+            analysis["over_allocation"] = conflicts["over_allocation"]
 
             return analysis
 
@@ -557,44 +548,105 @@ class GanttChartManager:
             logger.error(f"Error in critical path analysis: {e}")
             return {}
 
-    def export_gantt_data(
-        self, gantt_items: List[GanttItem], format: str = "excel"
-    ) -> bytes:
-        """Export Gantt data to various formats"""
-        try:
-            # Prepare data for export
-            export_data = []
+    def reschedule_task(
+        self,
+        schedule: ColumnarSchedule,
+        task_id: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Move one task and propagate the change to its dependents only
 
-            for item in gantt_items:
-                export_data.append(
-                    {
-                        "ID": item.id,
-                        "Name": item.name,
-                        "Category": item.category,
-                        "Start Date": item.start_date.strftime("%Y-%m-%d"),
-                        "End Date": item.end_date.strftime("%Y-%m-%d"),
-                        "Duration (Days)": (item.end_date - item.start_date).days + 1,
-                        "Completion (%)": item.completion,
-                        "Status": item.status,
-                        "Priority": item.priority,
-                        "Resource": item.resource,
-                        "Dependencies": ", ".join(item.dependencies),
-                        "Description": item.description,
-                    }
+        The rescheduler for ``schedule`` is built once and reused across
+        edits; moved tasks are written back into the schedule's date columns
+        so a redraw reflects the change. Returns the changed tasks with their
+        new dates and float.
+        """
+        try:
+            if self._rescheduler is None or self._rescheduler[0] is not schedule:
+                self._rescheduler = (
+                    schedule,
+                    IncrementalRescheduler.from_schedule(schedule),
                 )
+            engine = self._rescheduler[1]
+            if engine is None:
+                return {}
+
+            result = engine.reschedule(task_id, start=start, end=end)
+
+            for record in result.changed:
+                row = schedule.index_of(record["id"])
+                record["name"] = schedule.names[row]
+                if record["id"] in result.moved:
+                    schedule.start[row] = to_day(record["early_start"])
+                    schedule.finish[row] = to_day(record["early_finish"])
+
+            return {
+                "changed": result.changed,
+                "project_finish": result.project_finish,
+                "visited": result.visited,
+                "full_backward_pass": result.full_backward_pass,
+            }
 
-            df = pd.DataFrame(export_data)
+        except Exception as e:
+            logger.error(f"Error rescheduling task {task_id}: {e}")
+            return {}
 
-            if format.lower() == "excel":
-                return df.to_excel(index=False)
-            elif format.lower() == "csv":
-                return df.to_csv(index=False).encode("utf-8")
-            else:
-                return df.to_json(orient="records").encode("utf-8")
+    def export_schedule(
+        self,
+        gantt_items: Union[ColumnarSchedule, List[GanttItem]],
+        target: Union[str, os.PathLike, BinaryIO],
+        format: str = "excel",
+    ) -> Dict[str, Any]:
+        """Stream Gantt data to a file path or binary stream
+
+        Returns the rows exported, bytes written and throughput.
+        """
+        try:
+            stats = self.exporter.export(self._as_schedule(gantt_items), target, format)
+            return stats.to_dict()
 
         except Exception as e:
             logger.error(f"Error exporting Gantt data: {e}")
+            return {}
+
+    def export_gantt_data(
+        self,
+        gantt_items: Union[ColumnarSchedule, List[GanttItem]],
+        format: str = "excel",
+    ) -> bytes:
+        """Export Gantt data to various formats (JSON is one object per line)"""
+        buffer = io.BytesIO()
+        if not self.export_schedule(gantt_items, buffer, format):
             return b""
+        return buffer.getvalue()
+
+
+def _session_schedule(
+    gantt_manager: GanttChartManager,
+    project_id: Optional[int],
+    date_range: Optional[Tuple[date, date]],
+) -> ColumnarSchedule:
+    """Schedule for this session, loaded once per project and date range
+
+    What-if edits are written into the cached schedule, and the manager
+    keeps its rescheduler for it, so reruns keep both until the filter
+    changes or the data is refreshed.
+    """
+    key = (project_id, date_range)
+    cached = st.session_state.get("gantt_schedule")
+    if cached is None or cached[0] != key:
+        with st.spinner("📊 กำลังโหลดข้อมูล Gantt Chart..."):
+            schedule = gantt_manager.get_schedule(
+                project_id=project_id, date_range=date_range
+            )
+        # Empty results are not kept so new data shows up on the next rerun
+        if not len(schedule):
+            st.session_state.pop("gantt_schedule", None)
+            return schedule
+        cached = (key, schedule)
+        st.session_state.gantt_schedule = cached
+    return cached[1]
 
 
 def show_gantt_page(project_manager, task_manager):
@@ -609,8 +661,10 @@ def show_gantt_page(project_manager, task_manager):
         breadcrumbs=["Dashboard", "Project Management", "Gantt Chart"],
     )
 
-    # Initialize Gantt manager
-    gantt_manager = GanttChartManager(project_manager.db)
+    # One Gantt manager per session so its rescheduler survives reruns
+    if "gantt_manager" not in st.session_state:
+        st.session_state.gantt_manager = GanttChartManager(project_manager.db)
+    gantt_manager = st.session_state.gantt_manager
 
     # Sidebar controls
     with st.sidebar:
@@ -663,6 +717,20 @@ def show_gantt_page(project_manager, task_manager):
         show_resources = st.checkbox("แสดง Resource Timeline", value=False)
         show_critical_path = st.checkbox("วิเคราะห์ Critical Path", value=False)
 
+        # Viewport options
+        st.markdown("#### 🧭 ช่วงแถวที่แสดง")
+        page_size = st.select_slider(
+            "จำนวนแถวต่อหน้า",
+            options=[25, 50, 100, 200],
+            value=50,
+            help="แสดงผลเฉพาะแถวในหน้าปัจจุบันเพื่อให้ Gantt Chart ขนาดใหญ่ตอบสนองได้รวดเร็ว",
+        )
+        collapse_projects = st.checkbox(
+            "ย่อโครงการ (แสดงแถบสรุป)",
+            value=False,
+            help="แสดงโครงการเป็นแถบสรุปเดียว และขยายเฉพาะโครงการที่เลือก",
+        )
+
         # Export options
         st.markdown("#### 📤 ส่งออกข้อมูล")
         export_format = st.selectbox(
@@ -671,21 +739,38 @@ def show_gantt_page(project_manager, task_manager):
             format_func=lambda x: {
                 "excel": "Excel (.xlsx)",
                 "csv": "CSV (.csv)",
-                "json": "JSON (.json)",
+                "json": "JSON Lines (.jsonl)",
             }[x],
         )
 
-        if st.button("📥 ส่งออกข้อมูล", use_container_width=True):
-            st.info("ฟีเจอร์ส่งออกข้อมูลจะทำงานหลังจากสร้าง Gantt Chart")
+        export_requested = st.button("📥 ส่งออกข้อมูล", use_container_width=True)
 
     # Main content area
     # Load Gantt data
-    with st.spinner("📊 กำลังโหลดข้อมูล Gantt Chart..."):
-        gantt_items = gantt_manager.get_gantt_data(
-            project_id=selected_project_id, date_range=date_range
-        )
+    schedule = _session_schedule(gantt_manager, selected_project_id, date_range)
 
-    if not gantt_items:
+    if export_requested and len(schedule):
+        with st.sidebar:
+            buffer = io.BytesIO()
+            export_stats = gantt_manager.export_schedule(
+                schedule, buffer, export_format
+            )
+            if export_stats:
+                st.download_button(
+                    "💾 ดาวน์โหลดไฟล์",
+                    data=buffer.getvalue(),
+                    file_name=f"gantt_{date.today():%Y%m%d}{EXPORT_FORMATS[export_format]}",
+                    use_container_width=True,
+                )
+                st.caption(
+                    f"{export_stats['rows']:,} แถว • "
+                    f"{export_stats['bytes_written'] / 1024:,.0f} KB • "
+                    f"{export_stats['rows_per_second']:,.0f} แถว/วินาที"
+                )
+            else:
+                st.error("ไม่สามารถส่งออกข้อมูลได้")
+
+    if not len(schedule):
         ui.render_empty_state(
             "ไม่มีข้อมูลโครงการหรืองานในช่วงเวลาที่เลือก",
             "📈",
@@ -698,15 +783,13 @@ def show_gantt_page(project_manager, task_manager):
     st.markdown("### 📊 สรุปข้อมูล")
 
     # Calculate summary statistics
-    total_projects = len([item for item in gantt_items if item.category == "Project"])
-    total_tasks = len([item for item in gantt_items if item.category == "Task"])
-    avg_completion = np.mean([item.completion for item in gantt_items])
+    total_projects = int(schedule.is_project.sum())
+    total_tasks = len(schedule) - total_projects
+    avg_completion = float(schedule.completion.mean())
 
-    overdue_items = [
-        item
-        for item in gantt_items
-        if item.end_date < date.today() and item.completion < 100
-    ]
+    overdue_items = np.flatnonzero(
+        (schedule.finish < to_day(date.today())) & (schedule.completion < 100)
+    )
 
     ui.render_enhanced_metric_cards(
         [
@@ -734,8 +817,8 @@ def show_gantt_page(project_manager, task_manager):
                 "title": "เลยกำหนด",
                 "value": len(overdue_items),
                 "icon": "⏰",
-                "delta": f"-{len(overdue_items)}" if overdue_items else "0",
-                "delta_color": "inverse" if overdue_items else "normal",
+                "delta": f"-{len(overdue_items)}" if len(overdue_items) else "0",
+                "delta_color": "inverse" if len(overdue_items) else "normal",
                 "help": "จำนวนงานที่เลยกำหนดแล้ว",
             },
         ]
@@ -744,25 +827,86 @@ def show_gantt_page(project_manager, task_manager):
     # Main Gantt Chart
     st.markdown("### 📈 Gantt Chart")
 
+    expanded = None
+    if collapse_projects:
+        project_names = {
+            schedule.ids[row]: schedule.names[row]
+            for row in np.flatnonzero(schedule.is_project).tolist()
+        }
+        expanded = set(
+            st.multiselect(
+                "ขยายโครงการ",
+                options=list(project_names),
+                format_func=project_names.get,
+                key="gantt_expanded_projects",
+            )
+        )
+
+    viewport = GanttViewport(
+        start_row=st.session_state.get("gantt_row_start", 0),
+        page_size=page_size,
+        expanded=expanded,
+    )
+
     with ui.render_chart_container(
         lambda: None, loading_text="กำลังสร้าง Gantt Chart..."
     ):
-        gantt_fig = gantt_manager.create_interactive_gantt(gantt_items, view_mode)
+        gantt_fig = gantt_manager.create_interactive_gantt(
+            schedule,
+            view_mode,
+            viewport=viewport,
+            show_progress=show_completion,
+            milestone_loader=project_manager.get_milestones_for_projects,
+        )
         st.plotly_chart(gantt_fig, use_container_width=True)
 
+        # Server-side paging over the visible outline rows
+        total_rows = gantt_manager.figure_builder.last_stats.get("total_rows", 0)
+        if total_rows > page_size:
+            row_start = min(viewport.start_row, total_rows - 1)
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("⬅️ ก่อนหน้า", disabled=row_start == 0):
+                    st.session_state.gantt_row_start = max(0, row_start - page_size)
+                    st.rerun()
+            with col2:
+                st.caption(
+                    f"แถว {row_start + 1:,} - "
+                    f"{min(row_start + page_size, total_rows):,} จาก {total_rows:,}"
+                )
+            with col3:
+                if st.button(
+                    "ถัดไป ➡️", disabled=row_start + page_size >= total_rows
+                ):
+                    st.session_state.gantt_row_start = row_start + page_size
+                    st.rerun()
+
+        stats = gantt_manager.figure_builder.last_stats
+        if stats.get("rows"):
+            payload = (
+                f" • {stats['payload_bytes'] / 1024:,.0f} KB"
+                if stats.get("payload_bytes")
+                else ""
+            )
+            st.caption(
+                f"{stats['rows']:,} แถว • {stats['traces']} traces{payload}"
+                f"{' • WebGL' if stats['webgl'] else ''} • "
+                f"{stats['build_ms']:.0f} ms"
+            )
+
     # Additional views based on sidebar selections
     if show_resources:
         st.markdown("### 👥 Resource Timeline")
         with ui.render_chart_container(
             lambda: None, loading_text="กำลังสร้าง Resource Timeline..."
         ):
-            resource_fig = gantt_manager.create_resource_timeline(gantt_items)
+            resource_fig = gantt_manager.create_resource_timeline(schedule)
             st.plotly_chart(resource_fig, use_container_width=True)
 
     if show_critical_path:
         st.markdown("### 🎯 Critical Path Analysis")
 
-        analysis = gantt_manager.create_critical_path_analysis(gantt_items)
+        analysis = gantt_manager.create_critical_path_analysis(schedule)
 
         if analysis:
             # Create tabs for different analysis views
@@ -771,11 +915,22 @@ def show_gantt_page(project_manager, task_manager):
             )
 
             with tab1:
+                if analysis.get("critical_path"):
+                    st.markdown(
+                        f"**Critical Path** (สิ้นสุด {analysis['project_finish']}): "
+                        + " → ".join(name.strip() for name in analysis["critical_path"])
+                    )
                 if analysis.get("critical_tasks"):
                     ui.render_data_table(
                         analysis["critical_tasks"],
                         title="งานที่ต้องให้ความสำคัญ",
-                        columns=["name", "due_date", "completion", "days_remaining"],
+                        columns=[
+                            "name",
+                            "due_date",
+                            "completion",
+                            "days_remaining",
+                            "total_float",
+                        ],
                     )
                 else:
                     ui.render_empty_state("ไม่มีงานที่ต้องให้ความสำคัญเร่งด่วน", "✅")
@@ -797,42 +952,87 @@ def show_gantt_page(project_manager, task_manager):
                         title="ความขัดแย้งการใช้ทรัพยากร",
                         columns=[
                             "resource",
-                            "task1",
-                            "task2",
                             "overlap_start",
                             "overlap_end",
+                            "peak_load",
+                            "tasks",
                         ],
                     )
                 else:
                     ui.render_empty_state("ไม่มีความขัดแย้งการใช้ทรัพยากร", "👥")
 
+    # What-if rescheduling of a single task
+    with st.expander("🔁 จำลองการเลื่อนงาน", expanded=False):
+        task_rows = np.flatnonzero(~schedule.is_project).tolist()
+        if task_rows:
+            row = st.selectbox(
+                "เลือกงาน",
+                options=task_rows,
+                format_func=lambda r: schedule.names[r].strip(),
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                new_start = st.date_input(
+                    "วันเริ่มต้นใหม่", value=from_day(schedule.start[row])
+                )
+            with col2:
+                new_end = st.date_input(
+                    "วันสิ้นสุดใหม่", value=from_day(schedule.finish[row])
+                )
+
+            if st.button("คำนวณผลกระทบ", use_container_width=True):
+                impact = gantt_manager.reschedule_task(
+                    schedule, schedule.ids[row], start=new_start, end=new_end
+                )
+                if impact:
+                    st.caption(
+                        f"งานที่ได้รับผลกระทบ {len(impact['changed']):,} งาน • "
+                        f"ตรวจสอบ {impact['visited']:,} งาน • "
+                        f"วันสิ้นสุดโครงการ {impact['project_finish']}"
+                    )
+                    st.dataframe(
+                        pd.DataFrame(impact["changed"])[
+                            [
+                                "name",
+                                "early_start",
+                                "early_finish",
+                                "total_float",
+                                "free_float",
+                                "critical",
+                            ]
+                        ],
+                        use_container_width=True,
+                    )
+                else:
+                    st.warning("ไม่สามารถคำนวณผลกระทบได้")
+
     # Detailed task list
     with st.expander("📋 รายละเอียดงานทั้งหมด", expanded=False):
-        # Convert gantt items to table format
-        table_data = []
-        for item in gantt_items:
-            duration = (item.end_date - item.start_date).days + 1
-            table_data.append(
-                {
-                    "ชื่อ": item.name,
-                    "ประเภท": item.category,
-                    "วันเริ่มต้น": item.start_date.strftime("%d/%m/%Y"),
-                    "วันสิ้นสุด": item.end_date.strftime("%d/%m/%Y"),
-                    "ระยะเวลา (วัน)": duration,
-                    "ความคืบหน้า (%)": f"{item.completion:.1f}%",
-                    "สถานะ": item.status,
-                    "ความสำคัญ": item.priority,
-                    "ผู้รับผิดชอบ": item.resource,
-                }
-            )
+        # Table straight from the schedule columns
+        table_data = pd.DataFrame(
+            {
+                "ชื่อ": schedule.names,
+                "ประเภท": schedule.categories,
+                "วันเริ่มต้น": pd.to_datetime(schedule.start_dates()).strftime(
+                    "%d/%m/%Y"
+                ),
+                "วันสิ้นสุด": pd.to_datetime(schedule.finish_dates()).strftime(
+                    "%d/%m/%Y"
+                ),
+                "ระยะเวลา (วัน)": schedule.finish - schedule.start + 1,
+                "ความคืบหน้า (%)": [f"{c:.1f}%" for c in schedule.completion],
+                "สถานะ": schedule.labels(schedule.status, schedule.statuses),
+                "ความสำคัญ": schedule.labels(schedule.priority, schedule.priorities),
+                "ผู้รับผิดชอบ": schedule.labels(schedule.resource, schedule.resources),
+            }
+        )
 
-        if table_data:
+        if not table_data.empty:
             ui.render_data_table(
                 table_data,
                 title="รายละเอียดงานทั้งหมดใน Gantt Chart",
                 search=True,
                 pagination=True,
-                export=True,
                 page_size=15,
             )
 
@@ -860,6 +1060,8 @@ def show_gantt_page(project_manager, task_manager):
 
     with col4:
         if st.button("🔄 รีเฟรชข้อมูล", use_container_width=True):
+            # Drops what-if edits along with the cached schedule
+            st.session_state.pop("gantt_schedule", None)
             st.rerun()
 
     # Tips and help section
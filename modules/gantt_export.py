@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+modules/gantt_export.py
+SDX Project Manager - Streaming Gantt Export
+Writes schedules to paths or binary streams as CSV, JSON lines or write-only Excel in constant memory
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Any, BinaryIO, Union
+
+import numpy as np
+from openpyxl import Workbook
+
+from modules.schedule import ColumnarSchedule
+
+logger = logging.getLogger(__name__)
+
+
+EXPORT_COLUMNS = [
+    "ID",
+    "Name",
+    "Category",
+    "Start Date",
+    "End Date",
+    "Duration (Days)",
+    "Completion (%)",
+    "Status",
+    "Priority",
+    "Resource",
+    "Dependencies",
+    "Description",
+]
+
+EXPORT_FORMATS = {
+    "excel": ".xlsx",
+    "csv": ".csv",
+    "json": ".jsonl",
+}
+
+
+@dataclass
+class ExportStats:
+    """Outcome of one export run"""
+
+    format: str
+    rows: int
+    bytes_written: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": self.format,
+            "rows": self.rows,
+            "bytes_written": self.bytes_written,
+            "seconds": self.seconds,
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+class _CountingWriter(io.RawIOBase):
+    """Write-through wrapper that counts bytes for non-seekable targets"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.count = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        written = self.stream.write(data)
+        written = len(data) if written is None else written
+        self.count += written
+        return written
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class GanttExporter:
+    """Streams a ColumnarSchedule to disk or a binary stream
+
+    Rows are decoded from the schedule columns ``chunk_size`` at a time and
+    handed to an incremental writer (csv.writer, one JSON object per line,
+    or an openpyxl write-only worksheet), so memory stays flat no matter how
+    many rows are exported. Caller-owned streams are flushed, never closed.
+    """
+
+    def __init__(self, chunk_size: int = 5000):
+        self.chunk_size = chunk_size
+
+    def export(
+        self,
+        schedule: ColumnarSchedule,
+        target: Union[str, os.PathLike, BinaryIO],
+        format: str = "excel",
+    ) -> ExportStats:
+        """Export to a file path or a writable binary stream"""
+        format = format.lower()
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+
+        started = time.perf_counter()
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as stream:
+                rows = self._write(schedule, stream, format)
+            bytes_written = os.path.getsize(target)
+        else:
+            seekable = getattr(target, "seekable", lambda: False)()
+            if seekable:
+                offset = target.tell()
+                rows = self._write(schedule, target, format)
+                bytes_written = target.tell() - offset
+            else:
+                counter = _CountingWriter(target)
+                rows = self._write(schedule, counter, format)
+                bytes_written = counter.count
+            target.flush()
+
+        stats = ExportStats(
+            format=format,
+            rows=rows,
+            bytes_written=bytes_written,
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            f"Exported {stats.rows} Gantt rows as {format}: "
+            f"{stats.bytes_written} bytes, {stats.rows_per_second:,.0f} rows/s"
+        )
+        return stats
+
+    def _write(self, schedule: ColumnarSchedule, stream: BinaryIO, format: str) -> int:
+        if format == "csv":
+            return self._write_csv(schedule, stream)
+        if format == "json":
+            return self._write_jsonl(schedule, stream)
+        return self._write_excel(schedule, stream)
+
+    # =============================================================================
+    # Row Source
+    # =============================================================================
+
+    def iter_chunks(self, schedule: ColumnarSchedule) -> Iterator[List[tuple]]:
+        """Export rows in chunks, decoded column-wise from the schedule"""
+        statuses = np.asarray(schedule.statuses, dtype=object)
+        priorities = np.asarray(schedule.priorities, dtype=object)
+        resources = np.asarray(schedule.resources, dtype=object)
+        categories = schedule.categories
+
+        for a in range(0, len(schedule), self.chunk_size):
+            b = min(a + self.chunk_size, len(schedule))
+            starts = np.datetime_as_string(
+                schedule.start[a:b].astype("datetime64[D]"), unit="D"
+            ).tolist()
+            finishes = np.datetime_as_string(
+                schedule.finish[a:b].astype("datetime64[D]"), unit="D"
+            ).tolist()
+            durations = (schedule.finish[a:b] - schedule.start[a:b] + 1).tolist()
+
+            yield list(
+                zip(
+                    schedule.ids[a:b],
+                    schedule.names[a:b].tolist(),
+                    categories[a:b].tolist(),
+                    starts,
+                    finishes,
+                    durations,
+                    schedule.completion[a:b].tolist(),
+                    statuses[schedule.status[a:b]].tolist(),
+                    priorities[schedule.priority[a:b]].tolist(),
+                    resources[schedule.resource[a:b]].tolist(),
+                    schedule.dependency_labels(a, b),
+                    schedule.descriptions[a:b].tolist(),
+                )
+            )
+
+    # =============================================================================
+    # Writers
+    # =============================================================================
+
+    def _write_csv(self, schedule: ColumnarSchedule, stream: BinaryIO) -> int:
+        # BOM so Excel opens Thai text as UTF-8
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            writer = csv.writer(text)
+            writer.writerow(EXPORT_COLUMNS)
+            rows = 0
+            for chunk in self.iter_chunks(schedule):
+                writer.writerows(chunk)
+                rows += len(chunk)
+            text.flush()
+            return rows
+        finally:
+            # Hand the binary stream back to the caller open
+            text.detach()
+
+    def _write_jsonl(self, schedule: ColumnarSchedule, stream: BinaryIO) -> int:
+        rows = 0
+        for chunk in self.iter_chunks(schedule):
+            stream.write(
+                "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False)
+                    + "\n"
+                    for row in chunk
+                ).encode("utf-8")
+            )
+            rows += len(chunk)
+        return rows
+
+    def _write_excel(self, schedule: ColumnarSchedule, stream: BinaryIO) -> int:
+        # Write-only workbooks stream rows to a temp file instead of keeping
+        # a cell object per value
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Gantt")
+        sheet.append(EXPORT_COLUMNS)
+        rows = 0
+        for chunk in self.iter_chunks(schedule):
+            for row in chunk:
+                sheet.append(row)
+            rows += len(chunk)
+        workbook.save(stream)
+        return rows
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+modules/gantt_figures.py
+SDX Project Manager - Vectorized Gantt Figure Builder
+Builds Gantt bars, progress overlays and labels as a handful of traces with optional WebGL rendering
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from modules.resource_conflicts import UNASSIGNED_RESOURCES
+from modules.schedule import ColumnarSchedule
+
+logger = logging.getLogger(__name__)
+
+
+MS_PER_DAY = 86_400_000
+DEFAULT_COLOR = "#94a3b8"
+RESOURCE_COLORS = [
+    "#3b82f6",
+    "#10b981",
+    "#f59e0b",
+    "#8b5cf6",
+    "#ec4899",
+    "#06b6d4",
+    "#ef4444",
+    "#84cc16",
+]
+
+# Columns expected by GanttFigureBuilder.build
+FRAME_COLUMNS = [
+    "ID",
+    "Task",
+    "Start",
+    "Finish",
+    "Completion",
+    "Status",
+    "Priority",
+    "Resource",
+    "Category",
+    "Description",
+]
+
+
+@dataclass
+class GanttViewport:
+    """Window of outline rows to render
+
+    ``expanded`` holds the project item IDs whose tasks are shown; ``None``
+    expands every project. Collapsed projects render as one summary bar.
+    """
+
+    start_row: int = 0
+    page_size: int = 60
+    expanded: Optional[Set[str]] = None
+
+
+class GanttFigureBuilder:
+    """Emits a whole Gantt chart as a few column-oriented traces
+
+    Bars are grouped into one trace per status (the legend), progress is one
+    overlay trace and percentage labels are one text trace. All positions are
+    numeric arrays (epoch milliseconds on a date axis, row index on the y
+    axis) so plotly ships them as packed typed arrays instead of per-row
+    shapes, annotations and hover strings. Above ``webgl_threshold`` rows the
+    bars are drawn as WebGL line segments.
+    """
+
+    def __init__(
+        self,
+        color_map: Dict[str, str],
+        row_height: int = 28,
+        webgl_threshold: int = 2000,
+    ):
+        self.color_map = color_map
+        self.row_height = row_height
+        self.webgl_threshold = webgl_threshold
+        self.last_stats: Dict[str, Any] = {}
+
+    @staticmethod
+    def frame_from_items(gantt_items: List[Any]) -> pd.DataFrame:
+        """Figure frame from GanttItem objects (via the columnar schedule)"""
+        return ColumnarSchedule.from_items(gantt_items).to_frame()
+
+    def build(
+        self,
+        df: pd.DataFrame,
+        title: str = "📈 Gantt Chart - Project Timeline",
+        use_webgl: Optional[bool] = None,
+        show_progress: bool = True,
+        show_labels: bool = True,
+        measure_payload: bool = False,
+        row_offset: int = 0,
+    ) -> go.Figure:
+        """Build the figure; rows are plotted top-down in frame order"""
+        started = time.perf_counter()
+        n = len(df)
+        if use_webgl is None:
+            use_webgl = n > self.webgl_threshold
+
+        start_ms = (
+            pd.to_datetime(df["Start"]).to_numpy("datetime64[ms]").astype("int64")
+        )
+        # Finish dates are inclusive: bars end at the end of the finish day
+        finish_ms = (
+            pd.to_datetime(df["Finish"]).to_numpy("datetime64[ms]").astype("int64")
+            + MS_PER_DAY
+        )
+        duration_ms = np.maximum(finish_ms - start_ms, MS_PER_DAY)
+        completion = np.clip(df["Completion"].to_numpy(float), 0, 100)
+        progress_ms = duration_ms * completion / 100
+        rows = np.arange(row_offset, row_offset + n, dtype="int64")
+        duration_days = (duration_ms // MS_PER_DAY).astype("int64")
+
+        customdata = np.column_stack(
+            [
+                df["Task"].to_numpy(object),
+                pd.to_datetime(df["Start"]).dt.strftime("%d/%m/%Y").to_numpy(object),
+                pd.to_datetime(df["Finish"]).dt.strftime("%d/%m/%Y").to_numpy(object),
+                completion,
+                df["Status"].to_numpy(object),
+                df["Priority"].to_numpy(object),
+                df["Resource"].to_numpy(object),
+                duration_days,
+                self._description_suffix(df),
+            ]
+        )
+        hovertemplate = (
+            "<b>%{customdata[0]}</b><br>"
+            "<b>ระยะเวลา:</b> %{customdata[1]} - %{customdata[2]}<br>"
+            "<b>ความคืบหน้า:</b> %{customdata[3]:.0f}%<br>"
+            "<b>สถานะ:</b> %{customdata[4]}<br>"
+            "<b>ความสำคัญ:</b> %{customdata[5]}<br>"
+            "<b>ผู้รับผิดชอบ:</b> %{customdata[6]}<br>"
+            "<b>ระยะเวลา:</b> %{customdata[7]} วัน%{customdata[8]}<extra></extra>"
+        )
+
+        traces = []
+        statuses = df["Status"].to_numpy(object)
+        for status in pd.unique(statuses):
+            mask = statuses == status
+            color = self.color_map.get(status, DEFAULT_COLOR)
+            if use_webgl:
+                traces.append(
+                    self._segments_trace(
+                        start_ms[mask],
+                        finish_ms[mask],
+                        rows[mask],
+                        color,
+                        str(status),
+                    )
+                )
+            else:
+                traces.append(
+                    go.Bar(
+                        x=duration_ms[mask],
+                        base=start_ms[mask],
+                        y=rows[mask],
+                        orientation="h",
+                        marker_color=color,
+                        name=str(status),
+                        customdata=customdata[mask],
+                        hovertemplate=hovertemplate,
+                        width=0.6,
+                    )
+                )
+
+        if use_webgl and n:
+            # Segments skip hover; one invisible marker per bar carries it
+            traces.append(
+                go.Scattergl(
+                    x=start_ms + duration_ms / 2,
+                    y=rows,
+                    mode="markers",
+                    marker=dict(size=8, opacity=0),
+                    customdata=customdata,
+                    hovertemplate=hovertemplate,
+                    showlegend=False,
+                )
+            )
+
+        has_progress = completion > 0
+        if show_progress and has_progress.any():
+            if use_webgl:
+                traces.append(
+                    self._segments_trace(
+                        start_ms[has_progress],
+                        start_ms[has_progress] + progress_ms[has_progress],
+                        rows[has_progress],
+                        "rgba(0,0,0,0.45)",
+                        "ความคืบหน้า",
+                        width=3,
+                        showlegend=False,
+                    )
+                )
+            else:
+                traces.append(
+                    go.Bar(
+                        x=progress_ms[has_progress],
+                        base=start_ms[has_progress],
+                        y=rows[has_progress],
+                        orientation="h",
+                        marker_color="rgba(0,0,0,0.45)",
+                        name="ความคืบหน้า",
+                        width=0.2,
+                        hoverinfo="skip",
+                        showlegend=False,
+                    )
+                )
+
+        if show_labels and has_progress.any():
+            text_cls = go.Scattergl if use_webgl else go.Scatter
+            traces.append(
+                text_cls(
+                    x=start_ms[has_progress] + progress_ms[has_progress],
+                    y=rows[has_progress],
+                    mode="text",
+                    text=[f"{c:.0f}%" for c in completion[has_progress]],
+                    textposition="middle right",
+                    textfont=dict(size=10, color="#1e293b"),
+                    hoverinfo="skip",
+                    showlegend=False,
+                )
+            )
+
+        fig = go.Figure(data=traces)
+        fig.update_layout(
+            title=title,
+            barmode="overlay",
+            height=max(400, n * self.row_height + 160),
+            font=dict(family="Inter, sans-serif", size=12),
+            title_font_size=20,
+            title_font_color="#1e3c72",
+            showlegend=True,
+            legend=dict(
+                orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1
+            ),
+            xaxis=dict(
+                title="Timeline",
+                type="date",
+                showgrid=True,
+                gridcolor="rgba(0,0,0,0.1)",
+            ),
+            yaxis=dict(
+                title="",
+                tickmode="array",
+                tickvals=rows,
+                ticktext=df["Task"].tolist(),
+                showgrid=True,
+                gridcolor="rgba(0,0,0,0.1)",
+                autorange="reversed",
+            ),
+            plot_bgcolor="white",
+            paper_bgcolor="white",
+        )
+
+        self.last_stats = {
+            "rows": n,
+            "traces": len(traces),
+            "webgl": use_webgl,
+            "build_ms": (time.perf_counter() - started) * 1000,
+        }
+        if measure_payload:
+            self.last_stats["payload_bytes"] = self.payload_size(fig)
+
+        return fig
+
+    # =============================================================================
+    # Resource Timeline
+    # =============================================================================
+
+    @staticmethod
+    def resource_utilization(
+        df: pd.DataFrame,
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Concurrent task count per resource per day
+
+        Each task adds +1 on its first day and -1 on the day after its last
+        day of a (resources x days) difference array; a cumulative sum along
+        the day axis gives the load in O(tasks + resources x days).
+        Returns resource names, day values and the load matrix.
+        """
+        assigned = df[~df["Resource"].isin(UNASSIGNED_RESOURCES)]
+        if assigned.empty:
+            return [], np.array([], dtype="datetime64[D]"), np.zeros((0, 0), "int64")
+
+        codes, resources = pd.factorize(assigned["Resource"], sort=True)
+        start = pd.to_datetime(assigned["Start"]).to_numpy("datetime64[D]")
+        finish = pd.to_datetime(assigned["Finish"]).to_numpy("datetime64[D]")
+        finish = np.maximum(finish, start)
+        origin = start.min()
+        first = (start - origin).astype("int64")
+        last = (finish - origin).astype("int64")
+        days = int(last.max()) + 1
+
+        diff = np.zeros((len(resources), days + 1), dtype="int64")
+        np.add.at(diff, (codes, first), 1)
+        np.add.at(diff, (codes, last + 1), -1)
+        load = np.cumsum(diff[:, :days], axis=1)
+
+        return (
+            list(resources),
+            origin + np.arange(days).astype("timedelta64[D]"),
+            load,
+        )
+
+    def build_resource_timeline(
+        self,
+        df: pd.DataFrame,
+        use_webgl: Optional[bool] = None,
+        capacity: int = 1,
+    ) -> go.Figure:
+        """One segment trace per resource over a daily utilization heatmap"""
+        started = time.perf_counter()
+        df = df[df["Category"] != "Project"]
+        n = len(df)
+        if use_webgl is None:
+            use_webgl = n > self.webgl_threshold
+
+        codes, resources = pd.factorize(df["Resource"], sort=True)
+        start_ms = (
+            pd.to_datetime(df["Start"]).to_numpy("datetime64[ms]").astype("int64")
+        )
+        finish_ms = (
+            pd.to_datetime(df["Finish"]).to_numpy("datetime64[ms]").astype("int64")
+            + MS_PER_DAY
+        )
+        hover = (
+            "<b>"
+            + df["Task"].astype(str)
+            + "</b><br>ผู้รับผิดชอบ: "
+            + df["Resource"].astype(str)
+            + "<br>ระยะเวลา: "
+            + pd.to_datetime(df["Start"]).dt.strftime("%Y-%m-%d")
+            + " - "
+            + pd.to_datetime(df["Finish"]).dt.strftime("%Y-%m-%d")
+        ).to_numpy(object)
+
+        names, days, load = self.resource_utilization(df)
+
+        fig = make_subplots(
+            rows=2,
+            cols=1,
+            shared_xaxes=True,
+            vertical_spacing=0.06,
+            row_heights=[0.65, 0.35],
+            subplot_titles=("งานตามผู้รับผิดชอบ", "ภาระงานรายวัน (จำนวนงานพร้อมกัน)"),
+        )
+
+        scatter_cls = go.Scattergl if use_webgl else go.Scatter
+        for code, resource in enumerate(resources):
+            mask = codes == code
+            k = int(mask.sum())
+            xs = np.empty(k * 3, dtype=float)
+            xs[0::3], xs[1::3], xs[2::3] = start_ms[mask], finish_ms[mask], np.nan
+            fig.add_trace(
+                scatter_cls(
+                    x=xs,
+                    y=np.full(k * 3, code, dtype="int64"),
+                    mode="lines",
+                    line=dict(
+                        color=RESOURCE_COLORS[code % len(RESOURCE_COLORS)], width=8
+                    ),
+                    name=str(resource),
+                    connectgaps=False,
+                    hoverinfo="skip",
+                    showlegend=False,
+                ),
+                row=1,
+                col=1,
+            )
+
+        if n:
+            # One invisible marker per task carries the hover text
+            fig.add_trace(
+                scatter_cls(
+                    x=(start_ms + finish_ms) / 2,
+                    y=codes,
+                    mode="markers",
+                    marker=dict(size=8, opacity=0),
+                    text=hover,
+                    hovertemplate="%{text}<extra></extra>",
+                    showlegend=False,
+                ),
+                row=1,
+                col=1,
+            )
+
+        if len(names):
+            fig.add_trace(
+                go.Heatmap(
+                    z=load,
+                    x=days,
+                    y=names,
+                    zmin=0,
+                    zmax=max(int(load.max()), capacity + 1),
+                    colorscale=[
+                        [0.0, "#f8fafc"],
+                        [capacity / max(int(load.max()), capacity + 1), "#93c5fd"],
+                        [1.0, "#ef4444"],
+                    ],
+                    colorbar=dict(title="งาน", len=0.35, y=0.17),
+                    hovertemplate="<b>%{y}</b><br>%{x|%d/%m/%Y}: %{z} งาน<extra></extra>",
+                ),
+                row=2,
+                col=1,
+            )
+
+        fig.update_yaxes(
+            tickmode="array",
+            tickvals=list(range(len(resources))),
+            ticktext=[str(r) for r in resources],
+            autorange="reversed",
+            row=1,
+            col=1,
+        )
+        fig.update_yaxes(autorange="reversed", row=2, col=1)
+        fig.update_xaxes(type="date")
+        fig.update_layout(
+            title="📊 Resource Utilization Timeline",
+            height=max(450, len(resources) * 60 + 200),
+            font=dict(family="Inter, sans-serif"),
+            title_font_size=18,
+            title_font_color="#1e3c72",
+            plot_bgcolor="white",
+            paper_bgcolor="white",
+        )
+
+        self.last_stats = {
+            "rows": n,
+            "traces": len(fig.data),
+            "webgl": use_webgl,
+            "build_ms": (time.perf_counter() - started) * 1000,
+        }
+        return fig
+
+    # =============================================================================
+    # Viewport
+    # =============================================================================
+
+    @staticmethod
+    def apply_viewport(
+        df: pd.DataFrame, viewport: GanttViewport
+    ) -> Tuple[pd.DataFrame, int]:
+        """Rows inside the viewport and the total visible outline rows
+
+        The frame is in loader order: each project row is followed by its
+        tasks. Collapsed projects are rolled up into a summary bar spanning
+        their tasks, with duration-weighted completion.
+        """
+        df = df.reset_index(drop=True)
+        is_project = (df["Category"] == "Project").to_numpy()
+        group = np.cumsum(is_project)
+        project_ids = df["ID"].to_numpy(object)[is_project]
+
+        if viewport.expanded is None:
+            collapsed = np.zeros(len(project_ids), dtype=bool)
+        else:
+            collapsed = np.array(
+                [pid not in viewport.expanded for pid in project_ids], dtype=bool
+            )
+        # group 0 holds tasks without a project row and is never collapsed
+        collapsed_group = np.concatenate([[False], collapsed])
+        visible = is_project | ~collapsed_group[group]
+
+        total = int(visible.sum())
+        start = max(0, min(viewport.start_row, max(total - 1, 0)))
+        window = df[visible].iloc[start : start + viewport.page_size].copy()
+
+        rollup_rows = window["Category"].eq("Project") & collapsed_group[
+            group[visible][start : start + viewport.page_size]
+        ]
+        if rollup_rows.any():
+            tasks = df[~is_project].assign(_group=group[~is_project])
+            days = (tasks["Finish"] - tasks["Start"]).dt.days + 1
+            summary = (
+                tasks.assign(_days=days, _done=days * tasks["Completion"])
+                .groupby("_group")
+                .agg(
+                    start=("Start", "min"),
+                    finish=("Finish", "max"),
+                    days=("_days", "sum"),
+                    done=("_done", "sum"),
+                    count=("ID", "size"),
+                )
+            )
+            targets = window.index[rollup_rows]
+            groups = group[targets]
+            found = summary.reindex(groups)
+            has_tasks = found["count"].notna().to_numpy()
+            if has_tasks.any():
+                idx = targets[has_tasks]
+                rows = found[has_tasks]
+                window.loc[idx, "Start"] = np.minimum(
+                    window.loc[idx, "Start"].to_numpy(), rows["start"].to_numpy()
+                )
+                window.loc[idx, "Finish"] = np.maximum(
+                    window.loc[idx, "Finish"].to_numpy(), rows["finish"].to_numpy()
+                )
+                window.loc[idx, "Completion"] = (
+                    rows["done"] / rows["days"]
+                ).to_numpy()
+                window.loc[idx, "Task"] = [
+                    f"{name} ({int(count)} งาน)"
+                    for name, count in zip(window.loc[idx, "Task"], rows["count"])
+                ]
+
+        return window, total
+
+    @staticmethod
+    def _description_suffix(df: pd.DataFrame) -> np.ndarray:
+        """Optional hover line with the first 100 characters of the description"""
+        if "Description" not in df:
+            return np.full(len(df), "", dtype=object)
+        return np.array(
+            [
+                f"<br><b>รายละเอียด:</b> {d[:100]}..." if d else ""
+                for d in df["Description"].fillna("")
+            ],
+            dtype=object,
+        )
+
+    @staticmethod
+    def _segments_trace(
+        start_ms: np.ndarray,
+        finish_ms: np.ndarray,
+        rows: np.ndarray,
+        color: str,
+        name: str,
+        width: int = 10,
+        showlegend: bool = True,
+    ) -> go.Scattergl:
+        """All bars of one group as NaN-separated WebGL line segments"""
+        k = len(start_ms)
+        xs = np.empty(k * 3, dtype=float)
+        ys = np.empty(k * 3, dtype=float)
+        xs[0::3], xs[1::3], xs[2::3] = start_ms, finish_ms, np.nan
+        ys[0::3], ys[1::3], ys[2::3] = rows, rows, np.nan
+
+        return go.Scattergl(
+            x=xs,
+            y=ys,
+            mode="lines",
+            line=dict(color=color, width=width),
+            name=name,
+            connectgaps=False,
+            hoverinfo="skip",
+            showlegend=showlegend,
+        )
+
+    @staticmethod
+    def payload_size(fig: go.Figure) -> int:
+        """Serialized figure size in bytes as shipped to the browser"""
+        return len(fig.to_json().encode("utf-8"))
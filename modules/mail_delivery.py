@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+modules/mail_delivery.py
+SDX Project Manager - Mail Delivery Engine
+Pooled persistent SMTP sessions with batched sends, bounded-queue backpressure and retry with backoff
+"""
+
+import heapq
+import logging
+import queue
+import smtplib
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Callable, Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Errors worth another attempt on a fresh session (4xx replies are
+# handled separately from their response code). Not OSError: every
+# SMTPException is one, and configuration errors such as a missing
+# STARTTLS or auth mechanism never succeed on retry
+TRANSIENT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    ConnectionError,
+    TimeoutError,
+    socket.gaierror,
+)
+
+
+@dataclass(order=True)
+class OutgoingMail:
+    """One message waiting for delivery (ordered by next attempt time)"""
+
+    due: float
+    message: Message = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+    on_complete: Optional[Callable[[bool, Optional[str]], None]] = field(
+        default=None, compare=False
+    )
+
+
+@dataclass
+class DeliveryStats:
+    """Counters since the engine started"""
+
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    sessions_opened: int = 0
+    batches: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "sessions_opened": self.sessions_opened,
+            "batches": self.batches,
+            "messages_per_session": self.sent / self.sessions_opened
+            if self.sessions_opened
+            else 0.0,
+        }
+
+
+class MailDeliveryEngine:
+    """Sends MIME messages over a small pool of persistent SMTP sessions
+
+    Each worker thread owns one authenticated session and drains up to
+    ``batch_size`` messages per wake-up, so the connect/STARTTLS/AUTH
+    handshake is paid once per session instead of once per email. Sessions
+    are recycled after ``max_messages_per_session`` and probed with NOOP
+    after ``idle_timeout`` seconds of inactivity.
+
+    ``submit`` puts messages on a bounded queue: when it is full the caller
+    blocks (or gets False with ``block=False``), which pushes back on bulk
+    producers instead of growing memory. Transient failures reconnect and
+    retry with exponential backoff up to ``max_retries``; permanent
+    rejections (5xx) are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        pool_size: int = 2,
+        batch_size: int = 50,
+        queue_size: int = 1000,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_messages_per_session: int = 500,
+        idle_timeout: float = 30.0,
+        timeout: float = 30.0,
+        smtp_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.pool_size = max(1, pool_size)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_messages_per_session = max_messages_per_session
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory
+
+        self.stats = DeliveryStats()
+        self._queue: "queue.Queue[OutgoingMail]" = queue.Queue(maxsize=queue_size)
+        self._retries: List[OutgoingMail] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._stopping = threading.Event()
+        self._workers: List[threading.Thread] = []
+
+    # =============================================================================
+    # Lifecycle
+    # =============================================================================
+
+    def start(self) -> "MailDeliveryEngine":
+        with self._lock:
+            if self._workers:
+                return self
+            self._stopping.clear()
+            for i in range(self.pool_size):
+                worker = threading.Thread(
+                    target=self._run, name=f"mail-delivery-{i}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+        return self
+
+    def submit(
+        self,
+        message: Message,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        on_complete: Optional[Callable[[bool, Optional[str]], None]] = None,
+    ) -> bool:
+        """Queue a message; blocks while the queue is full unless ``block`` is False
+
+        ``on_complete(delivered, error)`` is called from a worker thread once
+        the message is sent or given up on.
+        """
+        if not self._workers:
+            self.start()
+        with self._lock:
+            self._pending += 1
+        try:
+            self._queue.put(
+                OutgoingMail(time.monotonic(), message, on_complete=on_complete),
+                block,
+                timeout,
+            )
+            return True
+        except queue.Full:
+            self._settle()
+            logger.warning("Mail queue full, message rejected")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted message was sent or given up on"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Drain the queue, then stop workers and QUIT their sessions"""
+        self.flush(timeout)
+        self._stopping.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    # =============================================================================
+    # Workers
+    # =============================================================================
+
+    def _run(self) -> None:
+        session: Optional[smtplib.SMTP] = None
+        session_sent = 0
+        last_used = 0.0
+        try:
+            while not self._stopping.is_set():
+                batch = self._next_batch()
+                if not batch:
+                    continue
+
+                self._count("batches")
+                for mail in batch:
+                    if session is not None and (
+                        session_sent >= self.max_messages_per_session
+                        or (
+                            time.monotonic() - last_used > self.idle_timeout
+                            and not self._alive(session)
+                        )
+                    ):
+                        self._quit(session)
+                        session = None
+
+                    try:
+                        if session is None:
+                            session = self._connect()
+                            session_sent = 0
+                        session.send_message(mail.message)
+                        session_sent += 1
+                        last_used = time.monotonic()
+                        self._settle("sent")
+                        self._notify(mail, True, None)
+                    except smtplib.SMTPResponseException as e:
+                        if 400 <= e.smtp_code < 500:
+                            self._retry(mail, e)
+                        else:
+                            self._give_up(mail, e)
+                        # The session can stay open after a response error,
+                        # but a 421 means the server is closing it
+                        if e.smtp_code == 421:
+                            self._quit(session)
+                            session = None
+                    except smtplib.SMTPRecipientsRefused as e:
+                        codes = [code for code, _ in e.recipients.values()]
+                        if codes and all(400 <= code < 500 for code in codes):
+                            self._retry(mail, e)
+                        else:
+                            self._give_up(mail, e)
+                    except TRANSIENT_ERRORS as e:
+                        self._quit(session)
+                        session = None
+                        self._retry(mail, e)
+                    except smtplib.SMTPException as e:
+                        self._give_up(mail, e)
+                    except Exception as e:
+                        self._give_up(mail, e)
+        finally:
+            self._quit(session)
+
+    def _next_batch(self) -> List[OutgoingMail]:
+        """Due retries first, then fresh messages, up to ``batch_size``"""
+        batch: List[OutgoingMail] = []
+        now = time.monotonic()
+        with self._lock:
+            while self._retries and self._retries[0].due <= now and len(batch) < self.batch_size:
+                batch.append(heapq.heappop(self._retries))
+            next_due = self._retries[0].due if self._retries else None
+
+        wait = 0.5 if next_due is None else max(0.0, min(0.5, next_due - now))
+        if not batch:
+            try:
+                batch.append(self._queue.get(timeout=wait))
+            except queue.Empty:
+                return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _connect(self) -> smtplib.SMTP:
+        session = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                session.starttls()
+            if self.username:
+                session.login(self.username, self.password)
+        except Exception:
+            self._quit(session)
+            raise
+        self._count("sessions_opened")
+        return session
+
+    @staticmethod
+    def _alive(session: smtplib.SMTP) -> bool:
+        try:
+            return session.noop()[0] == 250
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(session: Optional[smtplib.SMTP]) -> None:
+        if session is None:
+            return
+        try:
+            session.quit()
+        except Exception:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    # =============================================================================
+    # Outcomes
+    # =============================================================================
+
+    def _retry(self, mail: OutgoingMail, error: Exception) -> None:
+        mail.attempts += 1
+        if mail.attempts > self.max_retries:
+            self._give_up(mail, error)
+            return
+        mail.due = time.monotonic() + self.backoff * (2 ** (mail.attempts - 1))
+        with self._lock:
+            self.stats.retried += 1
+            heapq.heappush(self._retries, mail)
+        logger.warning(
+            f"Mail to {mail.message.get('To')} failed (attempt {mail.attempts}), retrying: {error}"
+        )
+
+    def _give_up(self, mail: OutgoingMail, error: Exception) -> None:
+        logger.error(f"Failed to deliver mail to {mail.message.get('To')}: {str(error)}")
+        self._settle("failed")
+        self._notify(mail, False, str(error))
+
+    @staticmethod
+    def _notify(mail: OutgoingMail, delivered: bool, error: Optional[str]) -> None:
+        if mail.on_complete is None:
+            return
+        try:
+            mail.on_complete(delivered, error)
+        except Exception as e:
+            logger.error(f"Mail completion callback failed: {str(e)}")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def _settle(self, counter: Optional[str] = None) -> None:
+        """Final outcome of one submitted message"""
+        with self._idle:
+            if counter:
+                setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+            self._pending -= 1
+            if not self._pending:
+                self._idle.notify_all()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+modules/milestone_progress.py
+SDX Project Manager - Batched Milestone Progress
+Grouped milestone task counts for one or many projects with a per-project cache
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MilestoneProgressService:
+    """Loads milestones with task counts in a single grouped query
+
+    Results are cached per project and dropped when tasks of that project
+    change status, move between milestones or are added/removed. A TTL bounds
+    staleness from writers in other processes.
+    """
+
+    def __init__(self, db_manager, ttl_seconds: int = 300):
+        self.db = db_manager
+        self.ttl_seconds = ttl_seconds
+        self._cache: Dict[int, tuple] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_milestones(self, project_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Milestones with TaskCount/CompletedTasks keyed by project"""
+        result: Dict[int, List[Dict[str, Any]]] = {}
+        missing = []
+        now = time.monotonic()
+
+        with self._lock:
+            generation = self._generation
+            for project_id in dict.fromkeys(project_ids):
+                cached = self._cache.get(project_id)
+                if cached and now - cached[0] < self.ttl_seconds:
+                    result[project_id] = cached[1]
+                else:
+                    missing.append(project_id)
+
+        if missing:
+            loaded = self._load(missing)
+            with self._lock:
+                for project_id in missing:
+                    rows = (loaded or {}).get(project_id, [])
+                    # Failed loads, or loads raced by an invalidation, are not cached
+                    if loaded is not None and generation == self._generation:
+                        self._cache[project_id] = (now, rows)
+                    result[project_id] = rows
+
+        # Callers decorate rows, so hand out copies
+        return {
+            project_id: [dict(row) for row in rows]
+            for project_id, rows in result.items()
+        }
+
+    def get_project_milestones(self, project_id: int) -> List[Dict[str, Any]]:
+        """Milestones with task counts for one project"""
+        return self.get_milestones([project_id]).get(project_id, [])
+
+    def invalidate(self, project_id: Optional[int] = None):
+        """Drop cached progress for a project, or for all projects"""
+        with self._lock:
+            self._generation += 1
+            if project_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(project_id, None)
+
+    def _load(
+        self, project_ids: List[int]
+    ) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+        """One round trip for all milestones of the given projects"""
+        try:
+            placeholders = ", ".join("?" for _ in project_ids)
+            query = f"""
+                SELECT pm.*,
+                       u.FirstName + ' ' + u.LastName as CreatedByName,
+                       COALESCE(tc.TaskCount, 0) as TaskCount,
+                       COALESCE(tc.CompletedTasks, 0) as CompletedTasks
+                FROM ProjectMilestones pm
+                LEFT JOIN Users u ON pm.CreatedBy = u.UserID
+                LEFT JOIN (
+                    SELECT MilestoneID,
+                           COUNT(*) as TaskCount,
+                           SUM(CASE WHEN Status = 'Completed' THEN 1 ELSE 0 END) as CompletedTasks
+                    FROM Tasks
+                    WHERE ProjectID IN ({placeholders}) AND MilestoneID IS NOT NULL
+                    GROUP BY MilestoneID
+                ) tc ON tc.MilestoneID = pm.MilestoneID
+                WHERE pm.ProjectID IN ({placeholders})
+                ORDER BY pm.ProjectID, pm.DueDate, pm.Name
+            """
+
+            grouped: Dict[int, List[Dict[str, Any]]] = {}
+            for row in self.db.fetch_all(query, list(project_ids) * 2):
+                row = dict(row)
+                grouped.setdefault(row["ProjectID"], []).append(row)
+            return grouped
+
+        except Exception as e:
+            logger.error(f"Failed to load milestone progress: {str(e)}")
+            return None
+
+
+# Global service instance so task writes invalidate what project reads cache
+_milestone_progress_service = None
+_service_lock = threading.Lock()
+
+
+def get_milestone_progress_service(db_manager) -> MilestoneProgressService:
+    """Get the shared milestone progress service"""
+    global _milestone_progress_service
+
+    if _milestone_progress_service is None:
+        with _service_lock:
+            if _milestone_progress_service is None:
+                _milestone_progress_service = MilestoneProgressService(db_manager)
+
+    return _milestone_progress_service
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+modules/notification_broker.py
+SDX Project Manager - Notification Broker
+Process-wide pub/sub for real-time notifications with per-subscriber ring buffers and sequence numbers
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Any, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def user_topic(user_id: int) -> str:
+    """Topic carrying one user's notification events"""
+    return f"user:{user_id}"
+
+
+@dataclass
+class BrokerMessage:
+    """One published event; ``sequence`` increases by one per topic"""
+
+    topic: Hashable
+    sequence: int
+    payload: Dict[str, Any]
+    published_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class Subscription:
+    """A subscriber's bounded buffer of undelivered messages"""
+
+    subscription_id: int
+    topic: Hashable
+    buffer: Deque[BrokerMessage]
+    last_seen: float = field(default_factory=time.monotonic)
+    dropped: int = 0
+
+
+class NotificationBroker:
+    """In-memory pub/sub shared by every session of this process
+
+    Each subscriber owns a ring buffer of ``buffer_size`` messages, so a
+    session that stops polling costs bounded memory and a slow one loses
+    only its oldest messages (counted in ``dropped``). Sequence numbers are
+    per topic: ``poll(subscription_id, since)`` returns only messages newer
+    than ``since``, which makes re-polling after a rerun harmless.
+    Subscriptions nobody polled for ``idle_timeout`` seconds are dropped on
+    the next publish, since Streamlit sessions end without unsubscribing.
+    """
+
+    def __init__(self, buffer_size: int = 100, idle_timeout: float = 3600.0):
+        self.buffer_size = buffer_size
+        self.idle_timeout = idle_timeout
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._topics: Dict[Hashable, Set[int]] = {}
+        self._sequences: Dict[Hashable, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # =============================================================================
+    # Subscribers
+    # =============================================================================
+
+    def subscribe(self, topic: Hashable) -> int:
+        """Register a subscriber; it receives messages published from now on"""
+        with self._lock:
+            subscription_id = next(self._ids)
+            self._subscriptions[subscription_id] = Subscription(
+                subscription_id, topic, deque(maxlen=self.buffer_size)
+            )
+            self._topics.setdefault(topic, set()).add(subscription_id)
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int):
+        with self._lock:
+            self._remove(subscription_id)
+
+    def is_subscribed(self, subscription_id: Optional[int], topic: Hashable) -> bool:
+        with self._lock:
+            subscription = self._subscriptions.get(subscription_id)
+            return subscription is not None and subscription.topic == topic
+
+    def poll(self, subscription_id: int, since: int = 0) -> List[BrokerMessage]:
+        """Buffered messages with a sequence above ``since``, oldest first
+
+        Returned messages leave the buffer. An unknown (expired) subscription
+        gets an empty list; callers re-subscribe via ``is_subscribed``.
+        """
+        with self._lock:
+            subscription = self._subscriptions.get(subscription_id)
+            if subscription is None:
+                return []
+            subscription.last_seen = time.monotonic()
+            messages = [m for m in subscription.buffer if m.sequence > since]
+            subscription.buffer.clear()
+        return messages
+
+    # =============================================================================
+    # Publishers
+    # =============================================================================
+
+    def publish(self, topic: Hashable, payload: Dict[str, Any]) -> int:
+        """Append to every subscriber of ``topic``; returns the sequence number"""
+        with self._lock:
+            sequence = self._sequences.get(topic, 0) + 1
+            self._sequences[topic] = sequence
+            message = BrokerMessage(topic, sequence, payload)
+
+            now = time.monotonic()
+            for subscription_id in list(self._topics.get(topic, ())):
+                subscription = self._subscriptions[subscription_id]
+                if now - subscription.last_seen > self.idle_timeout:
+                    self._remove(subscription_id)
+                    continue
+                if len(subscription.buffer) == subscription.buffer.maxlen:
+                    subscription.dropped += 1
+                subscription.buffer.append(message)
+        return sequence
+
+    def latest_sequence(self, topic: Hashable) -> int:
+        with self._lock:
+            return self._sequences.get(topic, 0)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "subscriptions": len(self._subscriptions),
+                "topics": len(self._topics),
+                "buffered": sum(len(s.buffer) for s in self._subscriptions.values()),
+                "dropped": sum(s.dropped for s in self._subscriptions.values()),
+            }
+
+    def _remove(self, subscription_id: int):
+        subscription = self._subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return
+        members = self._topics.get(subscription.topic)
+        if members is not None:
+            members.discard(subscription_id)
+            if not members:
+                del self._topics[subscription.topic]
+
+
+# Global broker so every session in the process shares one set of topics
+_notification_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_notification_broker() -> NotificationBroker:
+    """Get the process-wide notification broker"""
+    global _notification_broker
+
+    if _notification_broker is None:
+        with _broker_lock:
+            if _notification_broker is None:
+                _notification_broker = NotificationBroker()
+
+    return _notification_broker
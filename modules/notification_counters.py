@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+modules/notification_counters.py
+SDX Project Manager - Notification Counters
+Per-user total/unread/critical counters maintained alongside every Notifications write
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# (total, unread, critical) change for one user
+CounterDelta = Tuple[int, int, int]
+
+# Users per rebuild statement (keeps IN lists under driver limits)
+COUNTER_REBUILD_CHUNK = 900
+
+COUNT_COLUMNS = """
+    COUNT(*) AS TotalCount,
+    COALESCE(SUM(CASE WHEN IsRead = 0 THEN 1 ELSE 0 END), 0) AS UnreadCount,
+    COALESCE(SUM(CASE WHEN Priority = 'critical' THEN 1 ELSE 0 END), 0) AS CriticalCount
+"""
+
+EMPTY_COUNTS = {"total_notifications": 0, "unread_count": 0, "critical_count": 0}
+
+# Users with notifications but no counter row are seeded once per process
+_counters_seeded = False
+_seed_lock = threading.Lock()
+
+
+def row_deltas(
+    rows: Iterable[Tuple[int, Any, Optional[str]]], sign: int = 1
+) -> Dict[int, CounterDelta]:
+    """Counter changes for inserted (sign=1) or deleted (sign=-1) rows
+
+    Rows are ``(user_id, is_read, priority)``.
+    """
+    deltas: Dict[int, List[int]] = {}
+    for user_id, is_read, priority in rows:
+        delta = deltas.setdefault(user_id, [0, 0, 0])
+        delta[0] += sign
+        if not is_read:
+            delta[1] += sign
+        if priority == "critical":
+            delta[2] += sign
+    return {user_id: tuple(delta) for user_id, delta in deltas.items()}
+
+
+class NotificationCounterStore:
+    """NotificationCounters table: one row of running counts per user
+
+    Writers call ``apply`` on the cursor of the transaction that changed
+    Notifications, so counts commit or roll back with the rows they
+    describe. Writers only UPDATE; a user's row is created (seeded from
+    one COUNT over that user's notifications) when the user is created,
+    the first time it is read, or by ``seed_missing`` once per process, so
+    no writer can trip over a concurrent insert. ``rebuild`` recounts
+    from the table and is the repair path for any drift.
+    """
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    # =============================================================================
+    # Writers
+    # =============================================================================
+
+    def apply(self, cursor, deltas: Dict[int, CounterDelta]):
+        """Add per-user deltas on an open cursor"""
+        params = [
+            (total, unread, critical, datetime.now(), user_id)
+            for user_id, (total, unread, critical) in deltas.items()
+            if total or unread or critical
+        ]
+        if not params:
+            return
+        cursor.executemany(
+            """
+            UPDATE NotificationCounters
+            SET TotalCount = TotalCount + ?, UnreadCount = UnreadCount + ?,
+                CriticalCount = CriticalCount + ?, UpdatedAt = ?
+            WHERE UserID = ?
+            """,
+            params,
+        )
+
+    # =============================================================================
+    # Readers
+    # =============================================================================
+
+    def get(self, user_id: int) -> Dict[str, int]:
+        """Counts for one user: a primary key lookup, seeded on first use"""
+        try:
+            counts = self._read(user_id)
+            if counts is None:
+                self._seed(user_id)
+                counts = self._read(user_id)
+            return counts or dict(EMPTY_COUNTS)
+
+        except Exception as e:
+            logger.error(f"Failed to read notification counters: {str(e)}")
+            return dict(EMPTY_COUNTS)
+
+    def purge(
+        self,
+        older_than: datetime,
+        batch_size: int = 1000,
+        pause_seconds: float = 0.0,
+        max_batches: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """Delete old or expired notifications in batches
+
+        Each batch is a short transaction that also takes the deleted rows
+        off their owners' counters; the pause between batches lets other
+        writers in. Returns ``(rows_deleted, batches)``.
+        """
+        now = datetime.now()
+        params = [older_than, now]
+        if getattr(self.db, "db_type", "mssql") == "mssql":
+            query = """
+                DELETE TOP (?) FROM Notifications
+                OUTPUT DELETED.UserID, DELETED.IsRead, DELETED.Priority
+                WHERE CreatedDate < ?
+                OR (ExpiresAt IS NOT NULL AND ExpiresAt < ?)
+            """
+            params = [batch_size] + params
+        else:
+            query = """
+                DELETE FROM Notifications
+                WHERE NotificationID IN (
+                    SELECT NotificationID FROM Notifications
+                    WHERE CreatedDate < ?
+                    OR (ExpiresAt IS NOT NULL AND ExpiresAt < ?)
+                    LIMIT ?
+                )
+                RETURNING UserID, IsRead, Priority
+            """
+            params = params + [batch_size]
+
+        total_deleted = 0
+        batches = 0
+        try:
+            while True:
+                with self.db.transaction() as cursor:
+                    cursor.execute(query, params)
+                    deleted = cursor.fetchall()
+                    self.apply(
+                        cursor, row_deltas((tuple(row) for row in deleted), sign=-1)
+                    )
+
+                batches += 1
+                total_deleted += len(deleted)
+                if len(deleted) < batch_size:
+                    break
+                if max_batches is not None and batches >= max_batches:
+                    break
+                time.sleep(pause_seconds)
+
+        except Exception as e:
+            logger.error(f"Failed to purge notifications: {str(e)}")
+
+        return total_deleted, batches
+
+    def seed_missing(self) -> int:
+        """Create counter rows for every user who has notifications but no row yet"""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    f"""
+                    INSERT INTO NotificationCounters
+                        (UserID, TotalCount, UnreadCount, CriticalCount, UpdatedAt)
+                    SELECT UserID, {COUNT_COLUMNS}, ?
+                    FROM Notifications n
+                    WHERE UserID IS NOT NULL
+                    AND NOT EXISTS (
+                        SELECT 1 FROM NotificationCounters c WHERE c.UserID = n.UserID
+                    )
+                    GROUP BY UserID
+                    """,
+                    [datetime.now()],
+                )
+                return max(cursor.rowcount, 0)
+
+        except Exception as e:
+            logger.error(f"Failed to seed notification counters: {str(e)}")
+            return 0
+
+    def totals(self) -> Dict[str, int]:
+        """Counts across users from the counter rows (read-only)"""
+        try:
+            result = self.db.execute_query(
+                """
+                SELECT COALESCE(SUM(TotalCount), 0) as total_notifications,
+                       COALESCE(SUM(UnreadCount), 0) as unread_count,
+                       SUM(CASE WHEN TotalCount > 0 THEN 1 ELSE 0 END) as total_users
+                FROM NotificationCounters
+                """
+            )
+            return dict(result[0]) if result else {}
+
+        except Exception as e:
+            logger.error(f"Failed to read notification counter totals: {str(e)}")
+            return {}
+
+    def rebuild(self, user_ids: Optional[List[int]] = None) -> int:
+        """Recount users (all users when None) from the Notifications table"""
+        try:
+            if user_ids is None:
+                with self.db.transaction() as cursor:
+                    cursor.execute("DELETE FROM NotificationCounters")
+                    cursor.execute(
+                        f"""
+                        INSERT INTO NotificationCounters
+                            (UserID, TotalCount, UnreadCount, CriticalCount, UpdatedAt)
+                        SELECT UserID, {COUNT_COLUMNS}, ?
+                        FROM Notifications
+                        WHERE UserID IS NOT NULL
+                        GROUP BY UserID
+                        """,
+                        [datetime.now()],
+                    )
+                    return cursor.rowcount
+
+            rebuilt = 0
+            for offset in range(0, len(user_ids), COUNTER_REBUILD_CHUNK):
+                chunk = user_ids[offset : offset + COUNTER_REBUILD_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                with self.db.transaction() as cursor:
+                    cursor.execute(
+                        f"DELETE FROM NotificationCounters WHERE UserID IN ({placeholders})",
+                        chunk,
+                    )
+                    for user_id in chunk:
+                        self._seed_on(cursor, user_id)
+                        rebuilt += 1
+            return rebuilt
+
+        except Exception as e:
+            logger.error(f"Failed to rebuild notification counters: {str(e)}")
+            return 0
+
+    def seed_user(self, user_id: int):
+        """Create a new user's counter row so system totals include them"""
+        self._seed(user_id)
+
+    def _read(self, user_id: int) -> Optional[Dict[str, int]]:
+        result = self.db.execute_query(
+            """
+            SELECT TotalCount as total_notifications, UnreadCount as unread_count,
+                   CriticalCount as critical_count
+            FROM NotificationCounters
+            WHERE UserID = ?
+            """,
+            (user_id,),
+        )
+        if not result:
+            return None
+        # Drift is repaired by rebuild; a badge never shows a negative count
+        return {key: max(0, value or 0) for key, value in dict(result[0]).items()}
+
+    def _seed(self, user_id: int):
+        try:
+            with self.db.transaction() as cursor:
+                self._seed_on(cursor, user_id)
+        except Exception as e:
+            # Another session seeded the same user first
+            logger.debug(f"Notification counter seed skipped: {str(e)}")
+
+    @staticmethod
+    def _seed_on(cursor, user_id: int):
+        cursor.execute(
+            f"""
+            INSERT INTO NotificationCounters
+                (UserID, TotalCount, UnreadCount, CriticalCount, UpdatedAt)
+            SELECT ?, c.TotalCount, c.UnreadCount, c.CriticalCount, ?
+            FROM (
+                SELECT {COUNT_COLUMNS}
+                FROM Notifications
+                WHERE UserID = ?
+            ) c
+            WHERE NOT EXISTS (SELECT 1 FROM NotificationCounters WHERE UserID = ?)
+            """,
+            [user_id, datetime.now(), user_id, user_id],
+        )
+
+
+def seed_missing_counters(db_manager) -> int:
+    """Seed counter rows for users that predate them, once per process
+
+    New users get their row when they are created; this covers users who
+    already had notifications, so ``totals`` can stay a plain read.
+    """
+    global _counters_seeded
+
+    if _counters_seeded:
+        return 0
+    with _seed_lock:
+        if _counters_seeded:
+            return 0
+        seeded = NotificationCounterStore(db_manager).seed_missing()
+        _counters_seeded = True
+    return seeded
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+modules/notification_digest.py
+SDX Project Manager - Notification Coalescing and Digests
+Merges bursts of notifications about one entity and batches low-priority email into digests
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Data fields that identify the entity a notification is about, most specific first
+COALESCE_ENTITY_FIELDS = [
+    ("task_id", "task"),
+    ("milestone_id", "milestone"),
+    ("project_id", "project"),
+]
+
+# Notifications per digest UPDATE (keeps IN lists under driver limits)
+DIGEST_UPDATE_CHUNK = 900
+
+
+def coalesce_key(data: Dict[str, Any]) -> Optional[str]:
+    """Entity key such as ``task:42`` for notification data, or None"""
+    if data.get("entity_type") and data.get("entity_id"):
+        return f"{str(data['entity_type']).lower()}:{data['entity_id']}"
+    for field, entity in COALESCE_ENTITY_FIELDS:
+        if data.get(field):
+            return f"{entity}:{data[field]}"
+    return None
+
+
+class NotificationCoalescer:
+    """Coalescing window and digest queue over the Notifications table
+
+    A notification whose entity already has an unread, non-urgent row for
+    the same user created within ``window_minutes`` and not emailed yet
+    updates that row (latest title and message, ``CoalescedCount`` + 1)
+    instead of inserting a new one. Notifications whose priority is in
+    ``digest_priorities`` are flagged ``EmailDigest`` and emailed later,
+    several per message, by the digest run. ``IsEmailSent`` is set in the
+    transaction that queues a row's email (``mark_emailed``), so rows
+    emailed on their own never absorb later events; a notification that
+    needs its own email right away is never merged, and one waiting for
+    the digest flags the row it merges into, so no event loses its email.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        window_minutes: int = 15,
+        digest_priorities: Iterable[str] = ("low",),
+        immediate_priorities: Iterable[str] = ("high", "critical"),
+    ):
+        self.db = db_manager
+        self.window_minutes = window_minutes
+        self.digest_priorities = set(digest_priorities)
+        self.immediate_priorities = set(immediate_priorities)
+
+    def should_coalesce(
+        self, key: Optional[str], priority: str, immediate_email: bool = False
+    ) -> bool:
+        """High and critical notifications and immediate emails always stand on their own"""
+        return (
+            bool(key)
+            and self.window_minutes > 0
+            and priority not in self.immediate_priorities
+            and not immediate_email
+        )
+
+    def uses_digest(self, priority: str) -> bool:
+        return priority in self.digest_priorities
+
+    # =============================================================================
+    # Coalescing
+    # =============================================================================
+
+    def merge(
+        self,
+        user_id: int,
+        key: str,
+        notification_type: str,
+        title: str,
+        message: str,
+        priority: str,
+        email_digest: bool = False,
+    ) -> Optional[Tuple[int, int]]:
+        """Fold one notification into a recent row for the same entity
+
+        Returns ``(notification_id, coalesced_count)`` of the updated row,
+        or None when there is nothing to merge into and the caller should
+        insert.
+        """
+        window_start = datetime.now() - timedelta(minutes=self.window_minutes)
+        assignments = """
+            Type = ?, Title = ?, Message = ?,
+            Priority = CASE WHEN Priority = 'low' THEN ? ELSE Priority END,
+            EmailDigest = CASE WHEN ? = 1 THEN 1 ELSE EmailDigest END,
+            CoalescedCount = COALESCE(CoalescedCount, 1) + 1
+        """
+        immediate = sorted(self.immediate_priorities)
+        match = f"""
+            UserID = ? AND CoalesceKey = ? AND IsRead = 0 AND IsEmailSent = 0
+            AND CreatedDate >= ?
+            AND Priority NOT IN ({", ".join("?" for _ in immediate)})
+        """
+        set_params = [
+            notification_type, title[:200], message, priority, 1 if email_digest else 0
+        ]
+        match_params = [user_id, key, window_start, *immediate]
+
+        if getattr(self.db, "db_type", "mssql") == "mssql":
+            # TOP in a CTE so the most recent row wins, as on other databases
+            query = f"""
+                WITH latest AS (
+                    SELECT TOP (1) *
+                    FROM Notifications WITH (ROWLOCK, UPDLOCK)
+                    WHERE {match}
+                    ORDER BY CreatedDate DESC
+                )
+                UPDATE latest
+                SET {assignments}
+                OUTPUT INSERTED.NotificationID, INSERTED.CoalescedCount
+            """
+            params = match_params + set_params
+        else:
+            query = f"""
+                UPDATE Notifications
+                SET {assignments}
+                WHERE NotificationID = (
+                    SELECT NotificationID FROM Notifications
+                    WHERE {match}
+                    ORDER BY CreatedDate DESC
+                    LIMIT 1
+                )
+                RETURNING NotificationID, CoalescedCount
+            """
+            params = set_params + match_params
+
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(query, params)
+                row = cursor.fetchone()
+            return (row[0], row[1]) if row else None
+
+        except Exception as e:
+            logger.error(f"Failed to coalesce notification: {str(e)}")
+            return None
+
+    # =============================================================================
+    # Digests
+    # =============================================================================
+
+    def pending_digest_items(
+        self, min_age_minutes: int = 60, limit: int = 5000
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Digest-flagged unsent notifications grouped by user
+
+        Only users whose oldest waiting item is at least ``min_age_minutes``
+        old are returned, so frequent runs still batch several items.
+        """
+        try:
+            mssql = getattr(self.db, "db_type", "mssql") == "mssql"
+            query = f"""
+                SELECT {f"TOP ({int(limit)})" if mssql else ""}
+                       n.NotificationID, n.UserID, n.Type, n.Title, n.Message,
+                       n.Priority, n.CreatedDate, n.ActionUrl, n.CoalescedCount,
+                       u.Email, u.FirstName, u.LastName, u.Language,
+                       u.NotificationSettings
+                FROM Notifications n
+                JOIN Users u ON u.UserID = n.UserID AND u.IsActive = 1
+                WHERE n.EmailDigest = 1 AND n.IsEmailSent = 0
+                ORDER BY n.UserID, n.CreatedDate
+                {"" if mssql else f"LIMIT {int(limit)}"}
+            """
+            rows = self.db.execute_query(query)
+
+            cutoff = datetime.now() - timedelta(minutes=min_age_minutes)
+            grouped: Dict[int, List[Dict[str, Any]]] = {}
+            for row in rows or []:
+                grouped.setdefault(row["UserID"], []).append(dict(row))
+
+            due = {}
+            for user_id, items in grouped.items():
+                oldest = items[0]["CreatedDate"]
+                if isinstance(oldest, str):
+                    oldest = datetime.fromisoformat(oldest)
+                if oldest <= cutoff:
+                    due[user_id] = items
+            return due
+
+        except Exception as e:
+            logger.error(f"Failed to load digest notifications: {str(e)}")
+            return {}
+
+    @staticmethod
+    def mark_emailed(cursor, notification_ids: List[int]):
+        """Flag rows whose email was queued on ``cursor``; they stop merging"""
+        NotificationCoalescer.mark_digested(cursor, notification_ids, [])
+
+    @staticmethod
+    def mark_digested(cursor, emailed_ids: List[int], skipped_ids: List[int]):
+        """Close out digest items on the digest run's cursor
+
+        Emailed rows get ``IsEmailSent``; rows of users who turned email off
+        just leave the digest queue.
+        """
+        now = datetime.now()
+        for ids, assignments in (
+            (emailed_ids, "IsEmailSent = 1, EmailSentDate = ?"),
+            (skipped_ids, "EmailDigest = 0"),
+        ):
+            for offset in range(0, len(ids), DIGEST_UPDATE_CHUNK):
+                chunk = ids[offset : offset + DIGEST_UPDATE_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                params = ([now] if "?" in assignments else []) + list(chunk)
+                cursor.execute(
+                    f"""
+                    UPDATE Notifications SET {assignments}
+                    WHERE NotificationID IN ({placeholders}) AND IsEmailSent = 0
+                    """,
+                    params,
+                )
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+modules/notification_outbox.py
+SDX Project Manager - Notification Outbox
+Durable delivery queue written in the caller's transaction and drained by background workers
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+OUTBOX_COLUMNS = [
+    "Channel",
+    "UserID",
+    "NotificationID",
+    "Payload",
+    "Status",
+    "AvailableAt",
+    "CreatedAt",
+]
+
+CLAIM_COLUMNS = [
+    "OutboxID",
+    "Channel",
+    "UserID",
+    "NotificationID",
+    "Payload",
+    "Attempts",
+]
+
+# (channel, user_id, notification_id, payload)
+OutboxEntry = Tuple[str, Optional[int], Optional[int], Dict[str, Any]]
+
+# A handler receives claimed rows and returns {OutboxID: error or None} for
+# the rows it finished; rows left out stay claimed until their timeout
+OutboxHandler = Callable[[List[Dict[str, Any]]], Dict[int, Optional[str]]]
+
+
+class NotificationOutbox:
+    """NotificationOutbox table access: enqueue, claim, complete, fail
+
+    Producers insert rows on their own open cursor so delivery work commits
+    or rolls back with the change that caused it. Workers claim a batch by
+    flipping it to Processing and pushing AvailableAt out by
+    ``visibility_timeout``; a worker that dies mid-batch simply lets the
+    timeout lapse and the rows become claimable again (at-least-once).
+    Failures go back to Pending with exponential backoff until
+    ``max_attempts``, then stay Failed.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        visibility_timeout: int = 120,
+        max_attempts: int = 5,
+        backoff_seconds: int = 30,
+    ):
+        self.db = db_manager
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+
+    # =============================================================================
+    # Producers
+    # =============================================================================
+
+    def enqueue(self, cursor, entries: List[OutboxEntry]):
+        """Add (channel, user_id, notification_id, payload) rows on an open cursor"""
+        now = datetime.now()
+        self.db.insert_rows(
+            cursor,
+            "NotificationOutbox",
+            OUTBOX_COLUMNS,
+            [
+                (
+                    channel,
+                    user_id,
+                    notification_id,
+                    json.dumps(payload, ensure_ascii=False, default=str),
+                    "Pending",
+                    now,
+                    now,
+                )
+                for channel, user_id, notification_id, payload in entries
+            ],
+        )
+
+    def enqueue_now(self, entries: List[OutboxEntry]) -> bool:
+        """Add rows in a transaction of their own"""
+        try:
+            with self.db.transaction() as cursor:
+                self.enqueue(cursor, entries)
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to enqueue outbox rows: {str(e)}")
+            return False
+
+    # =============================================================================
+    # Workers
+    # =============================================================================
+
+    def claim(self, batch_size: int, worker_id: str) -> List[Dict[str, Any]]:
+        """Claim up to ``batch_size`` due rows for ``worker_id``"""
+        now = datetime.now()
+        visible_at = now + timedelta(seconds=self.visibility_timeout)
+        output = ", ".join(f"INSERTED.{column}" for column in CLAIM_COLUMNS)
+
+        if getattr(self.db, "db_type", "mssql") == "mssql":
+            # READPAST skips rows other workers hold, so claims never block
+            query = f"""
+                WITH batch AS (
+                    SELECT TOP (?) *
+                    FROM NotificationOutbox WITH (ROWLOCK, UPDLOCK, READPAST)
+                    WHERE Status IN ('Pending', 'Processing') AND AvailableAt <= ?
+                    ORDER BY AvailableAt
+                )
+                UPDATE batch
+                SET Status = 'Processing', Attempts = Attempts + 1,
+                    ClaimedBy = ?, AvailableAt = ?
+                OUTPUT {output}
+            """
+            params = [batch_size, now, worker_id, visible_at]
+        else:
+            query = f"""
+                UPDATE NotificationOutbox
+                SET Status = 'Processing', Attempts = Attempts + 1,
+                    ClaimedBy = ?, AvailableAt = ?
+                WHERE OutboxID IN (
+                    SELECT OutboxID FROM NotificationOutbox
+                    WHERE Status IN ('Pending', 'Processing') AND AvailableAt <= ?
+                    ORDER BY AvailableAt
+                    LIMIT ?
+                )
+                RETURNING {', '.join(CLAIM_COLUMNS)}
+            """
+            params = [worker_id, visible_at, now, batch_size]
+
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(query, params)
+                rows = [dict(zip(CLAIM_COLUMNS, row)) for row in cursor.fetchall()]
+
+            for row in rows:
+                try:
+                    row["Payload"] = json.loads(row["Payload"] or "{}")
+                except (TypeError, ValueError):
+                    row["Payload"] = {}
+            return rows
+
+        except Exception as e:
+            logger.error(f"Failed to claim outbox rows: {str(e)}")
+            return []
+
+    def complete(self, outbox_ids: List[int]):
+        """Mark rows delivered"""
+        if not outbox_ids:
+            return
+        placeholders = ", ".join("?" for _ in outbox_ids)
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE NotificationOutbox
+                SET Status = 'Delivered', DeliveredAt = ?, LastError = NULL
+                WHERE OutboxID IN ({placeholders})
+                """,
+                [datetime.now(), *outbox_ids],
+            )
+
+    def fail(self, failures: List[Tuple[Dict[str, Any], str]]):
+        """Reschedule failed rows with backoff, or park them as Failed"""
+        if not failures:
+            return
+        now = datetime.now()
+        params = []
+        for row, error in failures:
+            attempts = row.get("Attempts") or 1
+            if attempts >= self.max_attempts:
+                params.append(("Failed", now, error, row["OutboxID"]))
+            else:
+                delay = self.backoff_seconds * (2 ** (attempts - 1))
+                params.append(
+                    ("Pending", now + timedelta(seconds=delay), error, row["OutboxID"])
+                )
+        with self.db.transaction() as cursor:
+            cursor.executemany(
+                """
+                UPDATE NotificationOutbox
+                SET Status = ?, AvailableAt = ?, LastError = ?
+                WHERE OutboxID = ?
+                """,
+                params,
+            )
+
+    def purge_delivered(self, days_old: int = 7) -> int:
+        """Delete delivered rows older than ``days_old`` days"""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """
+                    DELETE FROM NotificationOutbox
+                    WHERE Status = 'Delivered' AND DeliveredAt < ?
+                    """,
+                    [datetime.now() - timedelta(days=days_old)],
+                )
+                return cursor.rowcount
+
+        except Exception as e:
+            logger.error(f"Failed to purge outbox: {str(e)}")
+            return 0
+
+
+class OutboxDispatcher:
+    """Background threads that drain the outbox through channel handlers
+
+    ``periodic`` jobs ``(interval_seconds, callable)`` run on the first
+    worker between batches, for producers such as digests that feed the
+    outbox on a schedule.
+    """
+
+    def __init__(
+        self,
+        outbox: NotificationOutbox,
+        handlers: Dict[str, OutboxHandler],
+        workers: int = 1,
+        batch_size: int = 100,
+        poll_interval: float = 2.0,
+        periodic: Optional[List[Tuple[float, Callable[[], Any]]]] = None,
+    ):
+        self.outbox = outbox
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.periodic = list(periodic or [])
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "OutboxDispatcher":
+        if self._threads:
+            return self
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run,
+                args=(f"{self.worker_prefix}:{i}", i == 0),
+                name=f"notification-outbox-{i}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self, worker_id: str, run_periodic: bool = False):
+        next_runs = [time.monotonic() + interval for interval, _ in self.periodic]
+        while not self._stopping.is_set():
+            if run_periodic:
+                self._run_periodic(next_runs)
+            try:
+                processed = self.run_once(worker_id)
+            except Exception as e:
+                logger.error(f"Outbox worker {worker_id} failed: {str(e)}")
+                processed = 0
+            if not processed:
+                self._stopping.wait(self.poll_interval)
+
+    def _run_periodic(self, next_runs: List[float]):
+        now = time.monotonic()
+        for index, (interval, job) in enumerate(self.periodic):
+            if now < next_runs[index]:
+                continue
+            next_runs[index] = now + interval
+            try:
+                job()
+            except Exception as e:
+                logger.error(f"Outbox periodic job failed: {str(e)}")
+
+    def run_once(self, worker_id: Optional[str] = None) -> int:
+        """Claim and deliver one batch; returns the number of rows claimed"""
+        worker_id = worker_id or f"{self.worker_prefix}:once"
+        rows = self.outbox.claim(self.batch_size, worker_id)
+        if not rows:
+            return 0
+
+        by_channel: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_channel.setdefault(row["Channel"], []).append(row)
+
+        delivered: List[int] = []
+        failures: List[Tuple[Dict[str, Any], str]] = []
+        for channel, channel_rows in by_channel.items():
+            handler = self.handlers.get(channel)
+            if handler is None:
+                failures.extend(
+                    (row, f"No handler for channel {channel}") for row in channel_rows
+                )
+                continue
+            try:
+                results = handler(channel_rows)
+            except Exception as e:
+                results = {row["OutboxID"]: str(e) for row in channel_rows}
+            for row in channel_rows:
+                if row["OutboxID"] not in results:
+                    continue  # Unfinished: reclaimed after the visibility timeout
+                error = results[row["OutboxID"]]
+                if error is None:
+                    delivered.append(row["OutboxID"])
+                else:
+                    failures.append((row, error))
+
+        self.outbox.complete(delivered)
+        self.outbox.fail(failures)
+        return len(rows)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+modules/notification_preferences.py
+SDX Project Manager - Notification Preference Cache
+Per-user notification settings cache with write invalidation and in-memory daily quota counters
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_notification_settings(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the parsed NotificationSettings flags to a user row"""
+    try:
+        settings = json.loads(user.get("NotificationSettings") or "{}")
+    except (TypeError, ValueError):
+        settings = {}
+
+    user["email_notifications"] = settings.get("email_notifications", True)
+    user["browser_notifications"] = settings.get("browser_notifications", True)
+    user["quiet_hours"] = settings.get("quiet_hours", False)
+    return user
+
+
+class NotificationPreferenceCache:
+    """Caches active users' notification settings and counts daily quotas
+
+    Settings rows are parsed once and kept until the user's row is written
+    (``invalidate``) or ``ttl_seconds`` pass, which bounds staleness from
+    writers in other processes. Daily quota counters live in memory: a
+    user's counter is seeded with one COUNT the first time they are seen on
+    a given day and then only incremented, and all counters reset when the
+    date changes.
+    """
+
+    def __init__(self, db_manager, ttl_seconds: int = 300):
+        self.db = db_manager
+        self.ttl_seconds = ttl_seconds
+        self._settings: Dict[int, tuple] = {}
+        self._generation = 0
+        self._quota_day = date.today()
+        self._quota: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    # =============================================================================
+    # Preferences
+    # =============================================================================
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Active user with parsed settings, or None"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._settings.get(user_id)
+            generation = self._generation
+        if cached and now - cached[0] < self.ttl_seconds:
+            return dict(cached[1])
+
+        user = self._load(user_id)
+        if user is not None:
+            with self._lock:
+                # Loads raced by an invalidation are not cached
+                if generation == self._generation:
+                    self._settings[user_id] = (now, user)
+            user = dict(user)
+        return user
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Drop cached settings for a user, or for everyone"""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._settings.clear()
+            else:
+                self._settings.pop(user_id, None)
+
+    def _load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            query = """
+                SELECT u.UserID, u.Email, u.FirstName, u.LastName, u.IsActive,
+                       u.Language, u.NotificationSettings
+                FROM Users u
+                WHERE u.UserID = ? AND u.IsActive = 1
+            """
+            result = self.db.execute_query(query, (user_id,))
+            if not result:
+                return None
+            return parse_notification_settings(dict(result[0]))
+
+        except Exception as e:
+            logger.error(f"Error getting user notification settings: {e}")
+            return None
+
+    # =============================================================================
+    # Daily Quotas
+    # =============================================================================
+
+    def try_consume(self, user_id: int, limit: int) -> bool:
+        """Take one notification from today's quota if any is left"""
+        self._roll_day()
+        with self._lock:
+            seeded = user_id in self._quota
+        if not seeded:
+            count = self._count_today(user_id)
+            with self._lock:
+                self._quota.setdefault(user_id, count)
+
+        with self._lock:
+            if self._quota[user_id] >= limit:
+                return False
+            self._quota[user_id] += 1
+            return True
+
+    def release(self, user_id: int):
+        """Give back a quota slot whose notification was not created"""
+        with self._lock:
+            if self._quota.get(user_id, 0) > 0:
+                self._quota[user_id] -= 1
+
+    def record(self, user_ids: List[int]):
+        """Count notifications created outside ``try_consume`` (bulk paths)
+
+        Only users already seeded today are updated; the others pick the
+        rows up when their counter is seeded from the table.
+        """
+        self._roll_day()
+        with self._lock:
+            for user_id in user_ids:
+                if user_id in self._quota:
+                    self._quota[user_id] += 1
+
+    def _roll_day(self):
+        today = date.today()
+        if today != self._quota_day:
+            with self._lock:
+                if today != self._quota_day:
+                    self._quota_day = today
+                    self._quota.clear()
+
+    def _count_today(self, user_id: int) -> int:
+        try:
+            query = """
+                SELECT COUNT(*) as count
+                FROM Notifications
+                WHERE UserID = ? AND CreatedDate >= ?
+            """
+            result = self.db.execute_query(query, (user_id, self._quota_day))
+            return result[0]["count"] if result else 0
+
+        except Exception as e:
+            logger.error(f"Error checking notification limits: {e}")
+            return 0  # Allow if check fails
+
+
+# Global cache so settings writers invalidate what the notifier reads
+_preference_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_notification_preference_cache(db_manager) -> NotificationPreferenceCache:
+    """Get the shared notification preference cache"""
+    global _preference_cache
+
+    if _preference_cache is None:
+        with _cache_lock:
+            if _preference_cache is None:
+                _preference_cache = NotificationPreferenceCache(db_manager)
+
+    return _preference_cache
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+modules/notification_templates.py
+SDX Project Manager - Notification Template Registry
+Templates compiled once per type and locale, validated at load time and rendered in batches
+"""
+
+import logging
+import string
+from typing import Dict, FrozenSet, Iterable, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Template fields filled per recipient; anything else is shared data, so
+# parts without these render once per batch and locale
+RECIPIENT_FIELDS = frozenset({"user_name", "first_name", "last_name", "email"})
+
+TEMPLATE_PARTS = ("title", "in_app", "email_subject", "email_body")
+IN_APP_PARTS = ("title", "in_app")
+EMAIL_PARTS = ("email_subject", "email_body")
+
+CONVERTERS = {"s": str, "r": repr, "a": ascii}
+
+EMAIL_LAYOUT = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <title>DENSO Project Manager Pro</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .header {{ background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%); color: white; padding: 20px; text-align: center; }}
+                .content {{ padding: 20px; }}
+                .footer {{ background: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }}
+                .button {{ background: #2a5298; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; }}
+                ul {{ padding-left: 20px; }}
+                li {{ margin-bottom: 5px; }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>🚗 DENSO Project Manager Pro</h1>
+                <p>การแจ้งเตือนจากระบบจัดการโครงการ</p>
+            </div>
+            <div class="content">
+                {body}
+                <p style="margin-top: 30px;">
+                    <a href="#" class="button">เข้าสู่ระบบ</a>
+                </p>
+            </div>
+            <div class="footer">
+                <p>© 2024 DENSO Corporation. All rights reserved.</p>
+                <p>อีเมลนี้ส่งมาจากระบบอัตโนมัติ กรุณาอย่าตอบกลับ</p>
+            </div>
+        </body>
+        </html>
+        """
+
+
+def recipient_fields(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-recipient template values for a user row"""
+    return {
+        "user_name": f"{user.get('FirstName', '')} {user.get('LastName', '')}".strip(),
+        "first_name": user.get("FirstName", ""),
+        "last_name": user.get("LastName", ""),
+        "email": user.get("Email", ""),
+    }
+
+
+class CompiledTemplate:
+    """A ``str.format`` template parsed once into literal and field segments
+
+    Rendering joins the segments, which gives the same output as
+    ``source.format(**values)`` without re-parsing the string each call.
+    Templates using attribute/index lookups or nested format specs keep
+    the plain ``str.format`` path.
+    """
+
+    def __init__(self, source: str):
+        self.source = source or ""
+        self.segments: List[Tuple[str, Optional[str], str, Optional[str]]] = list(
+            string.Formatter().parse(self.source)
+        )
+        names = [field for _, field, _, _ in self.segments if field is not None]
+        if any(not name or name[0].isdigit() for name in names):
+            raise ValueError("positional placeholders are not supported")
+        # Top-level variable names ({task.title} needs "task")
+        self.fields: FrozenSet[str] = frozenset(
+            name.split(".")[0].split("[")[0] for name in names
+        )
+        self.simple = all(
+            field.isidentifier() and "{" not in (spec or "")
+            for _, field, spec, _ in self.segments
+            if field is not None
+        )
+        # Static text renders to itself (with {{ }} unescaped)
+        self.static = None if self.fields else "".join(s[0] for s in self.segments)
+
+    @property
+    def per_recipient(self) -> bool:
+        return not self.fields.isdisjoint(RECIPIENT_FIELDS)
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Fill the template; raises KeyError for a missing variable"""
+        if self.static is not None:
+            return self.static
+        if not self.simple:
+            return self.source.format(**values)
+
+        parts = []
+        for literal, field, spec, conversion in self.segments:
+            parts.append(literal)
+            if field is not None:
+                value = values[field]
+                if conversion:
+                    value = CONVERTERS[conversion](value)
+                parts.append(format(value, spec or ""))
+        return "".join(parts)
+
+
+class CompiledNotificationTemplate:
+    """Every part of one notification type in one locale"""
+
+    def __init__(self, notification_type: str, definition: Dict[str, Any]):
+        self.notification_type = notification_type
+        self.parts = {
+            part: CompiledTemplate(definition.get(part, "")) for part in TEMPLATE_PARTS
+        }
+        self.priority = definition.get("priority", "medium")
+        self.digest = definition.get("digest", True)
+        self.required: FrozenSet[str] = frozenset().union(
+            *(template.fields for template in self.parts.values())
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Metadata lookup, so callers can treat it like the raw definition"""
+        return getattr(self, key, default)
+
+    def missing(self, data: Dict[str, Any], parts: Iterable[str] = TEMPLATE_PARTS):
+        """Variables used by ``parts`` that ``data`` does not provide"""
+        used = frozenset().union(*(self.parts[part].fields for part in parts))
+        return used - data.keys()
+
+    def render(self, part: str, data: Dict[str, Any]) -> str:
+        """Render one part; a missing variable logs and returns the raw text"""
+        template = self.parts[part]
+        try:
+            return template.render(data)
+        except KeyError as e:
+            logger.warning(f"Missing template variable: {e}")
+            return template.source
+        except Exception as e:
+            logger.error(f"Error formatting message: {e}")
+            return template.source
+
+
+class NotificationTemplateRegistry:
+    """Notification templates compiled once per type and locale
+
+    Definitions use the ``_load_notification_templates`` layout; an optional
+    ``locales`` mapping overrides parts per language. Every part is parsed
+    at load time and a locale that needs variables its default does not
+    use is rejected (it would break callers that only supply the default's
+    variables). Rendering a batch renders each part that does not use
+    recipient fields once, then only the per-recipient parts per user.
+    """
+
+    def __init__(self, definitions: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._templates: Dict[str, Dict[Optional[str], CompiledNotificationTemplate]] = {}
+        # The layout only has {body}: split it once into prefix and suffix
+        marker = "\0body\0"
+        self._layout_prefix, self._layout_suffix = (
+            CompiledTemplate(EMAIL_LAYOUT).render({"body": marker}).split(marker)
+        )
+        for notification_type, definition in (definitions or {}).items():
+            self.register(notification_type, definition)
+
+    # =============================================================================
+    # Loading
+    # =============================================================================
+
+    def register(self, notification_type: str, definition: Dict[str, Any]) -> bool:
+        """Compile a type and its locales; returns False if the default is invalid"""
+        try:
+            default = CompiledNotificationTemplate(notification_type, definition)
+        except ValueError as e:
+            logger.error(f"Invalid notification template {notification_type}: {e}")
+            return False
+
+        compiled = {None: default}
+        for language, overrides in (definition.get("locales") or {}).items():
+            merged = {k: v for k, v in definition.items() if k != "locales"}
+            merged.update(overrides)
+            try:
+                localized = CompiledNotificationTemplate(notification_type, merged)
+            except ValueError as e:
+                logger.error(
+                    f"Invalid {language} template for {notification_type}: {e}"
+                )
+                continue
+            extra = localized.required - default.required
+            if extra:
+                logger.error(
+                    f"{language} template for {notification_type} needs unknown variables: {sorted(extra)}"
+                )
+                continue
+            compiled[language] = localized
+
+        self._templates[notification_type] = compiled
+        return True
+
+    def __contains__(self, notification_type: str) -> bool:
+        return notification_type in self._templates
+
+    def types(self) -> List[str]:
+        return list(self._templates)
+
+    def get(
+        self, notification_type: str, language: Optional[str] = None
+    ) -> Optional[CompiledNotificationTemplate]:
+        """Template for a locale, falling back to its base language, then the default"""
+        compiled = self._templates.get(notification_type)
+        if compiled is None:
+            return None
+        if language:
+            if language in compiled:
+                return compiled[language]
+            base = language.replace("_", "-").split("-")[0]
+            if base in compiled:
+                return compiled[base]
+        return compiled[None]
+
+    # =============================================================================
+    # Rendering
+    # =============================================================================
+
+    def render(
+        self,
+        notification_type: str,
+        data: Dict[str, Any],
+        language: Optional[str] = None,
+        parts: Iterable[str] = IN_APP_PARTS,
+    ) -> Dict[str, str]:
+        template = self.get(notification_type, language)
+        return {part: template.render(part, data) for part in parts}
+
+    def render_batch(
+        self,
+        notification_type: str,
+        data: Dict[str, Any],
+        recipients: List[Dict[str, Any]],
+        parts: Iterable[str] = IN_APP_PARTS,
+    ) -> List[Dict[str, str]]:
+        """Render ``parts`` for every recipient, aligned with ``recipients``
+
+        Shared parts render once per locale; parts using recipient fields
+        render per user with ``recipient_fields`` merged over ``data``.
+        """
+        parts = tuple(parts)
+        shared: Dict[Tuple[int, str], str] = {}
+        rendered = []
+        for user in recipients:
+            template = self.get(notification_type, user.get("Language"))
+            values = None
+            output = {}
+            for part in parts:
+                if template.parts[part].per_recipient:
+                    if values is None:
+                        values = {**data, **recipient_fields(user)}
+                    output[part] = template.render(part, values)
+                else:
+                    key = (id(template), part)
+                    if key not in shared:
+                        shared[key] = template.render(part, data)
+                    output[part] = shared[key]
+            rendered.append(output)
+        return rendered
+
+    def wrap_email_html(self, body: str) -> str:
+        """The email body inside the shared HTML layout"""
+        return f"{self._layout_prefix}{body}{self._layout_suffix}"
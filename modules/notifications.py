@@ -9,10 +9,10 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 import logging
 import json
-import smtplib
+import html
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -21,13 +21,45 @@ import threading
 import time
 from collections import defaultdict
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 from utils.error_handler import safe_execute, handle_error, validate_input
 from utils.ui_components import UIComponents
+from modules.mail_delivery import MailDeliveryEngine
+from modules.notification_broker import get_notification_broker, user_topic
+from modules.notification_counters import (
+    NotificationCounterStore,
+    row_deltas,
+    seed_missing_counters,
+)
+from modules.notification_digest import NotificationCoalescer, coalesce_key
+from modules.notification_templates import (
+    EMAIL_PARTS,
+    CompiledNotificationTemplate,
+    NotificationTemplateRegistry,
+    recipient_fields,
+)
+from modules.notification_outbox import NotificationOutbox, OutboxDispatcher
+from modules.notification_preferences import (
+    get_notification_preference_cache,
+    parse_notification_settings,
+)
 
 logger = logging.getLogger(__name__)
 
+# Users per preference/limit lookup (keeps IN lists under driver limits)
+BULK_LOOKUP_CHUNK = 900
+
+NOTIFICATION_COLUMNS = [
+    "UserID",
+    "Type",
+    "Title",
+    "Message",
+    "Priority",
+    "CreatedDate",
+    "ActionUrl",
+    "EmailDigest",
+]
+
 
 class NotificationManager:
     """Advanced notification management system"""
@@ -36,17 +68,25 @@ class NotificationManager:
         self.db = db_manager
         self.ui = UIComponents()
         self.email_enabled = False
-        self.notification_queue = []
         self.subscribers = defaultdict(list)  # event_type -> [user_ids]
         self.templates = {}
-        self.executor = ThreadPoolExecutor(
-            max_workers=3, thread_name_prefix="notification"
-        )
+        self.mail_engine: Optional[MailDeliveryEngine] = None
+        self.outbox = NotificationOutbox(db_manager)
+        self.outbox_dispatcher: Optional[OutboxDispatcher] = None
+        self.preferences = get_notification_preference_cache(db_manager)
+        self.broker = get_notification_broker()
+        self.counters = NotificationCounterStore(db_manager)
+        seed_missing_counters(db_manager)
 
         # Initialize email settings
         self._init_email_settings()
         self._load_notification_templates()
         self._setup_notification_rules()
+        self.coalescer = NotificationCoalescer(
+            db_manager,
+            window_minutes=self.notification_rules["coalesce_window_minutes"],
+            digest_priorities=self.notification_rules["digest_priorities"],
+        )
 
     def _init_email_settings(self):
         """Initialize email configuration"""
@@ -61,6 +101,30 @@ class NotificationManager:
                 self.from_name = email_config.get("from_name", "DENSO Project Manager")
                 self.email_enabled = bool(self.smtp_username and self.smtp_password)
 
+                if self.email_enabled:
+                    # Persistent sessions shared by every email this manager sends
+                    self.mail_engine = MailDeliveryEngine(
+                        self.smtp_server,
+                        self.smtp_port,
+                        self.smtp_username,
+                        self.smtp_password,
+                        use_tls=email_config.get("smtp_use_tls", True),
+                        pool_size=email_config.get("smtp_pool_size", 2),
+                        batch_size=email_config.get("smtp_batch_size", 50),
+                        queue_size=email_config.get("smtp_queue_size", 1000),
+                        max_retries=email_config.get("smtp_max_retries", 3),
+                    )
+                    # Emails wait in the durable outbox; workers hand them to SMTP
+                    self.outbox_dispatcher = OutboxDispatcher(
+                        self.outbox,
+                        {"email": self._deliver_outbox_emails},
+                        workers=email_config.get("outbox_workers", 1),
+                        batch_size=email_config.get("smtp_batch_size", 50),
+                        # Digests leave once their oldest item reaches
+                        # digest_interval_minutes; check every 5 minutes
+                        periodic=[(300, self.send_digest_emails)],
+                    ).start()
+
             logger.info(
                 f"Email notifications: {'Enabled' if self.email_enabled else 'Disabled'}"
             )
@@ -215,9 +279,29 @@ class NotificationManager:
                 <p>เป้าหมายสัปดาห์หน้า: {next_week_goals}</p>
                 """,
                 "priority": "low",
+                "digest": False,  # Already a summary; always emailed on its own
+            },
+            "notification_digest": {
+                "title": "สรุปการแจ้งเตือน",
+                "in_app": "คุณมีการแจ้งเตือน {count} รายการ",
+                "email_subject": "DENSO - สรุปการแจ้งเตือน ({count} รายการ)",
+                "email_body": """
+                <h2>สรุปการแจ้งเตือน</h2>
+                <p>สวัสดี {user_name},</p>
+                <p>การแจ้งเตือนล่าสุดของคุณ {count} รายการ:</p>
+                <ul>
+                    {items}
+                </ul>
+                <p>กรุณาเข้าสู่ระบบเพื่อดูรายละเอียดเพิ่มเติม</p>
+                """,
+                "priority": "low",
+                "digest": False,
             },
         }
 
+        # Parsed and checked once; rendering never re-reads the raw strings
+        self.template_registry = NotificationTemplateRegistry(self.templates)
+
     def _setup_notification_rules(self):
         """Setup automatic notification rules"""
         self.notification_rules = {
@@ -229,6 +313,11 @@ class NotificationManager:
             "quiet_hours_end": "08:00",
             "weekend_notifications": False,
             "max_notifications_per_user_per_day": 50,
+            "coalesce_window_minutes": 15,  # รวมการแจ้งเตือนของงานเดียวกันภายใน 15 นาที
+            "digest_priorities": ["low"],  # ส่งอีเมลแบบสรุปรวมแทนการส่งทีละฉบับ
+            "digest_interval_minutes": 60,
+            "retention_batch_size": 1000,  # ลบครั้งละไม่เกิน 1000 รายการ
+            "retention_pause_seconds": 0.2,  # พักระหว่างรอบให้รายการอื่นเขียนได้
         }
 
     def create_notification(
@@ -252,36 +341,91 @@ class NotificationManager:
                 logger.warning(f"User {user_id} not found or inactive")
                 return False
 
-            # Check notification limits
-            if not self._check_notification_limits(user_id):
-                logger.warning(f"Notification limit exceeded for user {user_id}")
-                return False
-
             # Get template
-            template = self.templates.get(notification_type)
+            template = self._get_template(notification_type, user.get("Language"))
             if not template:
                 logger.error(f"Template not found for type: {notification_type}")
                 return False
 
             # Format messages
-            title = self._format_message(template["title"], data)
-            in_app_message = self._format_message(template["in_app"], data)
-
-            # Create in-app notification
-            notification_id = self._create_in_app_notification(
-                user_id, notification_type, title, in_app_message, priority, data
-            )
+            title = template.render("title", data)
+            in_app_message = template.render("in_app", data)
 
-            if not notification_id:
-                return False
-
-            # Send email if enabled and requested
-            if (
+            wants_email = (
                 send_email
                 and self.email_enabled
                 and user.get("email_notifications", True)
+            )
+            email_digest = wants_email and self._uses_digest(template, priority)
+
+            # Fold bursts about the same entity into the recent unread row
+            # (never when this notification must be emailed right away)
+            entity_key = coalesce_key(data)
+            if self.coalescer.should_coalesce(
+                entity_key, priority, immediate_email=wants_email and not email_digest
             ):
-                self._schedule_email_notification(user, template, data)
+                merged = self.coalescer.merge(
+                    user_id,
+                    entity_key,
+                    notification_type,
+                    title,
+                    in_app_message,
+                    priority,
+                    email_digest,
+                )
+                if merged:
+                    notification_id, count = merged
+                    self._add_to_realtime_queue(
+                        user_id,
+                        {
+                            "id": notification_id,
+                            "type": notification_type,
+                            "title": title,
+                            "message": in_app_message,
+                            "priority": priority,
+                            "count": count,
+                            "timestamp": datetime.now().isoformat(),
+                        },
+                        "coalesced",
+                    )
+                    return True
+
+            # Check notification limits (takes a slot from today's quota)
+            if not self._check_notification_limits(user_id):
+                logger.warning(f"Notification limit exceeded for user {user_id}")
+                return False
+
+            # Create in-app notification and queue its email atomically
+            try:
+                with self.db.transaction() as cursor:
+                    notification_id = self._create_in_app_notification(
+                        cursor,
+                        user_id,
+                        notification_type,
+                        title,
+                        in_app_message,
+                        priority,
+                        data,
+                        entity_key,
+                        email_digest,
+                    )
+                    if notification_id:
+                        self.counters.apply(
+                            cursor, row_deltas([(user_id, False, priority)])
+                        )
+
+                    # Send email now unless it waits for the digest
+                    if notification_id and wants_email and not email_digest:
+                        self._schedule_email_notification(
+                            user, template, data, cursor, notification_id
+                        )
+            except Exception:
+                self.preferences.release(user_id)
+                raise
+
+            if not notification_id:
+                self.preferences.release(user_id)
+                return False
 
             # Add to real-time queue
             self._add_to_realtime_queue(
@@ -310,7 +454,7 @@ class NotificationManager:
         if not isinstance(user_id, int) or user_id <= 0:
             return False
 
-        if not notification_type or notification_type not in self.templates:
+        if not notification_type or notification_type not in self.template_registry:
             return False
 
         if not isinstance(data, dict):
@@ -319,218 +463,215 @@ class NotificationManager:
         return True
 
     def _get_user_notification_settings(self, user_id: int) -> Optional[Dict]:
-        """Get user and their notification settings"""
-        try:
-            query = """
-                SELECT u.UserID, u.Email, u.FirstName, u.LastName, u.IsActive,
-                       u.NotificationSettings
-                FROM Users u
-                WHERE u.UserID = ? AND u.IsActive = 1
-            """
-            result = self.db.execute_query(query, (user_id,))
-
-            if not result:
-                return None
-
-            user = result[0]
-
-            # Parse notification settings
-            try:
-                settings = json.loads(user.get("NotificationSettings") or "{}")
-            except:
-                settings = {}
-
-            user["email_notifications"] = settings.get("email_notifications", True)
-            user["browser_notifications"] = settings.get("browser_notifications", True)
-            user["quiet_hours"] = settings.get("quiet_hours", False)
-
-            return user
-
-        except Exception as e:
-            logger.error(f"Error getting user notification settings: {e}")
-            return None
+        """Get user and their notification settings (cached)"""
+        return self.preferences.get(user_id)
 
     def _check_notification_limits(self, user_id: int) -> bool:
-        """Check if user has exceeded notification limits"""
-        try:
-            today = date.today()
-            query = """
-                SELECT COUNT(*) as count
-                FROM Notifications
-                WHERE UserID = ? AND CAST(CreatedDate as DATE) = ?
-            """
-            result = self.db.execute_query(query, (user_id, today))
-
-            if result:
-                daily_count = result[0]["count"]
-                max_daily = self.notification_rules[
-                    "max_notifications_per_user_per_day"
-                ]
-                return daily_count < max_daily
-
-            return True
-
-        except Exception as e:
-            logger.error(f"Error checking notification limits: {e}")
-            return True  # Allow if check fails
-
-    def _format_message(self, template: str, data: Dict[str, Any]) -> str:
-        """Format message template with data"""
-        try:
-            return template.format(**data)
-        except KeyError as e:
-            logger.warning(f"Missing template variable: {e}")
-            return template
-        except Exception as e:
-            logger.error(f"Error formatting message: {e}")
-            return template
+        """Consume one of today's notifications for the user if under the limit"""
+        max_daily = self.notification_rules["max_notifications_per_user_per_day"]
+        return self.preferences.try_consume(user_id, max_daily)
 
     def _create_in_app_notification(
         self,
+        cursor,
         user_id: int,
         notification_type: str,
         title: str,
         message: str,
         priority: str,
         data: Dict,
+        entity_key: Optional[str] = None,
+        email_digest: bool = False,
     ) -> Optional[int]:
         """Create in-app notification"""
         try:
+            # The identity comes back from the INSERT itself
             query = """
-                INSERT INTO Notifications (UserID, Type, Title, Message, Priority, CreatedDate, ActionUrl)
-                VALUES (?, ?, ?, ?, ?, GETDATE(), ?)
+                INSERT INTO Notifications (UserID, Type, Title, Message, Priority, CreatedDate,
+                                           ActionUrl, CoalesceKey, EmailDigest)
+                OUTPUT INSERTED.NotificationID
+                VALUES (?, ?, ?, ?, ?, GETDATE(), ?, ?, ?)
             """
 
             action_url = data.get("action_url", "")
 
-            self.db.execute_non_query(
+            cursor.execute(
                 query,
-                (user_id, notification_type, title, message, priority, action_url),
+                (
+                    user_id,
+                    notification_type,
+                    title,
+                    message,
+                    priority,
+                    action_url,
+                    entity_key,
+                    1 if email_digest else 0,
+                ),
             )
+            row = cursor.fetchone()
 
-            # Get the inserted notification ID
-            id_query = "SELECT SCOPE_IDENTITY() as id"
-            result = self.db.execute_query(id_query)
-
-            return result[0]["id"] if result else None
+            return row[0] if row else None
 
         except Exception as e:
             logger.error(f"Error creating in-app notification: {e}")
             return None
 
-    def _schedule_email_notification(self, user: Dict, template: Dict, data: Dict):
-        """Schedule email notification for sending"""
+    def _schedule_email_notification(
+        self,
+        user: Dict,
+        template: Dict,
+        data: Dict,
+        cursor=None,
+        notification_id: Optional[int] = None,
+    ):
+        """Schedule email notification for sending
+
+        The email goes into the outbox on ``cursor`` (committing with the
+        caller's transaction) or, without one, in a transaction of its own.
+        """
         try:
             if not self.email_enabled:
                 return
 
-            email_data = {
-                "to_email": user["Email"],
-                "to_name": f"{user['FirstName']} {user['LastName']}",
-                "subject": self._format_message(template["email_subject"], data),
-                "body": self._format_message(template["email_body"], data),
-                "user_data": user,
-                "template_data": data,
-            }
-
-            # Send email in background thread
-            self.executor.submit(self._send_email_notification, email_data)
+            rendered = {part: template.render(part, data) for part in EMAIL_PARTS}
+            entry = self._email_outbox_entry(user, rendered, data, notification_id)
+            if cursor is not None:
+                self.outbox.enqueue(cursor, [entry])
+                if notification_id:
+                    self.coalescer.mark_emailed(cursor, [notification_id])
+            else:
+                self.outbox.enqueue_now([entry])
 
         except Exception as e:
             logger.error(f"Error scheduling email notification: {e}")
+            if cursor is not None:
+                raise
 
-    def _send_email_notification(self, email_data: Dict):
-        """Send email notification"""
-        try:
-            if not self.email_enabled:
-                return False
-
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = email_data["subject"]
-            msg["From"] = f"{self.from_name} <{self.from_email}>"
-            msg["To"] = email_data["to_email"]
-
-            # Create HTML part
-            html_body = self._create_email_html(
-                email_data["body"], email_data["template_data"]
-            )
-            html_part = MIMEText(html_body, "html", "utf-8")
-            msg.attach(html_part)
+    def _email_outbox_entry(
+        self,
+        user: Dict,
+        rendered: Dict[str, str],
+        data: Dict,
+        notification_id: Optional[int] = None,
+    ) -> Tuple[str, int, Optional[int], Dict]:
+        """Rendered email (EMAIL_PARTS) as an outbox row"""
+        email_data = {
+            "to_email": user["Email"],
+            "to_name": f"{user['FirstName']} {user['LastName']}",
+            "subject": rendered["email_subject"],
+            "body": rendered["email_body"],
+            "template_data": data,
+        }
+        return ("email", user["UserID"], notification_id, email_data)
 
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+    def _deliver_outbox_emails(self, rows: List[Dict]) -> Dict[int, Optional[str]]:
+        """Outbox handler: send claimed emails and wait for their outcome
 
-            logger.info(f"Email sent successfully to {email_data['to_email']}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error sending email: {e}")
-            return False
+        Rows the mail queue has no room for, and rows still in flight when
+        the visibility timeout is about to lapse, are left out of the result
+        and will be claimed again.
+        """
+        results: Dict[int, Optional[str]] = {}
+        lock = threading.Lock()
+        done = threading.Event()
+        outstanding = [len(rows)]
+
+        def settle(outbox_id: int, error: Optional[str], record: bool = True):
+            with lock:
+                if record:
+                    results[outbox_id] = error
+                outstanding[0] -= 1
+                if not outstanding[0]:
+                    done.set()
+
+        if not rows:
+            return results
+
+        for row in rows:
+            outbox_id = row["OutboxID"]
+            try:
+                message = self._build_email_message(row["Payload"])
+                # Never wait on a full queue: the claim must not outlive its timeout
+                submitted = self.mail_engine.submit(
+                    message,
+                    block=False,
+                    on_complete=lambda ok, error, outbox_id=outbox_id: settle(
+                        outbox_id, None if ok else (error or "Delivery failed")
+                    ),
+                )
+                if not submitted:
+                    settle(outbox_id, None, record=False)
+            except Exception as e:
+                settle(outbox_id, str(e))
+
+        done.wait(self.outbox.visibility_timeout * 0.8)
+        with lock:
+            return dict(results)
+
+    def _build_email_message(self, email_data: Dict) -> MIMEMultipart:
+        """Create the MIME message for one email"""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = email_data["subject"]
+        msg["From"] = f"{self.from_name} <{self.from_email}>"
+        msg["To"] = email_data["to_email"]
+
+        # Create HTML part
+        html_body = self._create_email_html(
+            email_data["body"], email_data.get("template_data", {})
+        )
+        html_part = MIMEText(html_body, "html", "utf-8")
+        msg.attach(html_part)
+        return msg
 
     def _create_email_html(self, body: str, data: Dict) -> str:
         """Create formatted HTML email"""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>DENSO Project Manager Pro</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .header {{ background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%); color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; }}
-                .footer {{ background: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }}
-                .button {{ background: #2a5298; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; }}
-                ul {{ padding-left: 20px; }}
-                li {{ margin-bottom: 5px; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🚗 DENSO Project Manager Pro</h1>
-                <p>การแจ้งเตือนจากระบบจัดการโครงการ</p>
-            </div>
-            <div class="content">
-                {body}
-                <p style="margin-top: 30px;">
-                    <a href="#" class="button">เข้าสู่ระบบ</a>
-                </p>
-            </div>
-            <div class="footer">
-                <p>© 2024 DENSO Corporation. All rights reserved.</p>
-                <p>อีเมลนี้ส่งมาจากระบบอัตโนมัติ กรุณาอย่าตอบกลับ</p>
-            </div>
-        </body>
-        </html>
-        """
+        return self.template_registry.wrap_email_html(body)
 
-    def _add_to_realtime_queue(self, user_id: int, notification: Dict):
-        """Add notification to real-time queue"""
+    def _add_to_realtime_queue(
+        self, user_id: int, notification: Dict, event: str = "created"
+    ):
+        """Publish a notification event to every session of the user"""
         try:
-            if "notifications_queue" not in st.session_state:
-                st.session_state.notifications_queue = []
-
-            st.session_state.notifications_queue.append(
+            self.broker.publish(
+                user_topic(user_id),
                 {
+                    "event": event,
                     "user_id": user_id,
                     "notification": notification,
                     "timestamp": datetime.now(),
-                }
+                },
             )
 
-            # Keep only last 100 notifications
-            if len(st.session_state.notifications_queue) > 100:
-                st.session_state.notifications_queue = (
-                    st.session_state.notifications_queue[-100:]
-                )
-
         except Exception as e:
             logger.error(f"Error adding to realtime queue: {e}")
 
+    def poll_realtime_notifications(self, user_id: int) -> List[Dict[str, Any]]:
+        """Events published for the user since this session last polled
+
+        The session keeps its broker subscription and last sequence number
+        in ``st.session_state``; a new or expired subscription starts from
+        the current sequence.
+        """
+        try:
+            topic = user_topic(user_id)
+            state = st.session_state.get("notification_subscription")
+            if not state or not self.broker.is_subscribed(state["id"], topic):
+                state = {
+                    "id": self.broker.subscribe(topic),
+                    "sequence": self.broker.latest_sequence(topic),
+                }
+                st.session_state.notification_subscription = state
+                return []
+
+            messages = self.broker.poll(state["id"], state["sequence"])
+            if messages:
+                state["sequence"] = messages[-1].sequence
+            return [message.payload for message in messages]
+
+        except Exception as e:
+            logger.error(f"Error polling realtime notifications: {e}")
+            return []
+
     def get_user_notifications(
         self,
         user_id: int,
@@ -542,7 +683,7 @@ class NotificationManager:
         try:
             query = """
                 SELECT NotificationID, Type, Title, Message, IsRead, CreatedDate, 
-                       Priority, ActionUrl, ActionText, ExpiresAt
+                       Priority, ActionUrl, ActionText, ExpiresAt, CoalescedCount
                 FROM Notifications
                 WHERE UserID = ?
             """
@@ -572,10 +713,16 @@ class NotificationManager:
             query = """
                 UPDATE Notifications 
                 SET IsRead = 1, ReadDate = GETDATE()
-                WHERE NotificationID = ? AND UserID = ?
+                WHERE NotificationID = ? AND UserID = ? AND IsRead = 0
             """
 
-            rows_affected = self.db.execute_non_query(query, (notification_id, user_id))
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (notification_id, user_id))
+                rows_affected = cursor.rowcount
+                self.counters.apply(cursor, {user_id: (0, -rows_affected, 0)})
+
+            if rows_affected > 0:
+                self._add_to_realtime_queue(user_id, {"id": notification_id}, "read")
             return rows_affected > 0
 
         except Exception as e:
@@ -591,7 +738,13 @@ class NotificationManager:
                 WHERE UserID = ? AND IsRead = 0
             """
 
-            rows_affected = self.db.execute_non_query(query, (user_id,))
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (user_id,))
+                rows_affected = cursor.rowcount
+                self.counters.apply(cursor, {user_id: (0, -rows_affected, 0)})
+
+            if rows_affected > 0:
+                self._add_to_realtime_queue(user_id, {}, "read_all")
             logger.info(
                 f"Marked {rows_affected} notifications as read for user {user_id}"
             )
@@ -604,8 +757,27 @@ class NotificationManager:
     def delete_notification(self, notification_id: int, user_id: int) -> bool:
         """Delete notification"""
         try:
-            query = "DELETE FROM Notifications WHERE NotificationID = ? AND UserID = ?"
-            rows_affected = self.db.execute_non_query(query, (notification_id, user_id))
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "SELECT IsRead, Priority FROM Notifications WHERE NotificationID = ? AND UserID = ?",
+                    (notification_id, user_id),
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    return False
+
+                cursor.execute(
+                    "DELETE FROM Notifications WHERE NotificationID = ? AND UserID = ?",
+                    (notification_id, user_id),
+                )
+                rows_affected = cursor.rowcount
+                if rows_affected > 0:
+                    self.counters.apply(
+                        cursor, row_deltas([(user_id, row[0], row[1])], sign=-1)
+                    )
+
+            if rows_affected > 0:
+                self._add_to_realtime_queue(user_id, {"id": notification_id}, "deleted")
             return rows_affected > 0
 
         except Exception as e:
@@ -613,52 +785,71 @@ class NotificationManager:
             return False
 
     def get_notification_statistics(self, user_id: int = None) -> Dict[str, Any]:
-        """Get notification statistics"""
+        """Get notification statistics
+
+        Totals come from NotificationCounters; only the recent-window count
+        touches Notifications, as an index range scan.
+        """
         try:
             if user_id:
+                stats = self.counters.get(user_id)
                 query = """
-                    SELECT 
-                        COUNT(*) as total_notifications,
-                        SUM(CASE WHEN IsRead = 0 THEN 1 ELSE 0 END) as unread_count,
-                        SUM(CASE WHEN Priority = 'critical' THEN 1 ELSE 0 END) as critical_count,
-                        SUM(CASE WHEN CreatedDate >= DATEADD(day, -7, GETDATE()) THEN 1 ELSE 0 END) as last_week_count
+                    SELECT COUNT(*) as last_week_count
                     FROM Notifications
-                    WHERE UserID = ?
+                    WHERE UserID = ? AND CreatedDate >= ?
                 """
-                result = self.db.execute_query(query, (user_id,))
+                result = self.db.execute_query(
+                    query, (user_id, datetime.now() - timedelta(days=7))
+                )
+                stats["last_week_count"] = result[0]["last_week_count"] if result else 0
             else:
+                stats = self.counters.totals()
                 query = """
-                    SELECT 
-                        COUNT(*) as total_notifications,
-                        SUM(CASE WHEN IsRead = 0 THEN 1 ELSE 0 END) as unread_count,
-                        COUNT(DISTINCT UserID) as total_users,
-                        SUM(CASE WHEN CreatedDate >= DATEADD(day, -1, GETDATE()) THEN 1 ELSE 0 END) as today_count
+                    SELECT COUNT(*) as today_count
                     FROM Notifications
+                    WHERE CreatedDate >= ?
                 """
-                result = self.db.execute_query(query)
+                result = self.db.execute_query(
+                    query, (datetime.now() - timedelta(days=1),)
+                )
+                stats["today_count"] = result[0]["today_count"] if result else 0
 
-            return result[0] if result else {}
+            return stats
 
         except Exception as e:
             logger.error(f"Error getting notification statistics: {e}")
             return {}
 
-    def cleanup_old_notifications(self, days_old: int = 30) -> int:
-        """Clean up old notifications"""
-        try:
-            query = """
-                DELETE FROM Notifications 
-                WHERE CreatedDate < DATEADD(day, -?, GETDATE())
-                OR (ExpiresAt IS NOT NULL AND ExpiresAt < GETDATE())
-            """
-
-            rows_affected = self.db.execute_non_query(query, (days_old,))
-            logger.info(f"Cleaned up {rows_affected} old notifications")
-            return rows_affected
+    def get_unread_count(self, user_id: int) -> int:
+        """Unread badge count (counter lookup)"""
+        return self.counters.get(user_id)["unread_count"]
 
-        except Exception as e:
-            logger.error(f"Error cleaning up notifications: {e}")
-            return 0
+    def cleanup_old_notifications(
+        self,
+        days_old: int = 30,
+        batch_size: Optional[int] = None,
+        pause_seconds: Optional[float] = None,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """Clean up old notifications
+
+        Rows go in batches of ``batch_size``, each in a short transaction
+        that also adjusts the owners' counters, with a pause between
+        batches so writers are never held behind one long delete.
+        """
+        if batch_size is None:
+            batch_size = self.notification_rules["retention_batch_size"]
+        if pause_seconds is None:
+            pause_seconds = self.notification_rules["retention_pause_seconds"]
+
+        total_deleted, batches = self.counters.purge(
+            datetime.now() - timedelta(days=days_old),
+            batch_size=batch_size,
+            pause_seconds=pause_seconds,
+            max_batches=max_batches,
+        )
+        logger.info(f"Cleaned up {total_deleted} old notifications in {batches} batches")
+        return total_deleted
 
     def subscribe_to_notifications(self, user_id: int, event_type: str):
         """Subscribe user to notification type"""
@@ -671,25 +862,237 @@ class NotificationManager:
             self.subscribers[event_type].remove(user_id)
 
     def broadcast_notification(
-        self, event_type: str, data: Dict[str, Any], exclude_users: List[int] = None
+        self,
+        event_type: str,
+        data: Dict[str, Any],
+        exclude_users: List[int] = None,
+        priority: str = "medium",
+        send_email: bool = False,
     ):
         """Broadcast notification to all subscribers"""
         try:
-            exclude_users = exclude_users or []
+            exclude_users = set(exclude_users or [])
             subscribers = [
                 uid for uid in self.subscribers[event_type] if uid not in exclude_users
             ]
 
-            for user_id in subscribers:
-                self.create_notification(user_id, event_type, data, send_email=False)
+            created = self.create_bulk_notifications(
+                subscribers, event_type, data, priority=priority, send_email=send_email
+            )
 
-            logger.info(f"Broadcasted {event_type} to {len(subscribers)} users")
+            logger.info(
+                f"Broadcasted {event_type} to {len(created)}/{len(subscribers)} users"
+            )
             return True
 
         except Exception as e:
             logger.error(f"Error broadcasting notification: {e}")
             return False
 
+    def create_bulk_notifications(
+        self,
+        user_ids: List[int],
+        notification_type: str,
+        data: Dict[str, Any],
+        priority: str = "medium",
+        send_email: bool = False,
+    ) -> Dict[int, int]:
+        """Create the same notification for many users in a few statements
+
+        Settings and today's counts for all recipients come from one query
+        per chunk of users, the template is rendered once per locale (or per
+        recipient only when it uses recipient fields), and the rows go in as
+        multi-row INSERTs that return their identities. Returns
+        ``{user_id: notification_id}`` for the users that were notified.
+        """
+        try:
+            user_ids = list(
+                dict.fromkeys(uid for uid in user_ids if isinstance(uid, int) and uid > 0)
+            )
+            if not user_ids or not self._validate_notification_data(
+                user_ids[0], notification_type, data
+            ):
+                return {}
+
+            max_daily = self.notification_rules["max_notifications_per_user_per_day"]
+            recipients = [
+                user
+                for user in self._get_bulk_notification_settings(user_ids)
+                if user["TodayCount"] < max_daily
+            ]
+            if not recipients:
+                return {}
+
+            # Low-priority email waits for the digest instead of going out now
+            email_digest = (
+                send_email
+                and self.email_enabled
+                and self._uses_digest(self._get_template(notification_type), priority)
+            )
+
+            # Shared parts render once per locale, recipient fields per user
+            rendered = self.template_registry.render_batch(
+                notification_type, data, recipients
+            )
+            rows = []
+            for user, texts in zip(recipients, rendered):
+                rows.append(
+                    (
+                        user["UserID"],
+                        notification_type,
+                        texts["title"],
+                        texts["in_app"],
+                        priority,
+                        datetime.now(),
+                        data.get("action_url", ""),
+                        1
+                        if email_digest and user.get("email_notifications", True)
+                        else 0,
+                    )
+                )
+
+            with self.db.transaction() as cursor:
+                notification_ids = self._insert_notification_rows(cursor, rows)
+                if send_email and not email_digest:
+                    self._queue_created_emails(
+                        cursor,
+                        [
+                            (user, notification_type, data, notification_id)
+                            for user, notification_id in zip(
+                                recipients, notification_ids
+                            )
+                        ],
+                    )
+
+            self.preferences.record(
+                [row[0] for row, nid in zip(rows, notification_ids) if nid is not None]
+            )
+
+            created = {}
+            for user, row, notification_id in zip(recipients, rows, notification_ids):
+                if notification_id is None:
+                    continue
+                created[user["UserID"]] = notification_id
+                self._publish_created(notification_id, row)
+
+            logger.info(
+                f"Bulk notification {notification_type}: {len(created)} of {len(user_ids)} users"
+            )
+            return created
+
+        except Exception as e:
+            logger.error(f"Error creating bulk notifications: {e}")
+            return {}
+
+    def _insert_notification_rows(self, cursor, rows: List[tuple]) -> List[Optional[int]]:
+        """Multi-row INSERT of NOTIFICATION_COLUMNS rows; IDs aligned with rows
+
+        Generated IDs come back through OUTPUT/RETURNING together with
+        (UserID, Type, ActionUrl), which is unique within one bulk call.
+        The recipients' counters are updated on the same cursor.
+        """
+        inserted = self.db.insert_rows(
+            cursor,
+            "Notifications",
+            NOTIFICATION_COLUMNS,
+            rows,
+            output_columns=["NotificationID", "UserID", "Type", "ActionUrl"],
+        )
+        ids = {
+            (user_id, notification_type, action_url): notification_id
+            for notification_id, user_id, notification_type, action_url in inserted
+        }
+        notification_ids = [ids.get((row[0], row[1], row[6])) for row in rows]
+        self.counters.apply(
+            cursor,
+            row_deltas(
+                (row[0], False, row[4])
+                for row, notification_id in zip(rows, notification_ids)
+                if notification_id is not None
+            ),
+        )
+        return notification_ids
+
+    def _queue_created_emails(self, cursor, created: List[Tuple]):
+        """Outbox rows for (user, type, data, notification_id) bulk inserts"""
+        if not self.email_enabled:
+            return
+
+        # Items sharing a type and data dict are rendered as one batch
+        batches: Dict[Tuple[str, int], List[Tuple]] = {}
+        for item in created:
+            user, notification_type, data, notification_id = item
+            if notification_id is not None and user.get("email_notifications", True):
+                batches.setdefault((notification_type, id(data)), []).append(item)
+
+        entries = []
+        for (notification_type, _), items in batches.items():
+            rendered = self.template_registry.render_batch(
+                notification_type,
+                items[0][2],
+                [user for user, _, _, _ in items],
+                EMAIL_PARTS,
+            )
+            entries.extend(
+                self._email_outbox_entry(
+                    user, texts, {**data, **recipient_fields(user)}, notification_id
+                )
+                for (user, _, data, notification_id), texts in zip(items, rendered)
+            )
+        if entries:
+            self.outbox.enqueue(cursor, entries)
+            self.coalescer.mark_emailed(
+                cursor, [entry[2] for entry in entries if entry[2] is not None]
+            )
+
+    def _publish_created(self, notification_id: int, row: tuple):
+        """Real-time delivery for one bulk-inserted notification"""
+        self._add_to_realtime_queue(
+            row[0],
+            {
+                "id": notification_id,
+                "type": row[1],
+                "title": row[2],
+                "message": row[3],
+                "priority": row[4],
+                "timestamp": row[5].isoformat(),
+            },
+        )
+
+    def _get_bulk_notification_settings(self, user_ids: List[int]) -> List[Dict]:
+        """Active users with parsed settings and today's notification count"""
+        users = []
+        today = date.today()
+        for offset in range(0, len(user_ids), BULK_LOOKUP_CHUNK):
+            chunk = user_ids[offset : offset + BULK_LOOKUP_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = f"""
+                SELECT u.UserID, u.Email, u.FirstName, u.LastName, u.Language,
+                       u.NotificationSettings, COALESCE(n.TodayCount, 0) as TodayCount
+                FROM Users u
+                LEFT JOIN (
+                    SELECT UserID, COUNT(*) as TodayCount
+                    FROM Notifications
+                    WHERE CreatedDate >= ? AND UserID IN ({placeholders})
+                    GROUP BY UserID
+                ) n ON n.UserID = u.UserID
+                WHERE u.IsActive = 1 AND u.UserID IN ({placeholders})
+            """
+            params = (today, *chunk, *chunk)
+            for user in self.db.execute_query(query, params) or []:
+                users.append(parse_notification_settings(dict(user)))
+        return users
+
+    def _get_template(
+        self, notification_type: str, language: Optional[str] = None
+    ) -> Optional[CompiledNotificationTemplate]:
+        """Compiled template for a locale, falling back to the default entry"""
+        return self.template_registry.get(notification_type, language)
+
+    def _uses_digest(self, template: CompiledNotificationTemplate, priority: str) -> bool:
+        """Whether the email for this notification goes out in the digest"""
+        return template.digest and self.coalescer.uses_digest(priority)
+
     # Auto-notification triggers
     def trigger_task_assigned(
         self, task_id: int, assigned_to_id: int, assigned_by_id: int
@@ -741,137 +1144,186 @@ class NotificationManager:
 
     def trigger_task_due_reminders(self):
         """Check and send due date reminders"""
-        try:
-            reminder_days = self.notification_rules["task_due_reminder_days"]
-            notifications_sent = 0
-
-            for days in reminder_days:
-                due_date = date.today() + timedelta(days=days)
-
-                query = """
-                    SELECT t.TaskID, t.Title, t.DueDate, t.AssignedToID,
-                           p.Name as ProjectName,
-                           u.FirstName + ' ' + u.LastName as UserName
-                    FROM Tasks t
-                    JOIN Projects p ON t.ProjectID = p.ProjectID
-                    JOIN Users u ON t.AssignedToID = u.UserID
-                    WHERE CAST(t.DueDate as DATE) = ?
-                    AND t.Status NOT IN ('Done', 'Cancelled')
-                    AND t.AssignedToID IS NOT NULL
-                """
-
-                tasks = self.db.execute_query(query, (due_date,))
-
-                for task in tasks:
-                    # Check if reminder already sent
-                    if self._check_reminder_sent(task["TaskID"], "task_due_soon", days):
-                        continue
-
-                    notification_data = {
-                        "task_id": task["TaskID"],
-                        "task_title": task["Title"],
-                        "project_name": task["ProjectName"],
-                        "user_name": task["UserName"],
-                        "due_date": task["DueDate"].strftime("%d/%m/%Y"),
-                        "days_remaining": days,
-                        "action_url": f'/tasks?task_id={task["TaskID"]}',
-                    }
-
-                    if self.create_notification(
-                        task["AssignedToID"],
-                        "task_due_soon",
-                        notification_data,
-                        priority="high",
-                    ):
-                        self._mark_reminder_sent(task["TaskID"], "task_due_soon", days)
-                        notifications_sent += 1
-
-            logger.info(f"Sent {notifications_sent} due date reminders")
-            return notifications_sent
-
-        except Exception as e:
-            logger.error(f"Error sending due date reminders: {e}")
-            return 0
+        return self.run_reminder_sweep(["task_due_soon"]).get("task_due_soon", 0)
 
     def trigger_overdue_reminders(self):
         """Check and send overdue reminders"""
+        return self.run_reminder_sweep(["task_overdue"]).get("task_overdue", 0)
+
+    def run_reminder_sweep(
+        self, reminder_types: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """Send every due-soon and overdue reminder in one pass
+
+        All configured offsets go into a single query as a VALUES table of
+        (type, offset, day) rows joined to Tasks on the due-date range, with
+        recipient settings and today's counts joined in and already-sent
+        reminders removed by an anti-join on the ledger key. The resulting
+        notifications and their ledger rows are inserted together in one
+        transaction, so the cost does not grow with the number of offsets.
+        Returns the number of reminders sent per type.
+        """
         try:
-            reminder_days = self.notification_rules["overdue_reminder_days"]
-            notifications_sent = 0
-
-            for days in reminder_days:
-                overdue_date = date.today() - timedelta(days=days)
-
-                query = """
-                    SELECT t.TaskID, t.Title, t.DueDate, t.AssignedToID,
-                           p.Name as ProjectName,
-                           u.FirstName + ' ' + u.LastName as UserName
-                    FROM Tasks t
-                    JOIN Projects p ON t.ProjectID = p.ProjectID
-                    JOIN Users u ON t.AssignedToID = u.UserID
-                    WHERE CAST(t.DueDate as DATE) = ?
-                    AND t.Status NOT IN ('Done', 'Cancelled')
-                    AND t.AssignedToID IS NOT NULL
-                """
+            today = date.today()
+            offsets = []
+            for reminder_type, rule, sign in (
+                ("task_due_soon", "task_due_reminder_days", 1),
+                ("task_overdue", "overdue_reminder_days", -1),
+            ):
+                if reminder_types and reminder_type not in reminder_types:
+                    continue
+                for days in dict.fromkeys(self.notification_rules[rule]):
+                    offsets.append(
+                        (reminder_type, days, today + timedelta(days=sign * days))
+                    )
+            sent = {reminder_type: 0 for reminder_type, _, _ in offsets}
+            if not offsets:
+                return sent
+
+            values = ", ".join(
+                "(?, ?, CAST(? AS DATE), CAST(? AS DATE))" for _ in offsets
+            )
+            params: List[Any] = [today]
+            for reminder_type, days, day in offsets:
+                params.extend([reminder_type, days, day, day + timedelta(days=1)])
 
-                tasks = self.db.execute_query(query, (overdue_date,))
-
-                for task in tasks:
-                    # Check if reminder already sent
-                    if self._check_reminder_sent(task["TaskID"], "task_overdue", days):
-                        continue
-
-                    notification_data = {
-                        "task_id": task["TaskID"],
-                        "task_title": task["Title"],
-                        "project_name": task["ProjectName"],
-                        "user_name": task["UserName"],
-                        "due_date": task["DueDate"].strftime("%d/%m/%Y"),
-                        "days_overdue": days,
-                        "action_url": f'/tasks?task_id={task["TaskID"]}',
-                    }
-
-                    if self.create_notification(
-                        task["AssignedToID"],
-                        "task_overdue",
-                        notification_data,
-                        priority="critical",
-                    ):
-                        self._mark_reminder_sent(task["TaskID"], "task_overdue", days)
-                        notifications_sent += 1
+            query = f"""
+                SELECT o.ReminderType, o.OffsetDays, o.DueDay,
+                       t.TaskID, t.Title, t.DueDate, t.AssignedToID,
+                       p.Name as ProjectName,
+                       u.UserID, u.Email, u.FirstName, u.LastName, u.Language,
+                       u.NotificationSettings,
+                       (
+                           SELECT COUNT(*) FROM Notifications n
+                           WHERE n.UserID = u.UserID AND n.CreatedDate >= ?
+                       ) as TodayCount
+                FROM (VALUES {values}) AS o(ReminderType, OffsetDays, DueDay, NextDay)
+                JOIN Tasks t ON t.DueDate >= o.DueDay AND t.DueDate < o.NextDay
+                JOIN Projects p ON t.ProjectID = p.ProjectID
+                JOIN Users u ON t.AssignedToID = u.UserID AND u.IsActive = 1
+                WHERE t.Status NOT IN ('Done', 'Cancelled')
+                AND NOT EXISTS (
+                    SELECT 1 FROM ReminderLedger rl
+                    WHERE rl.TaskID = t.TaskID
+                    AND rl.ReminderType = o.ReminderType
+                    AND rl.OffsetDays = o.OffsetDays
+                    AND rl.DueDate = o.DueDay
+                )
+                ORDER BY u.UserID, o.ReminderType DESC, t.DueDate
+            """
+            candidates = self.db.execute_query(query, tuple(params)) or []
+
+            max_daily = self.notification_rules["max_notifications_per_user_per_day"]
+            remaining: Dict[int, int] = {}
+            now = datetime.now()
+            entries = []
+            for task in candidates:
+                user = dict(task)
+                user_id = user["UserID"]
+                remaining.setdefault(user_id, max_daily - user["TodayCount"])
+                if remaining[user_id] <= 0:
+                    continue
+                remaining[user_id] -= 1
+                parse_notification_settings(user)
+
+                reminder_type = user["ReminderType"]
+                due = user["DueDate"]
+                if isinstance(due, str):
+                    due = datetime.fromisoformat(due)
+                data = {
+                    "task_id": user["TaskID"],
+                    "task_title": user["Title"],
+                    "project_name": user["ProjectName"],
+                    "user_name": f"{user['FirstName']} {user['LastName']}",
+                    "due_date": due.strftime("%d/%m/%Y"),
+                    "action_url": f'/tasks?task_id={user["TaskID"]}',
+                }
+                if reminder_type == "task_due_soon":
+                    data["days_remaining"] = user["OffsetDays"]
+                    priority = "high"
+                else:
+                    data["days_overdue"] = user["OffsetDays"]
+                    priority = "critical"
+
+                template = self._get_template(reminder_type, user.get("Language"))
+                row = (
+                    user_id,
+                    reminder_type,
+                    template.render("title", data),
+                    template.render("in_app", data),
+                    priority,
+                    now,
+                    data["action_url"],
+                    0,
+                )
+                entries.append((user, data, row))
 
-            logger.info(f"Sent {notifications_sent} overdue reminders")
-            return notifications_sent
+            if not entries:
+                return sent
 
-        except Exception as e:
-            logger.error(f"Error sending overdue reminders: {e}")
-            return 0
+            # Notifications and their ledger keys commit together; a racing
+            # sweep trips the ledger's unique key and rolls back instead
+            with self.db.transaction() as cursor:
+                notification_ids = self._insert_notification_rows(
+                    cursor, [row for _, _, row in entries]
+                )
+                self.db.insert_rows(
+                    cursor,
+                    "ReminderLedger",
+                    [
+                        "TaskID",
+                        "ReminderType",
+                        "OffsetDays",
+                        "DueDate",
+                        "UserID",
+                        "NotificationID",
+                        "SentAt",
+                    ],
+                    [
+                        (
+                            user["TaskID"],
+                            user["ReminderType"],
+                            user["OffsetDays"],
+                            user["DueDay"],
+                            user["UserID"],
+                            notification_id,
+                            now,
+                        )
+                        for (user, _, _), notification_id in zip(
+                            entries, notification_ids
+                        )
+                    ],
+                )
+                self._queue_created_emails(
+                    cursor,
+                    [
+                        (user, row[1], data, notification_id)
+                        for (user, data, row), notification_id in zip(
+                            entries, notification_ids
+                        )
+                    ],
+                )
 
-    def _check_reminder_sent(self, task_id: int, reminder_type: str, days: int) -> bool:
-        """Check if reminder was already sent"""
-        try:
-            query = """
-                SELECT COUNT(*) as count
-                FROM Notifications
-                WHERE Type = ? 
-                AND Message LIKE ?
-                AND CreatedDate >= DATEADD(day, -1, GETDATE())
-            """
+            self.preferences.record(
+                [
+                    row[0]
+                    for (_, _, row), nid in zip(entries, notification_ids)
+                    if nid is not None
+                ]
+            )
 
-            message_pattern = f"%{task_id}%{days}%"
-            result = self.db.execute_query(query, (reminder_type, message_pattern))
+            for (user, data, row), notification_id in zip(entries, notification_ids):
+                if notification_id is None:
+                    continue
+                self._publish_created(notification_id, row)
+                sent[row[1]] += 1
 
-            return result[0]["count"] > 0 if result else False
+            logger.info(f"Reminder sweep sent {sent}")
+            return sent
 
         except Exception as e:
-            logger.error(f"Error checking reminder sent: {e}")
-            return False
-
-    def _mark_reminder_sent(self, task_id: int, reminder_type: str, days: int):
-        """Mark that reminder was sent (implementation depends on your tracking needs)"""
-        # This could be implemented as a separate tracking table
-        # For now, we rely on the notification itself as the marker
-        pass
+            logger.error(f"Error running reminder sweep: {e}")
+            return {}
 
     def send_weekly_summary(self, user_id: int):
         """Send weekly summary to user"""
@@ -925,6 +1377,59 @@ class NotificationManager:
             logger.error(f"Error sending weekly summary: {e}")
             return False
 
+    def send_digest_emails(self, min_age_minutes: Optional[int] = None) -> int:
+        """Email each user one digest of their waiting low-priority notifications
+
+        Runs periodically on the outbox dispatcher and from the admin
+        panel. The digest emails go into the outbox in the same transaction
+        that marks their notifications sent. Returns the number of digests
+        queued.
+        """
+        try:
+            if min_age_minutes is None:
+                min_age_minutes = self.notification_rules["digest_interval_minutes"]
+
+            pending = self.coalescer.pending_digest_items(min_age_minutes)
+            if not pending:
+                return 0
+
+            entries, emailed, skipped = [], [], []
+            for items in pending.values():
+                user = parse_notification_settings(items[0])
+                ids = [item["NotificationID"] for item in items]
+                if not self.email_enabled or not user["email_notifications"]:
+                    skipped.extend(ids)
+                    continue
+
+                template = self._get_template("notification_digest", user.get("Language"))
+                data = {
+                    **recipient_fields(user),
+                    "count": sum(item.get("CoalescedCount") or 1 for item in items),
+                    "items": "".join(
+                        f"<li><strong>{html.escape(item['Title'])}</strong>"
+                        f" - {html.escape(item['Message'])}</li>"
+                        for item in items
+                    ),
+                    "action_url": "/notifications",
+                }
+                rendered = {part: template.render(part, data) for part in EMAIL_PARTS}
+                entries.append(self._email_outbox_entry(user, rendered, data))
+                emailed.extend(ids)
+
+            with self.db.transaction() as cursor:
+                if entries:
+                    self.outbox.enqueue(cursor, entries)
+                self.coalescer.mark_digested(cursor, emailed, skipped)
+
+            logger.info(
+                f"Queued {len(entries)} notification digests covering {len(emailed)} notifications"
+            )
+            return len(entries)
+
+        except Exception as e:
+            logger.error(f"Error sending notification digests: {e}")
+            return 0
+
 
 # UI Functions for Notification Management
 def show_notifications_page(
@@ -938,6 +1443,12 @@ def show_notifications_page(
 
     # Get user notifications stats
     user_id = user_data["UserID"]
+
+    # Events published by other sessions since the last rerun
+    for event in notification_manager.poll_realtime_notifications(user_id):
+        if event["event"] == "created":
+            st.toast(f"🔔 {event['notification'].get('title', '')}")
+
     stats = safe_execute(
         notification_manager.get_notification_statistics, user_id, default_return={}
     )
@@ -1042,7 +1553,9 @@ def show_notifications_list(notification_manager: NotificationManager, user_id:
 
             with col2:
                 # Notification content
-                st.markdown(f"**{notification['Title']}**")
+                count = notification.get("CoalescedCount") or 1
+                suffix = f" (+{count - 1} การอัปเดต)" if count > 1 else ""
+                st.markdown(f"**{notification['Title']}**{suffix}")
                 st.markdown(notification["Message"])
 
                 # Timestamp
@@ -1161,6 +1674,7 @@ def show_notification_settings(
                 notification_manager.db.execute_non_query(
                     query, (settings_json, user_data["UserID"])
                 )
+                notification_manager.preferences.invalidate(user_data["UserID"])
                 st.success("✅ บันทึกการตั้งค่าสำเร็จ")
                 st.rerun()
             except Exception as e:
@@ -1296,25 +1810,21 @@ def show_notification_management(
 
         if st.form_submit_button("📤 ส่งการแจ้งเตือน", type="primary"):
             if selected_users and title and message:
-                sent_count = 0
-                for user_name in selected_users:
-                    user_id = user_options[user_name]
-
-                    custom_data = {
-                        "title": title,
-                        "message": message,
-                        "user_name": user_name,
-                        "sent_by": f"{user_data['FirstName']} {user_data['LastName']}",
-                    }
-
-                    if notification_manager.create_notification(
-                        user_id,
-                        notification_type,
-                        custom_data,
-                        priority=priority,
-                        send_email=send_email,
-                    ):
-                        sent_count += 1
+                custom_data = {
+                    "title": title,
+                    "message": message,
+                    "sent_by": f"{user_data['FirstName']} {user_data['LastName']}",
+                }
+
+                # user_name is filled per recipient by the bulk path
+                created = notification_manager.create_bulk_notifications(
+                    [user_options[user_name] for user_name in selected_users],
+                    notification_type,
+                    custom_data,
+                    priority=priority,
+                    send_email=send_email,
+                )
+                sent_count = len(created)
 
                 st.success(f"✅ ส่งการแจ้งเตือนให้ {sent_count} คน")
             else:
@@ -1325,7 +1835,7 @@ def show_notification_management(
     # Cleanup tools
     st.markdown("### 🧹 เครื่องมือทำความสะอาด")
 
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
 
     with col1:
         if st.button("🗑️ ลบการแจ้งเตือนเก่า (30 วัน)"):
@@ -1342,6 +1852,12 @@ def show_notification_management(
             sent_count = notification_manager.trigger_overdue_reminders()
             st.success(f"ส่งการแจ้งเตือนเลยกำหนด {sent_count} รายการ")
 
+    with col4:
+        if st.button("📬 ส่งอีเมลสรุปการแจ้งเตือน"):
+            # Manual run sends every waiting digest, however recent
+            digest_count = notification_manager.send_digest_emails(min_age_minutes=0)
+            st.success(f"ส่งอีเมลสรุป {digest_count} ฉบับ")
+
 
 def _format_time_ago(timestamp: datetime) -> str:
     """Format timestamp to human-readable time ago"""
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+modules/project_health.py
+SDX Project Manager - Vectorized Project Health Scoring
+Batch health, planned-vs-actual progress and schedule scoring over columnar project frames
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Canonical column names used by ProjectManager queries
+DEFAULT_COLUMNS = {
+    "start_date": "StartDate",
+    "end_date": "EndDate",
+    "completion": "CompletionPercentage",
+    "task_count": "TaskCount",
+    "completed_tasks": "CompletedTasks",
+    "budget": "Budget",
+    "budget_spent": "BudgetSpent",
+}
+
+# Column names produced by the scorer
+SCORE_COLUMNS = [
+    "PlannedProgress",
+    "HealthScore",
+    "DaysRemaining",
+    "ProgressStatus",
+    "ScheduleVariance",
+]
+
+
+class ProjectHealthScorer:
+    """Scores whole sets of projects in one vectorized pass
+
+    Mirrors the row-wise rules of ProjectManager._calculate_health_score,
+    _calculate_planned_progress, _calculate_days_remaining and
+    _calculate_progress_status, so list pages, the health matrix and reports
+    all agree on the numbers.
+    """
+
+    # Health score weights (sum to 100)
+    PROGRESS_WEIGHT = 0.4
+    TASK_WEIGHT = 0.3
+    SCHEDULE_POINTS = 20.0
+    BUDGET_POINTS = 10.0
+    DEFAULT_SCORE = 50.0
+
+    def __init__(self, columns: Optional[Dict[str, str]] = None):
+        self.columns = {**DEFAULT_COLUMNS, **(columns or {})}
+
+    def score_frame(
+        self,
+        df: pd.DataFrame,
+        today: Optional[Union[date, datetime]] = None,
+        columns: Optional[Dict[str, str]] = None,
+    ) -> pd.DataFrame:
+        """Return a copy of ``df`` with health and schedule columns appended"""
+        cols = {**self.columns, **(columns or {})}
+        result = df.copy()
+
+        if result.empty:
+            for name in SCORE_COLUMNS:
+                result[name] = pd.Series(dtype="object")
+            return result
+
+        today_ts = pd.Timestamp(today or date.today()).normalize()
+
+        start = self._date_column(result, cols["start_date"])
+        end = self._date_column(result, cols["end_date"])
+        completion = self._numeric_column(result, cols["completion"])
+        task_count = self._numeric_column(result, cols["task_count"])
+        completed_tasks = self._numeric_column(result, cols["completed_tasks"])
+
+        start_days = start.to_numpy(dtype="datetime64[D]")
+        end_days = end.to_numpy(dtype="datetime64[D]")
+        today_day = today_ts.to_datetime64().astype("datetime64[D]")
+        valid_start = ~np.isnat(start_days)
+        valid_end = ~np.isnat(end_days)
+        valid_range = valid_start & valid_end
+
+        total_days = np.where(
+            valid_range, (end_days - start_days).astype("int64"), 0
+        ).astype(float)
+        elapsed_days = np.where(
+            valid_start, (today_day - start_days).astype("int64"), 0
+        ).astype(float)
+        days_remaining = np.where(
+            valid_end, (end_days - today_day).astype("int64"), 0
+        ).astype("int64")
+
+        # Planned progress: 0 before start, 100 after end, linear in between
+        with np.errstate(divide="ignore", invalid="ignore"):
+            linear = np.where(total_days > 0, elapsed_days / total_days * 100, 0.0)
+        planned = np.select(
+            [~valid_range, elapsed_days <= 0, days_remaining <= 0],
+            [0.0, 0.0, 100.0],
+            default=linear,
+        )
+
+        # Progress vs timeline (40%)
+        progress_score = np.where(
+            planned > 0,
+            np.minimum(100.0, completion / np.maximum(planned, 1.0) * 100),
+            0.0,
+        )
+
+        # Task completion rate (30%)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            task_score = np.where(
+                task_count > 0, completed_tasks / task_count * 100, 0.0
+            )
+
+        # Schedule adherence (20%)
+        schedule_points = np.where(days_remaining >= 0, self.SCHEDULE_POINTS, 0.0)
+
+        # Budget (10%) - healthy unless a spent figure shows an overrun
+        budget_points = np.full(len(result), self.BUDGET_POINTS)
+        if cols["budget_spent"] in result.columns and cols["budget"] in result.columns:
+            budget = self._numeric_column(result, cols["budget"])
+            spent = self._numeric_column(result, cols["budget_spent"])
+            budget_points = np.where(
+                (budget > 0) & (spent > budget), 0.0, self.BUDGET_POINTS
+            )
+
+        health = np.clip(
+            progress_score * self.PROGRESS_WEIGHT
+            + task_score * self.TASK_WEIGHT
+            + schedule_points
+            + budget_points,
+            0.0,
+            100.0,
+        )
+        health = np.where(valid_end, health, self.DEFAULT_SCORE)
+
+        progress_status = np.select(
+            [
+                ~valid_end,
+                completion >= 100,
+                days_remaining < 0,
+                completion >= 75,
+                completion >= 50,
+            ],
+            ["Unknown", "Completed", "Overdue", "On Track", "At Risk"],
+            default="Behind Schedule",
+        )
+
+        schedule_variance = np.where(
+            valid_range, (completion - planned) * total_days / 100, 0.0
+        ).astype("int64")
+
+        result["PlannedProgress"] = planned
+        result["HealthScore"] = np.round(health, 1)
+        result["DaysRemaining"] = days_remaining
+        result["ProgressStatus"] = progress_status
+        result["ScheduleVariance"] = schedule_variance
+
+        return result
+
+    def score_projects(
+        self,
+        projects: List[Dict[str, Any]],
+        today: Optional[Union[date, datetime]] = None,
+        columns: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Score a list of project rows and return them with score keys added"""
+        if not projects:
+            return []
+
+        try:
+            scored = self.score_frame(pd.DataFrame(projects), today, columns)
+            scores = scored[SCORE_COLUMNS].to_dict("records")
+            return [{**project, **score} for project, score in zip(projects, scores)]
+
+        except Exception as e:
+            logger.error(f"Failed to score projects: {str(e)}")
+            return [dict(project) for project in projects]
+
+    def summarize(self, scored: pd.DataFrame) -> Dict[str, Any]:
+        """Portfolio level roll-up of an already scored frame"""
+        if scored.empty:
+            return {
+                "project_count": 0,
+                "avg_health_score": 0.0,
+                "overdue_projects": 0,
+                "at_risk_projects": 0,
+                "status_counts": {},
+            }
+
+        status_counts = scored["ProgressStatus"].value_counts()
+        return {
+            "project_count": int(len(scored)),
+            "avg_health_score": float(scored["HealthScore"].mean()),
+            "overdue_projects": int(status_counts.get("Overdue", 0)),
+            "at_risk_projects": int((scored["HealthScore"] < 70).sum()),
+            "status_counts": {k: int(v) for k, v in status_counts.items()},
+        }
+
+    @staticmethod
+    def _date_column(df: pd.DataFrame, name: str) -> pd.Series:
+        """Parse a date column once for the whole frame"""
+        if name not in df.columns:
+            return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+        return pd.to_datetime(df[name], errors="coerce").dt.normalize()
+
+    @staticmethod
+    def _numeric_column(df: pd.DataFrame, name: str) -> np.ndarray:
+        """Numeric column as float array with missing values as zero"""
+        if name not in df.columns:
+            return np.zeros(len(df))
+        return pd.to_numeric(df[name], errors="coerce").fillna(0).to_numpy(float)
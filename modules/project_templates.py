@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""
+modules/project_templates.py
+SDX Project Manager - Project Template Instantiation Engine
+Expands ProjectTemplates into projects, task trees, dependencies, milestones and teams in one transaction
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from modules.activity_store import ActivityStore
+from modules.dependency_store import VALID_DEPENDENCY_TYPES
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Compiled Template Structures
+# =============================================================================
+
+
+@dataclass
+class TemplateMilestone:
+    """Milestone definition relative to the project start"""
+
+    key: str
+    name: str
+    description: str = ""
+    offset_days: int = 0
+    budget_allocation: float = 0.0
+
+
+@dataclass
+class TemplateTask:
+    """Task definition relative to the project start"""
+
+    key: str
+    title: str
+    code_suffix: str
+    description: str = ""
+    offset_days: int = 0
+    duration_days: int = 1
+    estimated_hours: float = 0.0
+    priority: str = "Medium"
+    task_type: str = "Task"
+    role: Optional[str] = None
+    milestone: Optional[str] = None
+    parent: Optional[str] = None
+    depends_on: List[Tuple[str, str, int]] = field(default_factory=list)
+
+
+@dataclass
+class CompiledTemplate:
+    """Validated template ready for repeated instantiation"""
+
+    template_id: int
+    name: str
+    project_type: Optional[str]
+    default_duration: int
+    milestones: List[TemplateMilestone]
+    task_levels: List[List[TemplateTask]]
+    team_roles: List[Tuple[str, float]]
+
+    @property
+    def task_count(self) -> int:
+        return sum(len(level) for level in self.task_levels)
+
+
+# =============================================================================
+# Template Engine
+# =============================================================================
+
+
+class ProjectTemplateEngine:
+    """Instantiates project templates with multi-row inserts
+
+    A template is parsed and validated once and cached. Each instantiation
+    writes every table with a handful of multi-row INSERT statements inside a
+    single transaction, so the statement count depends on the depth of the
+    task tree rather than on the number of tasks.
+
+    TemplateData format::
+
+        {
+            "phases": ["Planning", ...],          # legacy, become milestones
+            "milestones": [{"key", "name", "offset_days", ...}],
+            "tasks": [{"key", "title", "offset_days", "duration_days",
+                       "estimated_hours", "priority", "type", "role",
+                       "milestone", "parent", "depends_on"}],
+            "team": [{"role", "allocation"}]
+        }
+
+    ``depends_on`` entries are task keys or ``{"key", "type", "lag_days"}``.
+    """
+
+    DEFAULT_DEPENDENCY_TYPE = "finish_to_start"
+    PROJECT_MANAGER_ROLE = "Project Manager"
+
+    def __init__(self, db_manager, activity_store: Optional[ActivityStore] = None):
+        self.db = db_manager
+        self.activity_store = activity_store or ActivityStore(db_manager, "project")
+        self._compiled: Dict[int, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+
+    # =============================================================================
+    # Template Loading
+    # =============================================================================
+
+    def get_templates(self, active_only: bool = True) -> List[Dict[str, Any]]:
+        """List available project templates"""
+        try:
+            query = """
+                SELECT TemplateID, TemplateName, Description, ProjectType,
+                       DefaultDuration, IsActive, CreatedDate
+                FROM ProjectTemplates
+            """
+            if active_only:
+                query += " WHERE IsActive = 1"
+            query += " ORDER BY TemplateName"
+
+            return self.db.fetch_all(query)
+
+        except Exception as e:
+            logger.error(f"Failed to get project templates: {str(e)}")
+            return []
+
+    def get_template(self, template_id: int) -> CompiledTemplate:
+        """Load and compile a template, using the cache when possible"""
+        with self._lock:
+            cached = self._compiled.get(template_id)
+        if cached:
+            return cached
+
+        row = self.db.fetch_one(
+            """
+            SELECT TemplateID, TemplateName, ProjectType, DefaultDuration, TemplateData
+            FROM ProjectTemplates
+            WHERE TemplateID = ? AND IsActive = 1
+            """,
+            [template_id],
+        )
+        if not row:
+            raise ValueError(f"Project template not found: {template_id}")
+
+        compiled = self.compile_template(
+            row["TemplateID"],
+            row["TemplateName"],
+            row.get("ProjectType"),
+            row.get("DefaultDuration") or 30,
+            row.get("TemplateData"),
+        )
+
+        with self._lock:
+            self._compiled[template_id] = compiled
+        return compiled
+
+    def invalidate(self, template_id: Optional[int] = None):
+        """Drop cached templates after they are edited"""
+        with self._lock:
+            if template_id is None:
+                self._compiled.clear()
+            else:
+                self._compiled.pop(template_id, None)
+
+    @classmethod
+    def compile_template(
+        cls,
+        template_id: int,
+        name: str,
+        project_type: Optional[str],
+        default_duration: int,
+        template_data: Union[str, Dict[str, Any], None],
+    ) -> CompiledTemplate:
+        """Parse TemplateData and validate keys, references and cycles"""
+        if isinstance(template_data, str):
+            data = json.loads(template_data) if template_data.strip() else {}
+        else:
+            data = template_data or {}
+
+        default_duration = int(default_duration or 30)
+
+        # Milestones, including legacy phase lists spread over the duration
+        milestones = []
+        phases = data.get("phases", [])
+        for i, phase in enumerate(phases):
+            milestones.append(
+                TemplateMilestone(
+                    key=str(phase),
+                    name=str(phase),
+                    offset_days=round(default_duration * (i + 1) / len(phases)),
+                )
+            )
+        for m in data.get("milestones", []):
+            milestones.append(
+                TemplateMilestone(
+                    key=str(m.get("key", m["name"])),
+                    name=m["name"],
+                    description=m.get("description", ""),
+                    offset_days=int(m.get("offset_days", default_duration)),
+                    budget_allocation=float(m.get("budget_allocation", 0)),
+                )
+            )
+
+        milestone_keys = [m.key for m in milestones]
+        cls._check_unique(milestone_keys, "milestone key")
+        # Milestone IDs are remapped by (ProjectID, Name)
+        cls._check_unique([m.name for m in milestones], "milestone name")
+
+        # Tasks
+        tasks = []
+        for i, t in enumerate(data.get("tasks", [])):
+            depends_on = []
+            for dep in t.get("depends_on", []):
+                if isinstance(dep, dict):
+                    depends_on.append(
+                        (
+                            str(dep["key"]),
+                            dep.get("type", cls.DEFAULT_DEPENDENCY_TYPE),
+                            int(dep.get("lag_days", 0)),
+                        )
+                    )
+                else:
+                    depends_on.append((str(dep), cls.DEFAULT_DEPENDENCY_TYPE, 0))
+
+            tasks.append(
+                TemplateTask(
+                    key=str(t.get("key", i + 1)),
+                    title=t["title"],
+                    code_suffix=f"T{i + 1:04d}",
+                    description=t.get("description", ""),
+                    offset_days=int(t.get("offset_days", 0)),
+                    duration_days=max(1, int(t.get("duration_days", 1))),
+                    estimated_hours=float(t.get("estimated_hours", 0)),
+                    priority=t.get("priority", "Medium"),
+                    task_type=t.get("type", "Task"),
+                    role=t.get("role"),
+                    milestone=t.get("milestone"),
+                    parent=str(t["parent"]) if t.get("parent") is not None else None,
+                    depends_on=depends_on,
+                )
+            )
+
+        task_keys = {t.key for t in tasks}
+        cls._check_unique([t.key for t in tasks], "task key")
+
+        for task in tasks:
+            if task.milestone is not None and task.milestone not in milestone_keys:
+                raise ValueError(
+                    f"Task '{task.key}' references unknown milestone '{task.milestone}'"
+                )
+            if task.parent is not None and task.parent not in task_keys:
+                raise ValueError(
+                    f"Task '{task.key}' references unknown parent '{task.parent}'"
+                )
+            for dep_key, dep_type, _ in task.depends_on:
+                if dep_key not in task_keys:
+                    raise ValueError(
+                        f"Task '{task.key}' depends on unknown task '{dep_key}'"
+                    )
+                if dep_type not in VALID_DEPENDENCY_TYPES:
+                    raise ValueError(
+                        f"Task '{task.key}' has unknown dependency type '{dep_type}'"
+                    )
+            # One edge per task pair (UX_TaskDependencies_Successor)
+            cls._check_unique(
+                [dep_key for dep_key, _, _ in task.depends_on],
+                f"dependency of task '{task.key}'",
+            )
+
+        cls._check_acyclic(tasks)
+        task_levels = cls._group_by_depth(tasks)
+
+        team_roles = [
+            (r["role"], float(r.get("allocation", 100)))
+            for r in data.get("team", [])
+        ]
+
+        return CompiledTemplate(
+            template_id=template_id,
+            name=name,
+            project_type=project_type,
+            default_duration=default_duration,
+            milestones=milestones,
+            task_levels=task_levels,
+            team_roles=team_roles,
+        )
+
+    @staticmethod
+    def _check_unique(keys: List[str], label: str):
+        """Reject duplicate keys in a template"""
+        seen = set()
+        for key in keys:
+            if key in seen:
+                raise ValueError(f"Duplicate {label} in template: {key}")
+            seen.add(key)
+
+    @staticmethod
+    def _check_acyclic(tasks: List[TemplateTask]):
+        """Kahn's algorithm over the template dependency graph"""
+        indegree = {t.key: 0 for t in tasks}
+        successors = defaultdict(list)
+        for task in tasks:
+            for dep_key, _, _ in task.depends_on:
+                successors[dep_key].append(task.key)
+                indegree[task.key] += 1
+
+        queue = deque(key for key, degree in indegree.items() if degree == 0)
+        visited = 0
+        while queue:
+            key = queue.popleft()
+            visited += 1
+            for succ in successors[key]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    queue.append(succ)
+
+        if visited != len(tasks):
+            raise ValueError("Template task dependencies contain a cycle")
+
+    @staticmethod
+    def _group_by_depth(tasks: List[TemplateTask]) -> List[List[TemplateTask]]:
+        """Group tasks by sub-task depth so parents are inserted first"""
+        by_key = {t.key: t for t in tasks}
+        depth: Dict[str, int] = {}
+
+        for task in tasks:
+            chain = []
+            current = task
+            while current.key not in depth:
+                if current.key in chain:
+                    raise ValueError("Template sub-task hierarchy contains a cycle")
+                chain.append(current.key)
+                if current.parent is None:
+                    depth[current.key] = 0
+                    chain.pop()
+                    break
+                current = by_key[current.parent]
+            for key in reversed(chain):
+                depth[key] = depth[by_key[key].parent] + 1
+
+        levels: Dict[int, List[TemplateTask]] = defaultdict(list)
+        for task in tasks:
+            levels[depth[task.key]].append(task)
+        return [levels[d] for d in sorted(levels)]
+
+    # =============================================================================
+    # Instantiation
+    # =============================================================================
+
+    def instantiate(
+        self,
+        template_id: int,
+        project_data: Dict[str, Any],
+        created_by: int,
+    ) -> Dict[str, Any]:
+        """Create a single project from a template"""
+        return self.instantiate_many(template_id, [project_data], created_by)[0]
+
+    def instantiate_many(
+        self,
+        template_id: int,
+        projects: List[Dict[str, Any]],
+        created_by: int,
+    ) -> List[Dict[str, Any]]:
+        """Create several projects from one template in a single transaction
+
+        Each project dict needs Name, StartDate and ProjectManager and may
+        carry Description, EndDate, Priority, Category, Budget, RiskLevel,
+        ProjectCode and TeamAssignments (role -> UserID).
+        """
+        if not projects:
+            return []
+
+        template = self.get_template(template_id)
+        started = time.perf_counter()
+        now = datetime.now()
+
+        for project in projects:
+            for field_name in ("Name", "StartDate", "ProjectManager"):
+                if not project.get(field_name):
+                    raise ValueError(f"Required field missing: {field_name}")
+
+        try:
+            with self.db.transaction() as cursor:
+                project_rows = self._build_project_rows(
+                    cursor, template, projects, created_by, now
+                )
+                inserted = self.db.insert_rows(
+                    cursor,
+                    "Projects",
+                    [
+                        "ProjectCode", "Name", "Description", "StartDate",
+                        "EndDate", "Status", "Priority", "Type", "Category",
+                        "Budget", "RiskLevel", "ProjectManager", "TemplateID",
+                        "CreatedBy", "CreatedAt", "UpdatedAt",
+                    ],
+                    [row for row, _ in project_rows],
+                    output_columns=["ProjectID", "ProjectCode"],
+                )
+                project_ids = {code: pid for pid, code in inserted}
+
+                results = []
+                for row, start in project_rows:
+                    results.append(
+                        {
+                            "ProjectID": project_ids[row[0]],
+                            "ProjectCode": row[0],
+                            "Name": row[1],
+                            "StartDate": start,
+                            "MilestoneIDs": {},
+                            "TaskIDs": {},
+                        }
+                    )
+
+                self._insert_milestones(cursor, template, results, created_by, now)
+                self._insert_tasks(cursor, template, projects, results, created_by, now)
+                self._insert_dependencies(cursor, template, results, created_by, now)
+                self._insert_team(cursor, template, projects, results, created_by, now)
+                self.activity_store.append_many(
+                    cursor,
+                    [
+                        (
+                            r["ProjectID"],
+                            created_by,
+                            "PROJECT_CREATED",
+                            f"Project '{r['Name']}' created from template '{template.name}'",
+                            now,
+                        )
+                        for r in results
+                    ],
+                )
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                f"Instantiated template {template_id} into {len(results)} project(s) "
+                f"with {template.task_count * len(results)} tasks in {elapsed_ms:.0f} ms"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to instantiate project template: {str(e)}")
+            raise
+
+    def _build_project_rows(
+        self,
+        cursor,
+        template: CompiledTemplate,
+        projects: List[Dict[str, Any]],
+        created_by: int,
+        now: datetime,
+    ) -> List[Tuple[tuple, date]]:
+        """Project rows with codes allocated per prefix in one query each
+
+        Numbering continues from the highest existing suffix, so codes freed
+        by deleted projects are never handed out twice.
+        """
+        next_numbers: Dict[str, int] = {}
+        rows = []
+
+        for project in projects:
+            start = self._as_date(project["StartDate"])
+            end = (
+                self._as_date(project["EndDate"])
+                if project.get("EndDate")
+                else start + timedelta(days=self._template_span(template))
+            )
+            project_type = project.get("Type") or template.project_type or "Development"
+            category = project.get("Category", "Development")
+
+            code = project.get("ProjectCode")
+            if not code:
+                prefix = f"{category[:3].upper()}-{project_type[:3].upper()}-{now.year}"
+                if prefix not in next_numbers:
+                    cursor.execute(
+                        "SELECT ProjectCode FROM Projects WHERE ProjectCode LIKE ?",
+                        [f"{prefix}-%"],
+                    )
+                    suffixes = [
+                        row[0][len(prefix) + 1 :] for row in cursor.fetchall()
+                    ]
+                    next_numbers[prefix] = (
+                        max((int(sfx) for sfx in suffixes if sfx.isdigit()), default=0)
+                        + 1
+                    )
+                code = f"{prefix}-{next_numbers[prefix]:03d}"
+                next_numbers[prefix] += 1
+
+            rows.append(
+                (
+                    (
+                        code,
+                        project["Name"],
+                        project.get("Description", ""),
+                        start,
+                        end,
+                        project.get("Status", "Planning"),
+                        project.get("Priority", "Medium"),
+                        project_type,
+                        category,
+                        project.get("Budget", 0),
+                        project.get("RiskLevel", "Medium"),
+                        project["ProjectManager"],
+                        template.template_id,
+                        created_by,
+                        now,
+                        now,
+                    ),
+                    start,
+                )
+            )
+
+        return rows
+
+    def _insert_milestones(
+        self,
+        cursor,
+        template: CompiledTemplate,
+        results: List[Dict[str, Any]],
+        created_by: int,
+        now: datetime,
+    ):
+        """Insert all milestones and remap their IDs by (ProjectID, Name)"""
+        rows = [
+            (
+                r["ProjectID"],
+                m.name,
+                m.description,
+                r["StartDate"] + timedelta(days=m.offset_days),
+                "Pending",
+                m.budget_allocation,
+                created_by,
+                now,
+            )
+            for r in results
+            for m in template.milestones
+        ]
+        inserted = self.db.insert_rows(
+            cursor,
+            "ProjectMilestones",
+            [
+                "ProjectID", "Name", "Description", "DueDate", "Status",
+                "BudgetAllocation", "CreatedBy", "CreatedAt",
+            ],
+            rows,
+            output_columns=["MilestoneID", "ProjectID", "Name"],
+        )
+
+        ids = {(project_id, name): mid for mid, project_id, name in inserted}
+        for r in results:
+            r["MilestoneIDs"] = {
+                m.key: ids[(r["ProjectID"], m.name)] for m in template.milestones
+            }
+
+    def _insert_tasks(
+        self,
+        cursor,
+        template: CompiledTemplate,
+        projects: List[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+        created_by: int,
+        now: datetime,
+    ):
+        """Insert tasks one tree level at a time and remap IDs by TaskCode"""
+        columns = [
+            "TaskCode", "Title", "Description", "ProjectID", "ParentTaskID",
+            "AssignedTo", "Status", "Priority", "Type", "EstimatedHours",
+            "StartDate", "DueDate", "MilestoneID", "CompletionPercentage",
+            "CreatedBy", "CreatedAt", "UpdatedAt",
+        ]
+
+        for level in template.task_levels:
+            rows = []
+            for project, r in zip(projects, results):
+                assignments = project.get("TeamAssignments", {})
+                code_prefix = r["ProjectCode"][:8]
+                for task in level:
+                    start = r["StartDate"] + timedelta(days=task.offset_days)
+                    rows.append(
+                        (
+                            f"{code_prefix}-{task.code_suffix}",
+                            task.title,
+                            task.description,
+                            r["ProjectID"],
+                            r["TaskIDs"].get(task.parent) if task.parent else None,
+                            assignments.get(task.role) if task.role else None,
+                            "To Do",
+                            task.priority,
+                            task.task_type,
+                            task.estimated_hours,
+                            start,
+                            start + timedelta(days=task.duration_days),
+                            r["MilestoneIDs"].get(task.milestone)
+                            if task.milestone
+                            else None,
+                            0,
+                            created_by,
+                            now,
+                            now,
+                        )
+                    )
+
+            inserted = self.db.insert_rows(
+                cursor,
+                "Tasks",
+                columns,
+                rows,
+                output_columns=["TaskID", "ProjectID", "TaskCode"],
+            )
+
+            ids = {(project_id, code): tid for tid, project_id, code in inserted}
+            for r in results:
+                code_prefix = r["ProjectCode"][:8]
+                for task in level:
+                    r["TaskIDs"][task.key] = ids[
+                        (r["ProjectID"], f"{code_prefix}-{task.code_suffix}")
+                    ]
+
+    def _insert_dependencies(
+        self,
+        cursor,
+        template: CompiledTemplate,
+        results: List[Dict[str, Any]],
+        created_by: int,
+        now: datetime,
+    ):
+        """Insert every dependency edge using the remapped task IDs"""
+        rows = [
+            (
+                r["TaskIDs"][task.key],
+                r["TaskIDs"][dep_key],
+                dep_type,
+                lag_days,
+                created_by,
+                now,
+            )
+            for r in results
+            for level in template.task_levels
+            for task in level
+            for dep_key, dep_type, lag_days in task.depends_on
+        ]
+        self.db.insert_rows(
+            cursor,
+            "TaskDependencies",
+            ["TaskID", "DependsOnTaskID", "DependencyType", "LagDays", "CreatedBy", "CreatedAt"],
+            rows,
+        )
+
+    def _insert_team(
+        self,
+        cursor,
+        template: CompiledTemplate,
+        projects: List[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+        created_by: int,
+        now: datetime,
+    ):
+        """Insert the project manager and role assignments as team members"""
+        rows = []
+        for project, r in zip(projects, results):
+            members = {project["ProjectManager"]: (self.PROJECT_MANAGER_ROLE, 100.0)}
+            assignments = project.get("TeamAssignments", {})
+            for role, allocation in template.team_roles:
+                user_id = assignments.get(role)
+                if user_id and user_id not in members:
+                    members[user_id] = (role, allocation)
+
+            for user_id, (role, allocation) in members.items():
+                rows.append(
+                    (r["ProjectID"], user_id, role, allocation, "Active", created_by, now)
+                )
+
+        self.db.insert_rows(
+            cursor,
+            "ProjectTeamMembers",
+            ["ProjectID", "UserID", "Role", "AllocationPercentage", "Status", "AddedBy", "AddedAt"],
+            rows,
+        )
+
+    # =============================================================================
+    # Helpers
+    # =============================================================================
+
+    @staticmethod
+    def _template_span(template: CompiledTemplate) -> int:
+        """Project length implied by the template"""
+        span = template.default_duration
+        for m in template.milestones:
+            span = max(span, m.offset_days)
+        for level in template.task_levels:
+            for task in level:
+                span = max(span, task.offset_days + task.duration_days)
+        return span
+
+    @staticmethod
+    def _as_date(value: Union[str, date, datetime]) -> date:
+        """Normalize a date-like input"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return datetime.fromisoformat(str(value)).date()
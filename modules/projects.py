@@ -14,6 +14,12 @@ import json
 import re
 from decimal import Decimal
 
+from modules.activity_store import get_activity_store
+from modules.cost_ledger import CostLedger, backfill_cost_ledger
+from modules.milestone_progress import get_milestone_progress_service
+from modules.project_health import ProjectHealthScorer
+from modules.project_templates import ProjectTemplateEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -151,6 +157,12 @@ class ProjectManager:
 
     def __init__(self, db_manager):
         self.db = db_manager
+        self.health_scorer = ProjectHealthScorer()
+        self.activity_store = get_activity_store(db_manager, "project")
+        self.template_engine = ProjectTemplateEngine(db_manager, self.activity_store)
+        self.cost_ledger = CostLedger(db_manager)
+        backfill_cost_ledger(db_manager)
+        self.milestone_progress = get_milestone_progress_service(db_manager)
 
     # =============================================================================
     # Core Project CRUD Operations
@@ -245,6 +257,22 @@ class ProjectManager:
             logger.error(f"Failed to create project: {str(e)}")
             raise
 
+    def create_projects_from_template(
+        self,
+        template_id: int,
+        projects: List[Dict[str, Any]],
+        created_by: int,
+    ) -> List[Dict[str, Any]]:
+        """Create projects with their task tree, milestones and team from a template"""
+        try:
+            return self.template_engine.instantiate_many(
+                template_id, projects, created_by
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to create projects from template: {str(e)}")
+            raise
+
     def get_project_by_id(
         self, project_id: int, include_metrics: bool = True
     ) -> Optional[Dict[str, Any]]:
@@ -447,19 +475,11 @@ class ProjectManager:
             params.extend([offset, page_size])
             projects = self.db.fetch_all(query, params)
 
-            # Calculate additional metrics for each project
-            for project in projects:
-                project_dict = dict(project)
-                project_dict["ProgressStatus"] = self._calculate_progress_status(
-                    project_dict
-                )
-                project_dict["HealthScore"] = self._calculate_health_score(project_dict)
-                project_dict["DaysRemaining"] = self._calculate_days_remaining(
-                    project_dict["EndDate"]
-                )
+            # Score the whole page in one vectorized pass
+            scored_projects = self.score_projects([dict(p) for p in projects])
 
             return {
-                "projects": [dict(p) for p in projects],
+                "projects": scored_projects,
                 "total_count": total_count,
                 "page": page,
                 "page_size": page_size,
@@ -476,6 +496,13 @@ class ProjectManager:
                 "total_pages": 0,
             }
 
+    def score_projects(
+        self, projects: List[Dict[str, Any]], columns: Dict[str, str] = None
+    ) -> List[Dict[str, Any]]:
+        """Add HealthScore, PlannedProgress, DaysRemaining, ProgressStatus and
+        ScheduleVariance to a batch of project rows"""
+        return self.health_scorer.score_projects(projects, columns=columns)
+
     # =============================================================================
     # Project Metrics and Analytics
     # =============================================================================
@@ -490,15 +517,8 @@ class ProjectManager:
             if project:
                 metrics.budget_allocated = Decimal(str(project.get("Budget", 0)))
 
-                # Calculate spent budget from time tracking and expenses
-                spent_query = """
-                    SELECT COALESCE(SUM(Hours * HourlyRate), 0) as TotalSpent
-                    FROM TimeTracking tt
-                    JOIN Users u ON tt.UserID = u.UserID
-                    WHERE tt.ProjectID = ?
-                """
-                spent_result = self.db.fetch_one(spent_query, [project_id])
-                metrics.budget_spent = Decimal(str(spent_result.get("TotalSpent", 0)))
+                # Spent budget from the cost ledger's monthly totals
+                metrics.budget_spent = self.cost_ledger.get_project_spent(project_id)
                 metrics.budget_remaining = (
                     metrics.budget_allocated - metrics.budget_spent
                 )
@@ -706,36 +726,31 @@ class ProjectManager:
 
     def get_project_milestones(self, project_id: int) -> List[Dict[str, Any]]:
         """Get project milestones with progress tracking"""
-        try:
-            query = """
-                SELECT pm.*, 
-                       u.FirstName + ' ' + u.LastName as CreatedByName,
-                       (SELECT COUNT(*) FROM Tasks WHERE MilestoneID = pm.MilestoneID) as TaskCount,
-                       (SELECT COUNT(*) FROM Tasks WHERE MilestoneID = pm.MilestoneID AND Status = 'Completed') as CompletedTasks
-                FROM ProjectMilestones pm
-                LEFT JOIN Users u ON pm.CreatedBy = u.UserID
-                WHERE pm.ProjectID = ?
-                ORDER BY pm.DueDate, pm.Name
-            """
+        return self.get_milestones_for_projects([project_id]).get(project_id, [])
 
-            milestones = self.db.fetch_all(query, [project_id])
+    def get_milestones_for_projects(
+        self, project_ids: List[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Get milestones with progress for many projects in one round trip"""
+        try:
+            milestones_by_project = self.milestone_progress.get_milestones(project_ids)
 
             # Add calculated fields
-            for milestone in milestones:
-                milestone_dict = dict(milestone)
-                milestone_dict["ProgressPercentage"] = (
-                    self._calculate_milestone_progress(milestone_dict)
-                )
-                milestone_dict["IsOverdue"] = self._is_milestone_overdue(milestone_dict)
-                milestone_dict["DaysRemaining"] = self._calculate_days_remaining(
-                    milestone_dict["DueDate"]
-                )
+            for milestones in milestones_by_project.values():
+                for milestone in milestones:
+                    milestone["ProgressPercentage"] = (
+                        self._calculate_milestone_progress(milestone)
+                    )
+                    milestone["IsOverdue"] = self._is_milestone_overdue(milestone)
+                    milestone["DaysRemaining"] = self._calculate_days_remaining(
+                        milestone["DueDate"]
+                    )
 
-            return [dict(m) for m in milestones]
+            return milestones_by_project
 
         except Exception as e:
-            logger.error(f"Failed to get milestones for project {project_id}: {str(e)}")
-            return []
+            logger.error(f"Failed to get milestones for projects {project_ids}: {str(e)}")
+            return {}
 
     def create_milestone(self, milestone_data: Dict[str, Any], created_by: int) -> int:
         """Create project milestone"""
@@ -758,6 +773,7 @@ class ProjectManager:
             ]
 
             milestone_id = self.db.execute_query(query, params, return_id=True)
+            self.milestone_progress.invalidate(milestone_data["ProjectID"])
 
             # Log activity
             self._log_project_activity(
@@ -887,14 +903,8 @@ class ProjectManager:
                 row["RiskLevel"]: row["Count"] for row in self.db.fetch_all(risk_query)
             }
 
-            # Recent activity
-            activity_query = """
-                SELECT TOP 10 * FROM ProjectActivity 
-                ORDER BY ActivityDate DESC
-            """
-            overview["recent_activity"] = [
-                dict(row) for row in self.db.fetch_all(activity_query)
-            ]
+            # Recent activity (hot partition only)
+            overview["recent_activity"] = self.activity_store.recent(limit=10)
 
             return overview
 
@@ -1031,14 +1041,8 @@ class ProjectManager:
     ):
         """Log project activity for audit trail"""
         try:
-            query = """
-                INSERT INTO ProjectActivity 
-                (ProjectID, UserID, ActivityType, Description, ActivityDate)
-                VALUES (?, ?, ?, ?, ?)
-            """
-
-            self.db.execute_query(
-                query, [project_id, user_id, activity_type, description, datetime.now()]
+            self.activity_store.append(
+                project_id, user_id, activity_type, description, datetime.now()
             )
 
         except Exception as e:
@@ -1188,21 +1192,11 @@ class ProjectManager:
             return False
 
     def get_project_activity(
-        self, project_id: int, limit: int = 50
+        self, project_id: int, limit: int = 50, include_history: bool = False
     ) -> List[Dict[str, Any]]:
         """Get project activity log"""
         try:
-            query = """
-                SELECT pa.*, u.FirstName + ' ' + u.LastName as UserName
-                FROM ProjectActivity pa
-                LEFT JOIN Users u ON pa.UserID = u.UserID
-                WHERE pa.ProjectID = ?
-                ORDER BY pa.ActivityDate DESC
-                OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY
-            """
-
-            activities = self.db.fetch_all(query, [project_id, limit])
-            return [dict(activity) for activity in activities]
+            return self.activity_store.recent(project_id, limit, include_history)
 
         except Exception as e:
             logger.error(f"Failed to get project activity: {str(e)}")
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+modules/rescheduler.py
+SDX Project Manager - Incremental Rescheduler
+Propagates a task date change through its downstream dependents and updates float without a full CPM rerun
+"""
+
+import heapq
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional, Sequence, Set
+
+import numpy as np
+
+from modules.critical_path import (
+    CriticalPathEngine,
+    FINISH_TO_START,
+    START_TO_START,
+    FINISH_TO_FINISH,
+    schedule_network,
+)
+from modules.schedule import ColumnarSchedule
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RescheduleResult:
+    """Tasks whose early/late dates or float changed after one edit"""
+
+    changed: List[Dict[str, Any]]
+    project_finish: Optional[date]
+    visited: int
+    full_backward_pass: bool = False
+    moved: Set[Any] = field(default_factory=set)
+
+
+class IncrementalRescheduler:
+    """CPM state that absorbs single-task edits incrementally
+
+    The initial schedule comes from one CriticalPathEngine run. An edit to a
+    task's start or duration re-evaluates only that task and the descendants
+    whose early dates actually move, in topological order (a heap keyed by
+    topological rank stops at the first unchanged node). Late dates are then
+    pulled back through the ancestors of the edited task the same way. Only
+    when the project finish itself moves do all late dates shift, which
+    falls back to one linear backward pass.
+    """
+
+    def __init__(
+        self,
+        durations: Sequence[int],
+        predecessors: Sequence[int],
+        successors: Sequence[int],
+        lags: Optional[Sequence[int]] = None,
+        dependency_types: Optional[Sequence[int]] = None,
+        earliest_start: Optional[Sequence[int]] = None,
+        ids: Optional[List[Any]] = None,
+        base_date: Optional[date] = None,
+    ):
+        n = len(durations)
+        pred = np.asarray(predecessors, dtype="int64")
+        succ = np.asarray(successors, dtype="int64")
+        m = len(pred)
+        lag = np.zeros(m, "int64") if lags is None else np.asarray(lags, "int64")
+        kind = (
+            np.zeros(m, "int64")
+            if dependency_types is None
+            else np.asarray(dependency_types, "int64")
+        )
+
+        result = CriticalPathEngine().compute(
+            durations, pred, succ, lag, kind, earliest_start, ids, base_date
+        )
+
+        self.ids = result.ids
+        self.base_date = base_date
+        self.position = {item_id: i for i, item_id in enumerate(self.ids)}
+        self.rank = [0] * n
+        for r, node in enumerate(result.order.tolist()):
+            self.rank[node] = r
+
+        # CSR indexes in both directions as plain lists for the inner loops
+        self.succ_off, self.succ_node, self.succ_lag, self.succ_kind = self._csr(
+            n, pred, succ, lag, kind
+        )
+        self.pred_off, self.pred_node, self.pred_lag, self.pred_kind = self._csr(
+            n, succ, pred, lag, kind
+        )
+
+        self.dur = np.asarray(durations, "int64").tolist()
+        self.earliest = (
+            [0] * n
+            if earliest_start is None
+            else np.asarray(earliest_start, "int64").tolist()
+        )
+        self.es = result.early_start.tolist()
+        self.ef = result.early_finish.tolist()
+        self.lf = result.late_finish.tolist()
+        self.free = result.free_float.tolist()
+        self.finish = max(self.ef) if n else 0
+
+    @classmethod
+    def from_schedule(cls, schedule: ColumnarSchedule) -> Optional["IncrementalRescheduler"]:
+        """Build from the task rows of a columnar schedule"""
+        network = schedule_network(schedule)
+        if network is None:
+            return None
+        return cls(**network)
+
+    @staticmethod
+    def _csr(n, source, target, lag, kind):
+        order = np.argsort(source, kind="stable")
+        counts = np.bincount(source, minlength=n) if len(source) else np.zeros(n, "int64")
+        offsets = np.zeros(n + 1, "int64")
+        np.cumsum(counts, out=offsets[1:])
+        return (
+            offsets.tolist(),
+            target[order].tolist(),
+            lag[order].tolist(),
+            kind[order].tolist(),
+        )
+
+    # =============================================================================
+    # Edits
+    # =============================================================================
+
+    def reschedule(
+        self,
+        task_id: Any,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        duration: Optional[int] = None,
+    ) -> RescheduleResult:
+        """Apply a new start, end (inclusive) or duration to one task
+
+        A new start moves the task's start-no-earlier-than constraint; a new
+        end or duration changes its length. Returns every task whose dates or
+        float changed with its new values.
+        """
+        node = self.position.get(task_id)
+        if node is None:
+            raise ValueError(f"Task {task_id} is not in the schedule")
+
+        if start is not None:
+            self.earliest[node] = self._offset(start)
+        if duration is not None:
+            self.dur[node] = max(1, int(duration))
+        elif end is not None:
+            anchor = self.earliest[node] if start is not None else self.es[node]
+            self.dur[node] = max(1, self._offset(end) - anchor + 1)
+
+        moved, visited = self._forward(node)
+
+        previous_finish = self.finish
+        # Vectorized max; the finish only moves when a moved task touches it
+        self.finish = int(np.max(self.ef)) if self.ef else 0
+
+        if self.finish != previous_finish:
+            snapshot_lf = list(self.lf)
+            snapshot_free = list(self.free)
+            self._backward_all()
+            late_changed = {
+                i for i in range(len(self.lf)) if self.lf[i] != snapshot_lf[i]
+            }
+            free_changed = {
+                i for i in range(len(self.free)) if self.free[i] != snapshot_free[i]
+            }
+            full = True
+        else:
+            # Late dates depend on successors' late dates and durations only,
+            # so just the edited task's ancestors can move
+            late_changed, back_visited = self._backward({node})
+            visited += back_visited
+            free_changed = self._refresh_free(moved | {node}, late_changed)
+            full = False
+
+        changed = moved | late_changed | free_changed | {node}
+        return RescheduleResult(
+            changed=[self._record(i) for i in sorted(changed, key=self.rank.__getitem__)],
+            project_finish=self._date(self.finish - 1),
+            visited=visited,
+            full_backward_pass=full,
+            moved={self.ids[i] for i in moved | {node}},
+        )
+
+    def _forward(self, node: int):
+        """Recompute early dates of ``node`` and the descendants that move"""
+        moved: Set[int] = set()
+        heap = [(self.rank[node], node)]
+        queued = {node}
+        visited = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            visited += 1
+
+            es_v = self.earliest[v]
+            dur_v = self.dur[v]
+            for e in range(self.pred_off[v], self.pred_off[v + 1]):
+                p = self.pred_node[e]
+                k = self.pred_kind[e]
+                if k == FINISH_TO_START:
+                    candidate = self.ef[p] + self.pred_lag[e]
+                elif k == START_TO_START:
+                    candidate = self.es[p] + self.pred_lag[e]
+                elif k == FINISH_TO_FINISH:
+                    candidate = self.ef[p] + self.pred_lag[e] - dur_v
+                else:
+                    candidate = self.es[p] + self.pred_lag[e] - dur_v
+                if candidate > es_v:
+                    es_v = candidate
+
+            if es_v == self.es[v] and es_v + dur_v == self.ef[v]:
+                continue
+            moved.add(v)
+            self.es[v] = es_v
+            self.ef[v] = es_v + dur_v
+
+            for e in range(self.succ_off[v], self.succ_off[v + 1]):
+                s = self.succ_node[e]
+                if s not in queued:
+                    queued.add(s)
+                    heapq.heappush(heap, (self.rank[s], s))
+        return moved, visited
+
+    def _late_finish(self, p: int) -> int:
+        lf_p = self.finish
+        dur_p = self.dur[p]
+        for e in range(self.succ_off[p], self.succ_off[p + 1]):
+            s = self.succ_node[e]
+            k = self.succ_kind[e]
+            lag = self.succ_lag[e]
+            if k == FINISH_TO_START:
+                candidate = self.lf[s] - self.dur[s] - lag
+            elif k == START_TO_START:
+                candidate = self.lf[s] - self.dur[s] - lag + dur_p
+            elif k == FINISH_TO_FINISH:
+                candidate = self.lf[s] - lag
+            else:
+                candidate = self.lf[s] - lag + dur_p
+            if candidate < lf_p:
+                lf_p = candidate
+        return lf_p
+
+    def _free_float(self, p: int) -> int:
+        slack_p = None
+        for e in range(self.succ_off[p], self.succ_off[p + 1]):
+            s = self.succ_node[e]
+            k = self.succ_kind[e]
+            lag = self.succ_lag[e]
+            if k == FINISH_TO_START:
+                slack = self.es[s] - lag - self.ef[p]
+            elif k == START_TO_START:
+                slack = self.es[s] - lag - self.es[p]
+            elif k == FINISH_TO_FINISH:
+                slack = self.ef[s] - lag - self.ef[p]
+            else:
+                slack = self.ef[s] - lag - self.es[p]
+            if slack_p is None or slack < slack_p:
+                slack_p = slack
+        free = self.finish - self.ef[p] if slack_p is None else slack_p
+        return min(free, self.lf[p] - self.dur[p] - self.es[p])
+
+    def _backward(self, seeds: Set[int]):
+        """Pull late finishes back from ``seeds`` through their ancestors
+
+        A seed's own late finish is re-evaluated and its predecessors are
+        always revisited, because the seed's late start moves with its
+        duration; other nodes stop propagating once unchanged.
+        """
+        changed: Set[int] = set()
+        heap = [(-self.rank[v], v) for v in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        visited = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            visited += 1
+
+            lf_v = self._late_finish(v)
+            if lf_v != self.lf[v]:
+                changed.add(v)
+                self.lf[v] = lf_v
+            elif v not in seeds:
+                continue
+
+            for e in range(self.pred_off[v], self.pred_off[v + 1]):
+                p = self.pred_node[e]
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-self.rank[p], p))
+        return changed, visited
+
+    def _backward_all(self) -> None:
+        """Full backward pass (the project finish moved)"""
+        for v in sorted(range(len(self.lf)), key=self.rank.__getitem__, reverse=True):
+            self.lf[v] = self._late_finish(v)
+        self.free = [self._free_float(v) for v in range(len(self.free))]
+
+    def _refresh_free(self, moved: Set[int], late_changed: Set[int]) -> Set[int]:
+        """Free float depends on a task's own dates, its successors' dates
+        and (through the cap at total float) its late finish"""
+        touched = moved | late_changed
+        for v in moved:
+            touched.update(self.pred_node[self.pred_off[v] : self.pred_off[v + 1]])
+
+        changed = set()
+        for v in touched:
+            free = self._free_float(v)
+            if free != self.free[v]:
+                changed.add(v)
+                self.free[v] = free
+        return changed
+
+    # =============================================================================
+    # Results
+    # =============================================================================
+
+    def _offset(self, value: date) -> int:
+        return (value - self.base_date).days if self.base_date else int(value)
+
+    def _date(self, offset: int) -> Optional[date]:
+        if self.base_date is None:
+            return None
+        return self.base_date + timedelta(days=int(offset))
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        ls = self.lf[i] - self.dur[i]
+        total_float = ls - self.es[i]
+        return {
+            "id": self.ids[i],
+            "early_start": self._date(self.es[i]),
+            "early_finish": self._date(self.ef[i] - 1),
+            "late_start": self._date(ls),
+            "late_finish": self._date(self.lf[i] - 1),
+            "total_float": total_float,
+            "free_float": min(self.free[i], total_float),
+            "critical": total_float <= 0,
+        }
+
+    def total_float(self) -> np.ndarray:
+        return (
+            np.asarray(self.lf, "int64")
+            - np.asarray(self.dur, "int64")
+            - np.asarray(self.es, "int64")
+        )
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+modules/resource_conflicts.py
+SDX Project Manager - Sweep-Line Resource Conflict Detection
+Overlap intervals, peak concurrent load and daily over-allocation per resource in O(n log n)
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from modules.schedule import ColumnarSchedule, EPOCH_ORDINAL
+
+logger = logging.getLogger(__name__)
+
+
+UNASSIGNED_RESOURCES = {None, "", "Unassigned"}
+
+
+class ResourceConflictDetector:
+    """Finds resource over-allocation with one sorted sweep per resource
+
+    Each assignment becomes a start event on its first day and an end event
+    on the day after its last day. Sorting the events once and sweeping them
+    yields every segment where a resource carries more than ``capacity``
+    concurrent tasks without comparing tasks pairwise.
+    """
+
+    def __init__(self, capacity: int = 1):
+        self.capacity = capacity
+
+    def detect(
+        self, assignments: List[Dict[str, Any]], expand_days: bool = True
+    ) -> Dict[str, Any]:
+        """Sweep ``assignments`` of {resource, name, start, end} (inclusive dates)
+
+        Returns ``conflicts`` (merged intervals above capacity with the tasks
+        involved), ``peak_load`` per resource and ``over_allocation`` rows per
+        resource per day.
+        """
+        events = []
+        for idx, a in enumerate(assignments):
+            if a["resource"] in UNASSIGNED_RESOURCES or not a["start"] or not a["end"]:
+                continue
+            start = a["start"].toordinal()
+            end = a["end"].toordinal() + 1
+            if end <= start:
+                continue
+            # Ends sort before starts on the same day: back-to-back work is fine
+            events.append((a["resource"], start, 1, idx))
+            events.append((a["resource"], end, -1, idx))
+
+        events.sort(key=lambda e: (e[0], e[1], e[2]))
+        return self._sweep(events, [a["name"] for a in assignments], expand_days)
+
+    def detect_schedule(
+        self, schedule: ColumnarSchedule, expand_days: bool = True
+    ) -> Dict[str, Any]:
+        """Sweep the task rows of a ColumnarSchedule
+
+        Events are built and ordered with numpy (lexsort on resource code,
+        day and start/end) straight from the integer columns.
+        """
+        resources = list(schedule.resources)
+        assigned = np.array(
+            [r not in UNASSIGNED_RESOURCES for r in resources] or [False], dtype=bool
+        )
+        rows = np.flatnonzero(
+            ~schedule.is_project
+            & assigned[schedule.resource]
+            & (schedule.finish >= schedule.start)
+        )
+        if not len(rows):
+            return {"conflicts": [], "peak_load": {}, "over_allocation": []}
+
+        codes = np.concatenate([schedule.resource[rows], schedule.resource[rows]])
+        days = np.concatenate(
+            [schedule.start[rows], schedule.finish[rows] + 1]
+        ) + EPOCH_ORDINAL
+        deltas = np.concatenate(
+            [np.ones(len(rows), "int64"), -np.ones(len(rows), "int64")]
+        )
+        idxs = np.concatenate([rows, rows])
+
+        # Resource names order the sweep the same way detect() does
+        name_rank = np.empty(len(resources), dtype="int64")
+        name_rank[sorted(range(len(resources)), key=lambda k: str(resources[k]))] = (
+            np.arange(len(resources))
+        )
+        ranks = name_rank[codes]
+        order = np.lexsort((deltas, days, ranks))
+
+        labels = np.asarray(resources, dtype=object)[codes[order]].tolist()
+        events = list(
+            zip(
+                labels,
+                days[order].tolist(),
+                deltas[order].tolist(),
+                idxs[order].tolist(),
+            )
+        )
+        return self._sweep(events, list(schedule.names), expand_days)
+
+    def _sweep(
+        self, events: List[tuple], names: List[str], expand_days: bool
+    ) -> Dict[str, Any]:
+        """Walk sorted (resource, day, delta, idx) events"""
+        conflicts: List[Dict[str, Any]] = []
+        peak_load: Dict[str, Dict[str, Any]] = {}
+        over_allocation: List[Dict[str, Any]] = []
+
+        i = 0
+        total = len(events)
+        while i < total:
+            resource = events[i][0]
+            active: Dict[int, None] = {}
+            open_conflict: Optional[Dict[str, Any]] = None
+            peak = {"peak": 0, "date": None}
+
+            while i < total and events[i][0] == resource:
+                day = events[i][1]
+                while i < total and events[i][0] == resource and events[i][1] == day:
+                    _, _, delta, idx = events[i]
+                    if delta > 0:
+                        active[idx] = None
+                    else:
+                        active.pop(idx, None)
+                    i += 1
+
+                load = len(active)
+                next_day = (
+                    events[i][1] if i < total and events[i][0] == resource else day
+                )
+
+                if load > peak["peak"]:
+                    peak = {"peak": load, "date": date.fromordinal(day)}
+
+                if load > self.capacity:
+                    if open_conflict is None:
+                        open_conflict = {
+                            "resource": resource,
+                            "start": day,
+                            "tasks": {},
+                            "peak_load": 0,
+                        }
+                    open_conflict["tasks"].update(active)
+                    open_conflict["peak_load"] = max(open_conflict["peak_load"], load)
+                    open_conflict["end"] = next_day
+
+                    if expand_days:
+                        for d in range(day, next_day):
+                            over_allocation.append(
+                                {
+                                    "resource": resource,
+                                    "date": date.fromordinal(d),
+                                    "load": load,
+                                    "over_by": load - self.capacity,
+                                }
+                            )
+                elif open_conflict is not None:
+                    conflicts.append(self._close(open_conflict, names))
+                    open_conflict = None
+
+            if open_conflict is not None:
+                conflicts.append(self._close(open_conflict, names))
+            peak_load[resource] = peak
+
+        return {
+            "conflicts": conflicts,
+            "peak_load": peak_load,
+            "over_allocation": over_allocation,
+        }
+
+    @staticmethod
+    def _close(conflict: Dict[str, Any], names: List[str]) -> Dict[str, Any]:
+        """Turn an open sweep interval into a report row"""
+        tasks = [names[idx] for idx in conflict["tasks"]]
+        return {
+            "resource": conflict["resource"],
+            "overlap_start": date.fromordinal(conflict["start"]),
+            "overlap_end": date.fromordinal(conflict["end"]) - timedelta(days=1),
+            "peak_load": conflict["peak_load"],
+            "task_count": len(tasks),
+            "tasks": ", ".join(name.strip() for name in tasks),
+        }
+
+    def detect_items(self, gantt_items: List[Any], expand_days: bool = True) -> Dict[str, Any]:
+        """Run detection over Gantt task items (project summary rows are skipped)"""
+        return self.detect_schedule(ColumnarSchedule.from_items(gantt_items), expand_days)
+
+    @staticmethod
+    def over_allocated_days(over_allocation: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Number of over-allocated days per resource"""
+        days = defaultdict(int)
+        for row in over_allocation:
+            days[row["resource"]] += 1
+        return dict(days)
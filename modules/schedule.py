@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+modules/schedule.py
+SDX Project Manager - Columnar Schedule
+Struct-of-arrays Gantt schedule with integer-encoded labels, int64 day numbers and a CSR dependency index
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Dates are stored as days since 1970-01-01 (numpy datetime64[D] compatible)
+EPOCH = np.datetime64("1970-01-01", "D")
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def to_day(value: date) -> int:
+    """Day number of a date"""
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def from_day(day: int) -> date:
+    """Date of a day number"""
+    return date.fromordinal(int(day) + EPOCH_ORDINAL)
+
+
+def _label_list(labels: Any) -> List[Any]:
+    """Factorized labels with missing values restored to None"""
+    return [None if pd.isna(label) else label for label in labels]
+
+
+@dataclass
+class ColumnarSchedule:
+    """Gantt rows as parallel arrays
+
+    Row ``i`` is described by element ``i`` of every array. Repeated labels
+    (status, priority, resource) are stored as small integer codes into a
+    lookup list. Predecessors of row ``i`` are
+    ``dep_index[dep_offsets[i]:dep_offsets[i + 1]]`` (row indices), with the
+    edge type codes (see critical_path) and lags in ``dep_type``/``dep_lag``
+    at the same positions.
+    """
+
+    ids: List[str]
+    names: np.ndarray
+    start: np.ndarray
+    finish: np.ndarray
+    completion: np.ndarray
+    is_project: np.ndarray
+    status: np.ndarray
+    statuses: List[str]
+    priority: np.ndarray
+    priorities: List[str]
+    resource: np.ndarray
+    resources: List[str]
+    descriptions: np.ndarray
+    dep_offsets: np.ndarray
+    dep_index: np.ndarray
+    dep_type: np.ndarray
+    dep_lag: np.ndarray
+    _positions: Optional[Dict[str, int]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_columns(
+        cls,
+        ids: Sequence[str],
+        names: Sequence[str],
+        starts: Sequence[date],
+        finishes: Sequence[date],
+        completion: Sequence[float],
+        is_project: Sequence[bool],
+        statuses: Sequence[str],
+        priorities: Sequence[str],
+        resources: Sequence[str],
+        descriptions: Sequence[str],
+        dependencies: Sequence[Sequence[str]],
+        dependency_types: Optional[Sequence[Sequence[int]]] = None,
+        dependency_lags: Optional[Sequence[Sequence[int]]] = None,
+    ) -> "ColumnarSchedule":
+        """Encode plain per-column lists; unknown dependency IDs are dropped
+
+        ``dependency_types``/``dependency_lags`` run parallel to
+        ``dependencies``; missing entries mean finish-to-start with no lag.
+        """
+        n = len(ids)
+        positions = {item_id: i for i, item_id in enumerate(ids)}
+
+        counts = np.zeros(n, dtype="int64")
+        dep_index: List[int] = []
+        dep_type: List[int] = []
+        dep_lag: List[int] = []
+        for i, deps in enumerate(dependencies):
+            types = dependency_types[i] if dependency_types else None
+            lags = dependency_lags[i] if dependency_lags else None
+            for k, dep in enumerate(deps or ()):
+                p = positions.get(dep)
+                if p is not None and p != i:
+                    dep_index.append(p)
+                    dep_type.append(types[k] if types else 0)
+                    dep_lag.append((lags[k] or 0) if lags else 0)
+                    counts[i] += 1
+        dep_offsets = np.zeros(n + 1, dtype="int64")
+        np.cumsum(counts, out=dep_offsets[1:])
+
+        # Missing labels get their own code rather than the -1 sentinel
+        status_codes, status_labels = pd.factorize(
+            pd.Series(statuses, dtype=object), use_na_sentinel=False
+        )
+        priority_codes, priority_labels = pd.factorize(
+            pd.Series(priorities, dtype=object), use_na_sentinel=False
+        )
+        resource_codes, resource_labels = pd.factorize(
+            pd.Series(resources, dtype=object), use_na_sentinel=False
+        )
+
+        start = np.array([to_day(d) for d in starts], dtype="int64")
+        finish = np.array([to_day(d) for d in finishes], dtype="int64")
+
+        return cls(
+            ids=list(ids),
+            names=np.asarray(names, dtype=object),
+            start=start,
+            finish=finish,
+            completion=np.asarray(
+                [float(c or 0) for c in completion], dtype="float64"
+            ),
+            is_project=np.asarray(is_project, dtype=bool),
+            status=status_codes.astype("int16"),
+            statuses=_label_list(status_labels),
+            priority=priority_codes.astype("int16"),
+            priorities=_label_list(priority_labels),
+            resource=resource_codes.astype("int32"),
+            resources=_label_list(resource_labels),
+            descriptions=np.asarray(
+                [d or "" for d in descriptions], dtype=object
+            ),
+            dep_offsets=dep_offsets,
+            dep_index=np.asarray(dep_index, dtype="int64"),
+            dep_type=np.asarray(dep_type, dtype="int8"),
+            dep_lag=np.asarray(dep_lag, dtype="int32"),
+            _positions=positions,
+        )
+
+    @classmethod
+    def from_items(cls, gantt_items: List[Any]) -> "ColumnarSchedule":
+        """Encode a list of GanttItem objects"""
+        return cls.from_columns(
+            ids=[i.id for i in gantt_items],
+            names=[i.name for i in gantt_items],
+            starts=[i.start_date for i in gantt_items],
+            finishes=[i.end_date for i in gantt_items],
+            completion=[i.completion for i in gantt_items],
+            is_project=[i.category == "Project" for i in gantt_items],
+            statuses=[i.status for i in gantt_items],
+            priorities=[i.priority for i in gantt_items],
+            resources=[i.resource for i in gantt_items],
+            descriptions=[i.description for i in gantt_items],
+            dependencies=[i.dependencies for i in gantt_items],
+        )
+
+    @classmethod
+    def empty(cls) -> "ColumnarSchedule":
+        return cls.from_columns([], [], [], [], [], [], [], [], [], [], [])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # =============================================================================
+    # Lookups
+    # =============================================================================
+
+    def index_of(self, item_id: str) -> Optional[int]:
+        """Row of an item ID"""
+        if self._positions is None:
+            self._positions = {item_id: i for i, item_id in enumerate(self.ids)}
+        return self._positions.get(item_id)
+
+    def predecessors(self, row: int) -> np.ndarray:
+        return self.dep_index[self.dep_offsets[row] : self.dep_offsets[row + 1]]
+
+    def edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Parallel (predecessor, successor) row arrays"""
+        successors = np.repeat(
+            np.arange(len(self), dtype="int64"), np.diff(self.dep_offsets)
+        )
+        return self.dep_index, successors
+
+    @property
+    def categories(self) -> np.ndarray:
+        return np.where(self.is_project, "Project", "Task").astype(object)
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Inclusive durations in days (at least one)"""
+        return np.maximum(self.finish - self.start + 1, 1)
+
+    def start_dates(self) -> np.ndarray:
+        return EPOCH + self.start.astype("timedelta64[D]")
+
+    def finish_dates(self) -> np.ndarray:
+        return EPOCH + self.finish.astype("timedelta64[D]")
+
+    def labels(self, codes: np.ndarray, lookup: List[str]) -> np.ndarray:
+        """Decode label codes to an object array"""
+        return np.asarray(lookup, dtype=object)[codes] if len(codes) else np.array(
+            [], dtype=object
+        )
+
+    def dependency_labels(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Comma-separated predecessor IDs for rows ``start:stop``"""
+        ids = self.ids
+        stop = len(ids) if stop is None else min(stop, len(ids))
+        off = self.dep_offsets[start : stop + 1].tolist()
+        idx = self.dep_index[off[0] : off[-1]].tolist() if off else []
+        base = off[0] if off else 0
+        return [
+            ", ".join(ids[p] for p in idx[off[i] - base : off[i + 1] - base])
+            for i in range(stop - start)
+        ]
+
+    # =============================================================================
+    # Conversions
+    # =============================================================================
+
+    def to_frame(self) -> pd.DataFrame:
+        """Figure frame (see gantt_figures.FRAME_COLUMNS) built from the columns"""
+        return pd.DataFrame(
+            {
+                "ID": self.ids,
+                "Task": self.names,
+                "Start": pd.to_datetime(self.start_dates()),
+                "Finish": pd.to_datetime(self.finish_dates()),
+                "Completion": self.completion,
+                "Status": self.labels(self.status, self.statuses),
+                "Priority": self.labels(self.priority, self.priorities),
+                "Resource": self.labels(self.resource, self.resources),
+                "Category": self.categories,
+                "Description": self.descriptions,
+            }
+        )
+
+    def records(self) -> List[Dict[str, Any]]:
+        """One dict per row with GanttItem field names"""
+        ids = self.ids
+        off = self.dep_offsets.tolist()
+        idx = self.dep_index.tolist()
+        statuses = self.labels(self.status, self.statuses)
+        priorities = self.labels(self.priority, self.priorities)
+        resources = self.labels(self.resource, self.resources)
+        categories = self.categories
+        return [
+            {
+                "id": ids[i],
+                "name": self.names[i],
+                "start_date": from_day(self.start[i]),
+                "end_date": from_day(self.finish[i]),
+                "completion": float(self.completion[i]),
+                "priority": priorities[i],
+                "status": statuses[i],
+                "resource": resources[i],
+                "dependencies": [ids[p] for p in idx[off[i] : off[i + 1]]],
+                "category": categories[i],
+                "description": self.descriptions[i],
+            }
+            for i in range(len(ids))
+        ]
@@ -13,6 +13,11 @@ from enum import Enum
 import json
 import re
 
+from modules.activity_store import get_activity_store
+from modules.cost_ledger import CostLedger
+from modules.dependency_store import DependencyStore, migrate_legacy_dependencies
+from modules.milestone_progress import get_milestone_progress_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -115,6 +120,11 @@ class TaskManager:
 
     def __init__(self, db_manager):
         self.db = db_manager
+        self.cost_ledger = CostLedger(db_manager)
+        self.milestone_progress = get_milestone_progress_service(db_manager)
+        self.activity_store = get_activity_store(db_manager, "task")
+        self.dependency_store = DependencyStore(db_manager)
+        migrate_legacy_dependencies(db_manager)
 
         # Task workflow definitions
         self.status_transitions = {
@@ -220,6 +230,9 @@ class TaskManager:
 
             task_id = self.db.execute_query(query, params, return_id=True)
 
+            if task_data.get("MilestoneID"):
+                self.milestone_progress.invalidate(task_data["ProjectID"])
+
             # Handle dependencies if provided
             if task_data.get("Dependencies"):
                 self._create_task_dependencies(
@@ -352,6 +365,10 @@ class TaskManager:
                 task_id, current_task["Status"], updates.get("Status"), updated_by
             )
 
+            # Milestone progress depends on task status and milestone membership
+            if "Status" in updates or "MilestoneID" in updates:
+                self.milestone_progress.invalidate(current_task["ProjectID"])
+
             # Log changes
             self._log_task_changes(task_id, current_task, updates, updated_by)
 
@@ -388,6 +405,12 @@ class TaskManager:
                 query, [deleted_by, datetime.now(), datetime.now(), task_id]
             )
 
+            task = self.db.fetch_one(
+                "SELECT ProjectID FROM Tasks WHERE TaskID = ?", [task_id]
+            )
+            if task:
+                self.milestone_progress.invalidate(task["ProjectID"])
+
             # Archive related data
             self._archive_task_data(task_id)
 
@@ -562,32 +585,13 @@ class TaskManager:
             if self._creates_circular_dependency(task_id, depends_on_task_id):
                 raise ValueError("This dependency would create a circular reference")
 
-            # Check if dependency already exists
-            existing = self.db.fetch_one(
-                "SELECT COUNT(*) as count FROM TaskDependencies WHERE TaskID = ? AND DependsOnTaskID = ?",
-                [task_id, depends_on_task_id],
-            )
-
-            if existing["count"] > 0:
-                return False  # Already exists
-
-            query = """
-                INSERT INTO TaskDependencies 
-                (TaskID, DependsOnTaskID, DependencyType, LagDays, CreatedBy, CreatedAt)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-
-            self.db.execute_query(
-                query,
-                [
-                    task_id,
-                    depends_on_task_id,
-                    dependency_type,
-                    lag_days,
-                    created_by,
-                    datetime.now(),
-                ],
+            # Skipped (0 rows) when the edge already exists
+            inserted = self.dependency_store.add_many(
+                [(task_id, depends_on_task_id, dependency_type, lag_days)],
+                created_by,
             )
+            if not inserted:
+                return False
 
             # Log activity
             self._log_task_activity(
@@ -608,11 +612,7 @@ class TaskManager:
     ) -> bool:
         """Remove dependency between tasks"""
         try:
-            query = (
-                "DELETE FROM TaskDependencies WHERE TaskID = ? AND DependsOnTaskID = ?"
-            )
-
-            self.db.execute_query(query, [task_id, depends_on_task_id])
+            self.dependency_store.remove(task_id, depends_on_task_id)
 
             # Log activity
             self._log_task_activity(
@@ -694,6 +694,9 @@ class TaskManager:
 
             self.db.execute_query(query, [end_time, duration_minutes, tracking_id])
 
+            # Cost the entry at the current rate
+            self.cost_ledger.record_time_entry(tracking_id)
+
             # Update task actual hours
             self._update_task_actual_hours(tracking["TaskID"])
 
@@ -1160,32 +1163,46 @@ class TaskManager:
     ) -> bool:
         """Check if adding dependency would create circular reference"""
         try:
-            # Use recursive CTE to check for circular dependencies
-            query = """
-                WITH DependencyChain AS (
-                    SELECT DependsOnTaskID as TaskID, 1 as Level
-                    FROM TaskDependencies
-                    WHERE TaskID = ?
-                    
-                    UNION ALL
-                    
-                    SELECT td.DependsOnTaskID, dc.Level + 1
-                    FROM TaskDependencies td
-                    JOIN DependencyChain dc ON td.TaskID = dc.TaskID
-                    WHERE dc.Level < 10  -- Prevent infinite recursion
-                )
-                SELECT COUNT(*) as count
-                FROM DependencyChain
-                WHERE TaskID = ?
-            """
-
-            result = self.db.fetch_one(query, [depends_on_task_id, task_id])
-            return result["count"] > 0
+            # One edge-list load per project, walked in memory at any depth
+            return self.dependency_store.creates_cycle(task_id, depends_on_task_id)
 
         except Exception as e:
             logger.error(f"Failed to check circular dependency: {str(e)}")
             return True  # Err on the side of caution
 
+    def _create_task_dependencies(
+        self, task_id: int, dependencies: Union[str, List[Any]], created_by: int
+    ):
+        """Create dependency edges for a new task
+
+        Accepts a comma-separated ID string or a list of task IDs / dicts
+        with DependsOnTaskID, DependencyType and LagDays.
+        """
+        try:
+            if isinstance(dependencies, str):
+                dependencies = [d.strip() for d in dependencies.split(",") if d.strip()]
+
+            edges = []
+            for dep in dependencies:
+                if isinstance(dep, dict):
+                    edges.append(
+                        (
+                            task_id,
+                            int(dep["DependsOnTaskID"]),
+                            dep.get("DependencyType", "finish_to_start"),
+                            dep.get("LagDays", 0),
+                        )
+                    )
+                else:
+                    edges.append((task_id, int(dep), "finish_to_start", 0))
+
+            # A brand-new task has no dependents yet, so only self-edges can cycle
+            edges = [edge for edge in edges if edge[0] != edge[1]]
+            self.dependency_store.add_many(edges, created_by)
+
+        except Exception as e:
+            logger.error(f"Failed to create task dependencies: {str(e)}")
+
     def _archive_task_data(self, task_id: int):
         """Archive task-related data"""
         try:
@@ -1208,14 +1225,8 @@ class TaskManager:
     ):
         """Log task activity for audit trail"""
         try:
-            query = """
-                INSERT INTO TaskActivity 
-                (TaskID, UserID, ActivityType, Description, ActivityDate)
-                VALUES (?, ?, ?, ?, ?)
-            """
-
-            self.db.execute_query(
-                query, [task_id, user_id, activity_type, description, datetime.now()]
+            self.activity_store.append(
+                task_id, user_id, activity_type, description, datetime.now()
             )
 
         except Exception as e:
@@ -1241,20 +1252,12 @@ class TaskManager:
         except Exception as e:
             logger.error(f"Failed to log task changes: {str(e)}")
 
-    def get_task_activity(self, task_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_task_activity(
+        self, task_id: int, limit: int = 50, include_history: bool = False
+    ) -> List[Dict[str, Any]]:
         """Get task activity log"""
         try:
-            query = """
-                SELECT ta.*, u.FirstName + ' ' + u.LastName as UserName
-                FROM TaskActivity ta
-                LEFT JOIN Users u ON ta.UserID = u.UserID
-                WHERE ta.TaskID = ?
-                ORDER BY ta.ActivityDate DESC
-                OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY
-            """
-
-            activities = self.db.fetch_all(query, [task_id, limit])
-            return [dict(activity) for activity in activities]
+            return self.activity_store.recent(task_id, limit, include_history)
 
         except Exception as e:
             logger.error(f"Failed to get task activity: {str(e)}")
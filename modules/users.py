@@ -13,6 +13,9 @@ from typing import Dict, List, Any, Optional
 import pandas as pd
 import re
 
+from modules.notification_counters import NotificationCounterStore
+from modules.notification_preferences import get_notification_preference_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +24,7 @@ class UserManager:
 
     def __init__(self, db_manager):
         self.db = db_manager
+        self.notification_preferences = get_notification_preference_cache(db_manager)
         self._ensure_sample_data()
 
     def _ensure_sample_data(self):
@@ -173,6 +177,8 @@ class UserManager:
 
             if result > 0:
                 user_id = self.db.execute_scalar("SELECT @@IDENTITY")
+                # Counts toward system totals before the user's first read
+                NotificationCounterStore(self.db).seed_user(user_id)
                 logger.info(f"User created with ID: {user_id}")
                 return user_id
 
@@ -296,6 +302,8 @@ class UserManager:
                 ),
             )
 
+            # Email and active flag feed the notification settings cache
+            self.notification_preferences.invalidate(user_id)
             return result > 0
 
         except Exception as e:
@@ -387,6 +395,7 @@ class UserManager:
                 (st.session_state.user["UserID"], user_id),
             )
 
+            self.notification_preferences.invalidate(user_id)
             return result > 0
 
         except Exception as e:
@@ -406,6 +415,7 @@ class UserManager:
                 (st.session_state.user["UserID"], user_id),
             )
 
+            self.notification_preferences.invalidate(user_id)
             return result > 0
 
         except Exception as e:
@@ -184,6 +184,22 @@ CREATE TABLE Tasks (
 );
 PRINT '✅ Tasks table created with comprehensive tracking';
 
+-- Task dependency edges (successor TaskID depends on predecessor DependsOnTaskID)
+CREATE TABLE TaskDependencies (
+    DependencyID INT IDENTITY(1,1) PRIMARY KEY,
+    TaskID INT NOT NULL,
+    DependsOnTaskID INT NOT NULL,
+    DependencyType NVARCHAR(20) DEFAULT 'finish_to_start' CHECK (DependencyType IN ('finish_to_start', 'start_to_start', 'finish_to_finish', 'start_to_finish')),
+    LagDays INT DEFAULT 0,
+    CreatedBy INT,
+    CreatedAt DATETIME DEFAULT GETDATE(),
+    CHECK (TaskID <> DependsOnTaskID),
+    FOREIGN KEY (TaskID) REFERENCES Tasks(TaskID) ON DELETE CASCADE,
+    FOREIGN KEY (DependsOnTaskID) REFERENCES Tasks(TaskID),
+    FOREIGN KEY (CreatedBy) REFERENCES Users(UserID)
+);
+PRINT '✅ TaskDependencies table created';
+
 -- Task comments and activity
 CREATE TABLE TaskComments (
     CommentID INT IDENTITY(1,1) PRIMARY KEY,
@@ -310,6 +326,9 @@ CREATE TABLE Notifications (
     IsRead BIT DEFAULT 0,
     IsEmailSent BIT DEFAULT 0,
     EmailSentDate DATETIME,
+    EmailDigest BIT DEFAULT 0, -- Email waits for the next digest instead of going out alone
+    CoalesceKey NVARCHAR(100), -- Entity key (task:42) that merges bursts into one row
+    CoalescedCount INT DEFAULT 1, -- Events merged into this row
     CreatedDate DATETIME DEFAULT GETDATE(),
     ExpiresAt DATETIME,
     ActionUrl NVARCHAR(500), -- Deep link to related content
@@ -317,6 +336,17 @@ CREATE TABLE Notifications (
 );
 PRINT '✅ Notifications table created';
 
+-- Per-user notification counters (badge and statistics lookups)
+CREATE TABLE NotificationCounters (
+    UserID INT PRIMARY KEY,
+    TotalCount INT NOT NULL DEFAULT 0,
+    UnreadCount INT NOT NULL DEFAULT 0,
+    CriticalCount INT NOT NULL DEFAULT 0,
+    UpdatedAt DATETIME DEFAULT GETDATE(),
+    FOREIGN KEY (UserID) REFERENCES Users(UserID)
+);
+PRINT '✅ NotificationCounters table created';
+
 -- Notification templates
 CREATE TABLE NotificationTemplates (
     TemplateID INT IDENTITY(1,1) PRIMARY KEY,
@@ -330,6 +360,39 @@ CREATE TABLE NotificationTemplates (
 );
 PRINT '✅ NotificationTemplates table created';
 
+-- Reminder ledger: one row per reminder sent (insert-if-absent dedupe)
+CREATE TABLE ReminderLedger (
+    LedgerID INT IDENTITY(1,1) PRIMARY KEY,
+    TaskID INT NOT NULL,
+    ReminderType NVARCHAR(30) NOT NULL, -- task_due_soon, task_overdue
+    OffsetDays INT NOT NULL,
+    DueDate DATE NOT NULL, -- Due date the reminder was computed from
+    UserID INT,
+    NotificationID INT,
+    SentAt DATETIME DEFAULT GETDATE(),
+    FOREIGN KEY (TaskID) REFERENCES Tasks(TaskID) ON DELETE CASCADE,
+    FOREIGN KEY (UserID) REFERENCES Users(UserID)
+);
+PRINT '✅ ReminderLedger table created';
+
+-- Notification outbox: delivery work committed with the change that caused it
+CREATE TABLE NotificationOutbox (
+    OutboxID BIGINT IDENTITY(1,1) PRIMARY KEY,
+    Channel NVARCHAR(20) NOT NULL, -- email, realtime
+    UserID INT,
+    NotificationID INT,
+    Payload NVARCHAR(MAX) NOT NULL, -- JSON delivery payload
+    Status NVARCHAR(20) DEFAULT 'Pending' CHECK (Status IN ('Pending', 'Processing', 'Delivered', 'Failed')),
+    Attempts INT DEFAULT 0,
+    AvailableAt DATETIME DEFAULT GETDATE(), -- Next claim time (visibility timeout / backoff)
+    ClaimedBy NVARCHAR(100),
+    LastError NVARCHAR(MAX),
+    CreatedAt DATETIME DEFAULT GETDATE(),
+    DeliveredAt DATETIME,
+    FOREIGN KEY (UserID) REFERENCES Users(UserID)
+);
+PRINT '✅ NotificationOutbox table created';
+
 -- ============================================================================
 -- FILE MANAGEMENT
 -- ============================================================================
@@ -463,6 +526,87 @@ CREATE TABLE ProjectMetrics (
 );
 PRINT '✅ ProjectMetrics table created';
 
+-- Cost ledger: one row per completed time entry, costed at the rate in effect
+CREATE TABLE CostLedgerEntries (
+    EntryID INT IDENTITY(1,1) PRIMARY KEY,
+    TrackingID INT NOT NULL UNIQUE,
+    ProjectID INT NOT NULL,
+    TaskID INT,
+    UserID INT NOT NULL,
+    WorkDate DATE NOT NULL,
+    PeriodMonth INT NOT NULL, -- YYYYMM
+    Hours DECIMAL(10,2) NOT NULL,
+    HourlyRate DECIMAL(10,2) NOT NULL,
+    Cost DECIMAL(15,2) NOT NULL,
+    CreatedAt DATETIME DEFAULT GETDATE(),
+    FOREIGN KEY (ProjectID) REFERENCES Projects(ProjectID) ON DELETE CASCADE,
+    FOREIGN KEY (UserID) REFERENCES Users(UserID)
+);
+PRINT '✅ CostLedgerEntries table created';
+
+-- Running cost totals per project and month
+CREATE TABLE ProjectCostTotals (
+    ProjectID INT NOT NULL,
+    PeriodMonth INT NOT NULL, -- YYYYMM
+    Hours DECIMAL(12,2) NOT NULL DEFAULT 0,
+    Cost DECIMAL(15,2) NOT NULL DEFAULT 0,
+    EntryCount INT NOT NULL DEFAULT 0,
+    UpdatedAt DATETIME DEFAULT GETDATE(),
+    PRIMARY KEY (ProjectID, PeriodMonth),
+    FOREIGN KEY (ProjectID) REFERENCES Projects(ProjectID) ON DELETE CASCADE
+);
+PRINT '✅ ProjectCostTotals table created';
+
+-- Activity logs, partitioned by month so recent reads touch only hot partitions.
+-- Boundaries are added ahead of time by ActivityStore.maintain_partitions and
+-- cold months are moved into the archive tables by ActivityStore.compact.
+CREATE PARTITION FUNCTION pf_ProjectActivityMonth (DATETIME) AS RANGE RIGHT FOR VALUES ();
+CREATE PARTITION SCHEME ps_ProjectActivityMonth AS PARTITION pf_ProjectActivityMonth ALL TO ([PRIMARY]);
+CREATE PARTITION FUNCTION pf_TaskActivityMonth (DATETIME) AS RANGE RIGHT FOR VALUES ();
+CREATE PARTITION SCHEME ps_TaskActivityMonth AS PARTITION pf_TaskActivityMonth ALL TO ([PRIMARY]);
+
+CREATE TABLE ProjectActivity (
+    ActivityID BIGINT IDENTITY(1,1) NOT NULL,
+    ProjectID INT NOT NULL,
+    UserID INT,
+    ActivityType NVARCHAR(50) NOT NULL,
+    Description NVARCHAR(MAX),
+    ActivityDate DATETIME NOT NULL DEFAULT GETDATE(),
+    CONSTRAINT PK_ProjectActivity PRIMARY KEY CLUSTERED (ActivityDate, ActivityID)
+) ON ps_ProjectActivityMonth(ActivityDate);
+PRINT '✅ ProjectActivity table created';
+
+CREATE TABLE ProjectActivityArchive (
+    ActivityID BIGINT IDENTITY(1,1) PRIMARY KEY,
+    ProjectID INT NOT NULL,
+    UserID INT,
+    ActivityType NVARCHAR(50) NOT NULL,
+    Description NVARCHAR(MAX),
+    ActivityDate DATETIME NOT NULL
+);
+PRINT '✅ ProjectActivityArchive table created';
+
+CREATE TABLE TaskActivity (
+    ActivityID BIGINT IDENTITY(1,1) NOT NULL,
+    TaskID INT NOT NULL,
+    UserID INT,
+    ActivityType NVARCHAR(50) NOT NULL,
+    Description NVARCHAR(MAX),
+    ActivityDate DATETIME NOT NULL DEFAULT GETDATE(),
+    CONSTRAINT PK_TaskActivity PRIMARY KEY CLUSTERED (ActivityDate, ActivityID)
+) ON ps_TaskActivityMonth(ActivityDate);
+PRINT '✅ TaskActivity table created';
+
+CREATE TABLE TaskActivityArchive (
+    ActivityID BIGINT IDENTITY(1,1) PRIMARY KEY,
+    TaskID INT NOT NULL,
+    UserID INT,
+    ActivityType NVARCHAR(50) NOT NULL,
+    Description NVARCHAR(MAX),
+    ActivityDate DATETIME NOT NULL
+);
+PRINT '✅ TaskActivityArchive table created';
+
 -- User performance metrics
 CREATE TABLE UserMetrics (
     MetricID INT IDENTITY(1,1) PRIMARY KEY,
@@ -586,6 +730,7 @@ CREATE INDEX IX_Projects_Priority ON Projects(Priority);
 CREATE INDEX IX_Projects_StartDate ON Projects(StartDate);
 CREATE INDEX IX_Projects_EndDate ON Projects(EndDate);
 CREATE INDEX IX_Projects_CreatedDate ON Projects(CreatedDate);
+CREATE INDEX IX_Projects_Window ON Projects(EndDate, StartDate) INCLUDE (Status, ManagerID);
 
 -- Tasks indexes
 CREATE INDEX IX_Tasks_ProjectID ON Tasks(ProjectID);
@@ -595,6 +740,11 @@ CREATE INDEX IX_Tasks_Priority ON Tasks(Priority);
 CREATE INDEX IX_Tasks_DueDate ON Tasks(DueDate);
 CREATE INDEX IX_Tasks_CreatedDate ON Tasks(CreatedDate);
 CREATE INDEX IX_Tasks_ParentTaskID ON Tasks(ParentTaskID);
+CREATE INDEX IX_Tasks_ProjectID_DueDate ON Tasks(ProjectID, DueDate) INCLUDE (StartDate, Status);
+
+-- TaskDependencies indexes (covering in both directions)
+CREATE UNIQUE INDEX UX_TaskDependencies_Successor ON TaskDependencies(TaskID, DependsOnTaskID) INCLUDE (DependencyType, LagDays);
+CREATE INDEX IX_TaskDependencies_Predecessor ON TaskDependencies(DependsOnTaskID, TaskID) INCLUDE (DependencyType, LagDays);
 
 -- ProjectMembers indexes
 CREATE INDEX IX_ProjectMembers_ProjectID ON ProjectMembers(ProjectID);
@@ -606,6 +756,15 @@ CREATE INDEX IX_Notifications_UserID ON Notifications(UserID);
 CREATE INDEX IX_Notifications_IsRead ON Notifications(IsRead);
 CREATE INDEX IX_Notifications_CreatedDate ON Notifications(CreatedDate);
 CREATE INDEX IX_Notifications_Type ON Notifications(Type);
+CREATE INDEX IX_Notifications_Coalesce ON Notifications(UserID, CoalesceKey, CreatedDate) WHERE IsRead = 0 AND IsEmailSent = 0;
+CREATE INDEX IX_Notifications_User_Created ON Notifications(UserID, CreatedDate) INCLUDE (IsRead);
+CREATE INDEX IX_Notifications_Digest ON Notifications(UserID, CreatedDate) WHERE EmailDigest = 1 AND IsEmailSent = 0;
+
+-- ReminderLedger indexes
+CREATE UNIQUE INDEX UX_ReminderLedger_Key ON ReminderLedger(TaskID, ReminderType, OffsetDays, DueDate);
+
+-- NotificationOutbox indexes (claim scan over undelivered rows only)
+CREATE INDEX IX_NotificationOutbox_Claim ON NotificationOutbox(AvailableAt) INCLUDE (Status, Channel) WHERE Status IN ('Pending', 'Processing');
 
 -- AuditLog indexes
 CREATE INDEX IX_AuditLog_UserID ON AuditLog(UserID);
@@ -618,6 +777,16 @@ CREATE INDEX IX_TimeEntries_TaskID ON TimeEntries(TaskID);
 CREATE INDEX IX_TimeEntries_UserID ON TimeEntries(UserID);
 CREATE INDEX IX_TimeEntries_StartTime ON TimeEntries(StartTime);
 
+-- Cost ledger indexes
+CREATE INDEX IX_CostLedgerEntries_Project_Period ON CostLedgerEntries(ProjectID, PeriodMonth) INCLUDE (Hours, Cost);
+CREATE INDEX IX_CostLedgerEntries_UserID ON CostLedgerEntries(UserID);
+
+-- Activity indexes (aligned with the monthly partition schemes)
+CREATE INDEX IX_ProjectActivity_ProjectID ON ProjectActivity(ProjectID, ActivityDate DESC) ON ps_ProjectActivityMonth(ActivityDate);
+CREATE INDEX IX_TaskActivity_TaskID ON TaskActivity(TaskID, ActivityDate DESC) ON ps_TaskActivityMonth(ActivityDate);
+CREATE INDEX IX_ProjectActivityArchive_ProjectID ON ProjectActivityArchive(ProjectID, ActivityDate DESC);
+CREATE INDEX IX_TaskActivityArchive_TaskID ON TaskActivityArchive(TaskID, ActivityDate DESC);
+
 -- FileAttachments indexes
 CREATE INDEX IX_FileAttachments_EntityType_EntityID ON FileAttachments(EntityType, EntityID);
 CREATE INDEX IX_FileAttachments_UploadedBy ON FileAttachments(UploadedBy);
@@ -0,0 +1,92 @@
+# tests/helpers.py
+"""
+Shared Test Helpers for DENSO Project Manager Pro
+An in-memory SQLite stand-in for DatabaseManager and the notification schema
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+NOTIFICATIONS_SCHEMA = """
+    CREATE TABLE Users (
+        UserID INTEGER PRIMARY KEY,
+        Email TEXT, FirstName TEXT, LastName TEXT, Language TEXT,
+        NotificationSettings TEXT, IsActive INTEGER DEFAULT 1
+    );
+    CREATE TABLE Notifications (
+        NotificationID INTEGER PRIMARY KEY AUTOINCREMENT,
+        UserID INTEGER NOT NULL,
+        Type TEXT, Title TEXT, Message TEXT,
+        Priority TEXT DEFAULT 'medium',
+        IsRead INTEGER DEFAULT 0,
+        ReadDate TIMESTAMP,
+        IsEmailSent INTEGER DEFAULT 0,
+        EmailSentDate TIMESTAMP,
+        EmailDigest INTEGER DEFAULT 0,
+        CoalesceKey TEXT,
+        CoalescedCount INTEGER DEFAULT 1,
+        ActionUrl TEXT,
+        CreatedDate TIMESTAMP,
+        ExpiresAt TIMESTAMP
+    );
+    CREATE TABLE NotificationCounters (
+        UserID INTEGER PRIMARY KEY,
+        TotalCount INTEGER NOT NULL DEFAULT 0,
+        UnreadCount INTEGER NOT NULL DEFAULT 0,
+        CriticalCount INTEGER NOT NULL DEFAULT 0,
+        UpdatedAt TIMESTAMP
+    );
+"""
+
+
+class SQLiteDatabase:
+    """The slice of DatabaseManager the stores use, on in-memory SQLite"""
+
+    db_type = "sqlite"
+
+    def __init__(self, schema: str):
+        self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self.connection.executescript(schema)
+
+    def execute_query(self, query, params=()):
+        with self._lock:
+            rows = [dict(row) for row in self.connection.execute(query, params or ())]
+            self.connection.commit()
+            return rows
+
+    def fetch_all(self, query, params=()):
+        with self._lock:
+            return [dict(row) for row in self.connection.execute(query, params or ())]
+
+    def fetch_one(self, query, params=()):
+        rows = self.fetch_all(query, params)
+        return rows[0] if rows else None
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                yield cursor
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def insert_rows(self, cursor, table, columns, rows, output_columns=None):
+        placeholders = ", ".join("?" for _ in columns)
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        if not output_columns:
+            cursor.executemany(query, rows)
+            return []
+        returned = []
+        for row in rows:
+            cursor.execute(f"{query} RETURNING {', '.join(output_columns)}", row)
+            returned.extend(tuple(r) for r in cursor.fetchall())
+        return returned
@@ -0,0 +1,106 @@
+# tests/test_activity_store.py
+"""
+Activity Store Tests for DENSO Project Manager Pro
+Tests monthly buckets, rollbacks and compaction against in-memory SQLite
+"""
+
+import unittest
+import sys
+import os
+from datetime import date, datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.activity_store import ActivityMaintenance, ActivityStore
+from tests.helpers import SQLiteDatabase
+
+USERS_SCHEMA = """
+    CREATE TABLE Users (
+        UserID INTEGER PRIMARY KEY, FirstName TEXT, LastName TEXT
+    );
+    INSERT INTO Users VALUES (1, 'Somchai', 'K');
+"""
+
+
+class TestActivityStore(unittest.TestCase):
+    """Monthly SQLite buckets behind append and recent"""
+
+    def setUp(self):
+        """A project stream with no buckets yet"""
+        self.db = SQLiteDatabase(USERS_SCHEMA)
+        self.store = ActivityStore(self.db, "project", hot_months=2)
+
+    def test_rolled_back_bucket_is_not_cached(self):
+        """A bucket created in a rolled-back transaction is created again"""
+        now = datetime.now()
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction() as cursor:
+                # The project row opens the transaction before the bucket DDL
+                cursor.execute("INSERT INTO Users VALUES (2, 'Anan', 'S')")
+                self.store.append_many(cursor, [(7, 1, "created", "Project created", now)])
+                raise RuntimeError("template failed")
+
+        self.assertEqual(self.store.recent(7), [])
+        self.assertTrue(self.store.append(7, 1, "updated", "Project updated", now))
+        self.assertEqual(
+            [row["ActivityType"] for row in self.store.recent(7)], ["updated"]
+        )
+
+    def test_committed_bucket_is_read(self):
+        """Rows appended on a committed cursor show up in recent"""
+        with self.db.transaction() as cursor:
+            self.store.append_many(
+                cursor, [(7, 1, "created", "Project created", datetime.now())]
+            )
+
+        rows = self.store.recent(7)
+        self.assertEqual([row["UserName"] for row in rows], ["Somchai K"])
+
+    def test_compact_moves_cold_buckets(self):
+        """Buckets older than the hot window go to the archive"""
+        self.store.append(7, 1, "created", "Old", datetime(2026, 1, 10))
+        self.store.append(7, 1, "updated", "New", datetime(2026, 10, 2))
+
+        self.assertEqual(self.store.compact(today=date(2026, 10, 18)), 1)
+        self.assertEqual(
+            [row["Description"] for row in self.store.recent(7, include_archive=True)],
+            ["New", "Old"],
+        )
+        self.assertNotIn("ProjectActivity_202601", self.store._known_buckets())
+
+    def test_maintenance_migrates_legacy_rows_once(self):
+        """The first pass buckets legacy rows, then archives the cold ones"""
+        self.db.execute_query(
+            """
+            CREATE TABLE ProjectActivity (
+                ActivityID INTEGER PRIMARY KEY AUTOINCREMENT, ProjectID INTEGER,
+                UserID INTEGER, ActivityType TEXT, Description TEXT,
+                ActivityDate DATETIME
+            )
+            """
+        )
+        for when in (datetime(2026, 2, 3), datetime(2026, 9, 30)):
+            self.db.execute_query(
+                "INSERT INTO ProjectActivity (ProjectID, UserID, ActivityType, "
+                "Description, ActivityDate) VALUES (7, 1, 'updated', ?, ?)",
+                (f"{when:%B}", when),
+            )
+
+        maintenance = ActivityMaintenance([self.store], months_ahead=1)
+        self.assertEqual(maintenance.run_once(migrate=True, today=date(2026, 10, 18)), 1)
+        self.assertEqual(
+            self.db.fetch_one("SELECT COUNT(*) as Count FROM ProjectActivity")["Count"], 0
+        )
+        self.assertEqual(
+            sorted(self.store._known_buckets()),
+            ["ProjectActivity_202609", "ProjectActivity_202610", "ProjectActivity_202611"],
+        )
+        self.assertEqual(
+            [row["Description"] for row in self.store.recent(7, include_archive=True)],
+            ["September", "February"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
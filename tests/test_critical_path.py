@@ -0,0 +1,104 @@
+# tests/test_critical_path.py
+"""
+Critical Path Tests for DENSO Project Manager Pro
+Tests the CPM engine: topological order, early/late dates, float and critical chain
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.critical_path import (
+    CriticalPathEngine,
+    START_TO_START,
+    FINISH_TO_FINISH,
+)
+
+
+class TestCriticalPathEngine(unittest.TestCase):
+    """Test forward/backward pass results on small known networks"""
+
+    def setUp(self):
+        """Set up engine"""
+        self.engine = CriticalPathEngine()
+
+    def test_textbook_network(self):
+        """A(3) -> B(2) -> D(4), A -> C(5) -> D: critical chain is A, C, D"""
+        result = self.engine.compute(
+            durations=[3, 2, 5, 4],
+            predecessors=[0, 0, 1, 2],
+            successors=[1, 2, 3, 3],
+            ids=["A", "B", "C", "D"],
+        )
+
+        self.assertEqual(result.early_start.tolist(), [0, 3, 3, 8])
+        self.assertEqual(result.early_finish.tolist(), [3, 5, 8, 12])
+        self.assertEqual(result.late_start.tolist(), [0, 6, 3, 8])
+        self.assertEqual(result.total_float.tolist(), [0, 3, 0, 0])
+        self.assertEqual(result.free_float.tolist(), [0, 3, 0, 0])
+        self.assertEqual(result.critical_path, [0, 2, 3])
+        self.assertEqual(result.project_duration, 12)
+
+    def test_lag_and_dependency_types(self):
+        """Lags shift successors; SS and FF constraints use start/finish anchors"""
+        result = self.engine.compute(
+            durations=[4, 2, 3],
+            predecessors=[0, 0],
+            successors=[1, 2],
+            lags=[1, 2],
+            dependency_types=[START_TO_START, FINISH_TO_FINISH],
+        )
+
+        # SS+1: B starts one day after A starts
+        self.assertEqual(result.early_start[1], 1)
+        # FF+2: C finishes two days after A finishes (4 + 2 = 6, start 3)
+        self.assertEqual(result.early_finish[2], 6)
+        self.assertEqual(result.total_float[2], 0)
+
+    def test_earliest_start_constraint(self):
+        """Scheduled starts act as start-no-earlier-than constraints"""
+        result = self.engine.compute(
+            durations=[2, 2],
+            predecessors=[0],
+            successors=[1],
+            earliest_start=[0, 5],
+        )
+
+        self.assertEqual(result.early_start.tolist(), [0, 5])
+        self.assertEqual(result.total_float.tolist(), [3, 0])
+        self.assertEqual(result.free_float[0], 3)
+
+    def test_cycle_is_rejected(self):
+        """Cyclic dependencies raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.engine.compute(
+                durations=[1, 1, 1],
+                predecessors=[0, 1, 2],
+                successors=[1, 2, 0],
+            )
+
+    def test_large_chain_performance(self):
+        """10k tasks with ~30k dependencies complete well under a second"""
+        n = 10000
+        preds, succs = [], []
+        for i in range(1, n):
+            for back in (1, 7, 31):
+                if i - back >= 0:
+                    preds.append(i - back)
+                    succs.append(i)
+
+        started = time.perf_counter()
+        result = self.engine.compute([1 + i % 5 for i in range(n)], preds, succs)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(len(result.order), n)
+        self.assertTrue((result.total_float >= 0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
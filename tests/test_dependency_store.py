@@ -0,0 +1,75 @@
+# tests/test_dependency_store.py
+"""
+Dependency Store Tests for DENSO Project Manager Pro
+Tests chunked edge lookups and the legacy column migration against in-memory SQLite
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.dependency_store import DependencyStore
+from tests.helpers import SQLiteDatabase
+
+DEPENDENCY_SCHEMA = """
+    CREATE TABLE Tasks (
+        TaskID INTEGER PRIMARY KEY, ProjectID INTEGER, Dependencies TEXT
+    );
+    CREATE TABLE TaskDependencies (
+        DependencyID INTEGER PRIMARY KEY AUTOINCREMENT,
+        TaskID INTEGER, DependsOnTaskID INTEGER, DependencyType TEXT,
+        LagDays INTEGER, CreatedBy INTEGER, CreatedAt TIMESTAMP,
+        UNIQUE (TaskID, DependsOnTaskID)
+    );
+"""
+
+
+class TestDependencyStore(unittest.TestCase):
+    """Edge reads and writes through TaskDependencies"""
+
+    def setUp(self):
+        """A chain of five tasks in one project"""
+        self.db = SQLiteDatabase(DEPENDENCY_SCHEMA)
+        for task_id in range(1, 6):
+            self.db.execute_query(
+                "INSERT INTO Tasks VALUES (?, 1, ?)",
+                (task_id, str(task_id - 1) if task_id > 1 else None),
+            )
+        self.store = DependencyStore(self.db)
+
+    @patch("modules.dependency_store.EDGE_LOOKUP_CHUNK", 2)
+    def test_task_edges_are_read_in_chunks(self):
+        """Lookups larger than one IN list still find every edge"""
+        edges = [(task_id, task_id - 1, "finish_to_start", 0) for task_id in range(2, 6)]
+        self.assertEqual(self.store.add_many(edges), 4)
+        # Existing edges across chunks are found and skipped
+        self.assertEqual(self.store.add_many(edges), 0)
+
+        found = self.store.load_task_edges(range(1, 6))
+        self.assertEqual(
+            sorted((e["TaskID"], e["DependsOnTaskID"]) for e in found),
+            [(2, 1), (3, 2), (4, 3), (5, 4)],
+        )
+
+    def test_migrate_legacy_skips_cycles_and_copies(self):
+        """Comma-separated values become edges; cycle-closing ones are dropped"""
+        self.db.execute_query("UPDATE Tasks SET Dependencies = '5, x' WHERE TaskID = 1")
+
+        self.assertEqual(self.store.migrate_legacy(), 4)
+        self.assertEqual(self.store.migrate_legacy(), 0)
+
+        # Task 1 is read first, so 5 -> 4 is the edge that would close the loop
+        edges = self.store.load_project_edges([1])
+        self.assertEqual(
+            sorted((e["TaskID"], e["DependsOnTaskID"]) for e in edges),
+            [(1, 5), (2, 1), (3, 2), (4, 3)],
+        )
+        self.assertTrue(self.store.creates_cycle(5, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
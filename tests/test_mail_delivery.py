@@ -0,0 +1,157 @@
+# tests/test_mail_delivery.py
+"""
+Mail Delivery Engine Tests for DENSO Project Manager Pro
+Tests pooled SMTP sessions against a local debugging SMTP server
+"""
+
+import unittest
+import sys
+import os
+import socketserver
+import threading
+from email.message import EmailMessage
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.mail_delivery import MailDeliveryEngine
+
+
+class DebuggingSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP sink: accepts everything, optionally defers a recipient"""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 localhost debugging server")
+        recipient = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command.split(":", 1)[1].strip("<> ")
+                with server.lock:
+                    deferred = recipient in server.defer_once
+                    server.defer_once.discard(recipient)
+                if deferred:
+                    self.reply("451 Try again later")
+                else:
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server.lock:
+                    server.delivered.append(recipient)
+                self.reply("250 Queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+class DebuggingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DebuggingSMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.delivered = []
+        self.defer_once = set()
+
+
+class TestMailDeliveryEngine(unittest.TestCase):
+    """Delivery over persistent sessions, backpressure and retries"""
+
+    def setUp(self):
+        """Start a local SMTP server"""
+        self.server = DebuggingSMTPServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def message(self, i: int) -> EmailMessage:
+        msg = EmailMessage()
+        msg["From"] = "noreply@denso.com"
+        msg["To"] = f"user{i}@denso.com"
+        msg["Subject"] = f"Notification {i}"
+        msg.set_content("body")
+        return msg
+
+    def engine(self, **kwargs) -> MailDeliveryEngine:
+        return MailDeliveryEngine(
+            "127.0.0.1", self.port, use_tls=False, backoff=0.01, **kwargs
+        )
+
+    def test_reuses_sessions(self):
+        """Many messages share the pool's sessions"""
+        engine = self.engine(pool_size=2, queue_size=20)
+        for i in range(200):
+            self.assertTrue(engine.submit(self.message(i)))
+        self.assertTrue(engine.flush(timeout=30))
+        engine.close()
+
+        self.assertEqual(engine.stats.sent, 200)
+        self.assertEqual(len(self.server.delivered), 200)
+        self.assertLessEqual(self.server.connections, 2)
+
+    def test_retries_transient_failures(self):
+        """A 4xx reply is retried; the message is still delivered once"""
+        self.server.defer_once.add("user1@denso.com")
+        engine = self.engine(pool_size=1)
+        for i in range(3):
+            engine.submit(self.message(i))
+        self.assertTrue(engine.flush(timeout=30))
+        engine.close()
+
+        self.assertEqual(engine.stats.retried, 1)
+        self.assertEqual(engine.stats.failed, 0)
+        self.assertEqual(sorted(self.server.delivered).count("user1@denso.com"), 1)
+        self.assertEqual(len(self.server.delivered), 3)
+
+    def test_configuration_errors_are_not_retried(self):
+        """A server without STARTTLS fails each message once, without retries"""
+        engine = MailDeliveryEngine(
+            "127.0.0.1", self.port, use_tls=True, backoff=0.01, pool_size=1
+        )
+        for i in range(3):
+            engine.submit(self.message(i))
+        self.assertTrue(engine.flush(timeout=30))
+        engine.close()
+
+        self.assertEqual(engine.stats.retried, 0)
+        self.assertEqual(engine.stats.failed, 3)
+        self.assertEqual(self.server.delivered, [])
+
+    def test_backpressure(self):
+        """A full queue rejects non-blocking submits"""
+        engine = self.engine(queue_size=1)
+        # No workers yet: fill the queue directly
+        engine._workers = [threading.current_thread()]
+        self.assertTrue(engine.submit(self.message(0), block=False))
+        self.assertFalse(engine.submit(self.message(1), block=False))
+        self.assertEqual(engine.pending, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/test_notification_broker.py
+"""
+Notification Broker Tests for DENSO Project Manager Pro
+Tests sequence numbers, ring-buffer overflow and idle expiry
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.notification_broker import NotificationBroker, user_topic
+
+
+class TestNotificationBroker(unittest.TestCase):
+    """Publish/poll behaviour shared by every session"""
+
+    def setUp(self):
+        """A small broker so overflow is easy to reach"""
+        self.broker = NotificationBroker(buffer_size=3, idle_timeout=60)
+        self.topic = user_topic(1)
+
+    def test_poll_since(self):
+        """Only messages newer than ``since`` come back, and only once"""
+        sub = self.broker.subscribe(self.topic)
+        for i in range(3):
+            self.broker.publish(self.topic, {"i": i})
+        self.broker.publish(user_topic(2), {"other": True})
+
+        messages = self.broker.poll(sub, since=1)
+        self.assertEqual([m.sequence for m in messages], [2, 3])
+        self.assertEqual([m.payload["i"] for m in messages], [1, 2])
+        self.assertEqual(self.broker.poll(sub, since=3), [])
+
+    def test_overflow_counts_dropped(self):
+        """A full buffer keeps the newest messages and counts the rest"""
+        sub = self.broker.subscribe(self.topic)
+        for i in range(5):
+            self.broker.publish(self.topic, {"i": i})
+
+        self.assertEqual(self.broker.stats()["dropped"], 2)
+        self.assertEqual([m.sequence for m in self.broker.poll(sub)], [3, 4, 5])
+
+    def test_resubscribe_after_expiry(self):
+        """Idle subscriptions go on the next publish; a new one starts fresh"""
+        sub = self.broker.subscribe(self.topic)
+        later = time.monotonic() + 120
+        with patch("modules.notification_broker.time.monotonic", return_value=later):
+            self.broker.publish(self.topic, {"i": 0})
+
+        self.assertFalse(self.broker.is_subscribed(sub, self.topic))
+        self.assertEqual(self.broker.poll(sub), [])
+        self.assertEqual(self.broker.stats()["subscriptions"], 0)
+
+        again = self.broker.subscribe(self.topic)
+        self.assertNotEqual(again, sub)
+        self.broker.publish(self.topic, {"i": 1})
+        self.assertEqual([m.payload["i"] for m in self.broker.poll(again)], [1])
+
+    def test_subscribe_from_latest_sequence(self):
+        """A new session sees only events after it subscribed"""
+        self.broker.publish(self.topic, {"i": 0})
+        self.broker.publish(self.topic, {"i": 1})
+
+        # What poll_realtime_notifications stores for a new session
+        sub = self.broker.subscribe(self.topic)
+        since = self.broker.latest_sequence(self.topic)
+        self.assertEqual(since, 2)
+        self.assertEqual(self.broker.poll(sub, since), [])
+
+        self.broker.publish(self.topic, {"i": 2})
+        messages = self.broker.poll(sub, since)
+        self.assertEqual([(m.sequence, m.payload["i"]) for m in messages], [(3, 2)])
+
+    def test_concurrent_publishers(self):
+        """Sequences stay gap-free and ordered under concurrent publishes"""
+        broker = NotificationBroker(buffer_size=1000)
+        sub = broker.subscribe(self.topic)
+
+        def publish():
+            for i in range(200):
+                broker.publish(self.topic, {"i": i})
+
+        threads = [threading.Thread(target=publish) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sequences = [m.sequence for m in broker.poll(sub)]
+        self.assertEqual(sequences, list(range(1, 801)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# tests/test_notification_counters.py
+"""
+Notification Counter Tests for DENSO Project Manager Pro
+Tests counter deltas, lazy seeding and batched retention against in-memory SQLite
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.notification_counters import NotificationCounterStore, row_deltas
+from tests.helpers import NOTIFICATIONS_SCHEMA, SQLiteDatabase
+
+
+class TestNotificationCounters(unittest.TestCase):
+    """Counters stay equal to a recount of the Notifications table"""
+
+    def setUp(self):
+        """Empty notification and counter tables"""
+        self.db = SQLiteDatabase(NOTIFICATIONS_SCHEMA)
+        self.counters = NotificationCounterStore(self.db)
+
+    def insert(self, user_id, priority="medium", is_read=0, days_ago=0):
+        """Insert rows the way NotificationManager does, counters included"""
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO Notifications (UserID, Type, Title, Message, Priority,
+                    IsRead, CreatedDate)
+                VALUES (?, 'system_alert', 'Alert', 'message', ?, ?, ?)
+                """,
+                (user_id, priority, is_read, datetime.now() - timedelta(days=days_ago)),
+            )
+            self.counters.apply(cursor, row_deltas([(user_id, is_read, priority)]))
+            return cursor.lastrowid
+
+    def recount(self, user_id):
+        rows = self.db.execute_query(
+            "SELECT IsRead, Priority FROM Notifications WHERE UserID = ?", (user_id,)
+        )
+        return {
+            "total_notifications": len(rows),
+            "unread_count": sum(1 for row in rows if not row["IsRead"]),
+            "critical_count": sum(1 for row in rows if row["Priority"] == "critical"),
+        }
+
+    def test_row_deltas(self):
+        """Inserted rows count up, deleted rows count down"""
+        rows = [(1, 0, "critical"), (1, 1, "low"), (2, 0, "medium")]
+        self.assertEqual(row_deltas(rows), {1: (2, 1, 1), 2: (1, 1, 0)})
+        self.assertEqual(row_deltas(rows[:1], sign=-1), {1: (-1, -1, -1)})
+
+    def test_lazy_seed(self):
+        """Writes before the first read are picked up by the seed"""
+        self.insert(1, "critical")
+        self.insert(1, is_read=1)
+        self.assertEqual(self.db.execute_query("SELECT * FROM NotificationCounters"), [])
+
+        self.assertEqual(self.counters.get(1), self.recount(1))
+        self.assertEqual(self.counters.get(99), self.recount(99))
+
+    def test_read_and_delete_deltas(self):
+        """Mark read, mark all read and delete keep the counts exact"""
+        self.counters.get(1)
+        first = self.insert(1, "critical")
+        second = self.insert(1)
+        self.insert(1)
+
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                "UPDATE Notifications SET IsRead = 1 WHERE NotificationID = ? AND IsRead = 0",
+                (second,),
+            )
+            self.counters.apply(cursor, {1: (0, -cursor.rowcount, 0)})
+        self.assertEqual(self.counters.get(1), self.recount(1))
+
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                "SELECT UserID, IsRead, Priority FROM Notifications WHERE NotificationID = ?",
+                (first,),
+            )
+            row = tuple(cursor.fetchone())
+            cursor.execute("DELETE FROM Notifications WHERE NotificationID = ?", (first,))
+            self.counters.apply(cursor, row_deltas([row], sign=-1))
+        self.assertEqual(self.counters.get(1), self.recount(1))
+
+        with self.db.transaction() as cursor:
+            cursor.execute("UPDATE Notifications SET IsRead = 1 WHERE UserID = 1 AND IsRead = 0")
+            self.counters.apply(cursor, {1: (0, -cursor.rowcount, 0)})
+        self.assertEqual(
+            self.counters.get(1),
+            {"total_notifications": 2, "unread_count": 0, "critical_count": 0},
+        )
+
+    def test_totals_are_read_only(self):
+        """Totals only read counter rows; seeding fills in older users"""
+        self.counters.seed_user(1)
+        self.insert(1)
+        self.insert(2, is_read=1)
+        self.insert(3)
+
+        totals = self.counters.totals()
+        self.assertEqual((totals["total_notifications"], totals["total_users"]), (1, 1))
+        self.assertEqual(
+            len(self.db.execute_query("SELECT * FROM NotificationCounters")), 1
+        )
+
+        self.assertEqual(self.counters.seed_missing(), 2)
+        totals = self.counters.totals()
+        self.assertEqual(totals["total_notifications"], 3)
+        self.assertEqual(totals["unread_count"], 2)
+        self.assertEqual(totals["total_users"], 3)
+
+    def test_purge_batches_and_pauses(self):
+        """Old rows go in full batches with a pause between, counters follow"""
+        self.counters.get(1)
+        self.counters.get(2)
+        for i in range(25):
+            self.insert(1 + i % 2, "critical" if i % 5 == 0 else "low", days_ago=40)
+        for _ in range(3):
+            self.insert(1)
+
+        cutoff = datetime.now() - timedelta(days=30)
+        with patch("modules.notification_counters.time.sleep") as sleep:
+            self.assertEqual(
+                self.counters.purge(cutoff, batch_size=10, max_batches=1), (10, 1)
+            )
+            sleep.assert_not_called()
+            self.assertEqual(
+                self.counters.purge(cutoff, batch_size=10, pause_seconds=0.5), (15, 2)
+            )
+            sleep.assert_called_once_with(0.5)
+            self.assertEqual(self.counters.purge(cutoff, batch_size=10), (0, 1))
+
+        self.assertEqual(self.counters.get(1), self.recount(1))
+        self.assertEqual(self.counters.get(2), self.recount(2))
+        self.assertEqual(self.counters.get(1)["total_notifications"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
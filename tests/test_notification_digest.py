@@ -0,0 +1,108 @@
+# tests/test_notification_digest.py
+"""
+Notification Digest Tests for DENSO Project Manager Pro
+Tests coalescing and the digest queue against an in-memory SQLite table
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.notification_digest import NotificationCoalescer
+from tests.helpers import NOTIFICATIONS_SCHEMA, SQLiteDatabase
+
+
+class TestNotificationCoalescer(unittest.TestCase):
+    """Merging bursts about one task without losing emails"""
+
+    def setUp(self):
+        """One user with a notification table and a 15 minute window"""
+        self.db = SQLiteDatabase(NOTIFICATIONS_SCHEMA)
+        self.db.execute_query(
+            "INSERT INTO Users (UserID, Email, FirstName, LastName) "
+            "VALUES (1, 'somchai@denso.com', 'Somchai', 'K')"
+        )
+        self.coalescer = NotificationCoalescer(self.db, window_minutes=15)
+
+    def add(self, priority, email_digest, minutes_ago=0, is_email_sent=0):
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO Notifications (UserID, Type, Title, Message, Priority,
+                    EmailDigest, IsEmailSent, CoalesceKey, CreatedDate)
+                VALUES (1, 'task_updated', 'Updated', 'first', ?, ?, ?, 'task:7', ?)
+                """,
+                (
+                    priority,
+                    email_digest,
+                    is_email_sent,
+                    datetime.now() - timedelta(minutes=minutes_ago),
+                ),
+            )
+            return cursor.lastrowid
+
+    def merge(self, priority, email_digest=False):
+        return self.coalescer.merge(
+            1, "task:7", "task_updated", "Updated", "second", priority, email_digest
+        )
+
+    def test_event_after_immediate_email_is_still_emailed(self):
+        """A row whose email was queued never absorbs the next event"""
+        emailed = self.add("medium", email_digest=0)
+        with self.db.transaction() as cursor:
+            NotificationCoalescer.mark_emailed(cursor, [emailed])
+
+        # The caller emails medium notifications right away, so it inserts
+        self.assertFalse(
+            self.coalescer.should_coalesce("task:7", "medium", immediate_email=True)
+        )
+        # Even a digest event does not fold into the emailed row
+        self.assertIsNone(self.merge("low", email_digest=True))
+        self.assertTrue(self.coalescer.should_coalesce("task:7", "low"))
+
+    def test_burst_with_email_disabled(self):
+        """Rows that never owed an email merge every event of a burst"""
+        first = self.add("medium", email_digest=0)
+        for count in range(2, 6):
+            self.assertEqual(self.merge("medium"), (first, count))
+
+        # A digest event merged into such a row still reaches the digest
+        self.assertEqual(self.merge("low", email_digest=True), (first, 6))
+        row = self.db.fetch_one(
+            "SELECT EmailDigest, Message FROM Notifications WHERE NotificationID = ?",
+            (first,),
+        )
+        self.assertEqual((row["EmailDigest"], row["Message"]), (1, "second"))
+
+    def test_merges_into_latest_waiting_digest_row(self):
+        """Digest rows in the window merge, newest first; high stays separate"""
+        self.add("low", email_digest=1, minutes_ago=30)
+        older = self.add("low", email_digest=1, minutes_ago=10)
+        latest = self.add("low", email_digest=1, minutes_ago=1)
+
+        self.assertEqual(self.merge("low"), (latest, 2))
+        self.assertEqual(self.merge("low"), (latest, 3))
+        self.assertFalse(self.coalescer.should_coalesce("task:7", "high"))
+
+        # Once the digest goes out the row is closed for merging
+        with self.db.transaction() as cursor:
+            NotificationCoalescer.mark_digested(cursor, [latest], [])
+        self.assertEqual(self.merge("low"), (older, 2))
+
+    def test_pending_digest_items(self):
+        """Only users whose oldest waiting item is old enough are due"""
+        self.add("low", email_digest=1, minutes_ago=90)
+        self.add("low", email_digest=1, minutes_ago=5)
+        self.add("medium", email_digest=0, minutes_ago=90)
+
+        due = self.coalescer.pending_digest_items(min_age_minutes=60)
+        self.assertEqual([len(items) for items in due.values()], [2])
+        self.assertEqual(self.coalescer.pending_digest_items(min_age_minutes=120), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# tests/test_notification_outbox.py
+"""
+Notification Outbox Tests for DENSO Project Manager Pro
+Tests claiming, retries and visibility timeouts against an in-memory SQLite table
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.notification_outbox import NotificationOutbox, OutboxDispatcher
+from tests.helpers import SQLiteDatabase
+
+
+OUTBOX_SCHEMA = """
+    CREATE TABLE NotificationOutbox (
+        OutboxID INTEGER PRIMARY KEY AUTOINCREMENT,
+        Channel TEXT NOT NULL,
+        UserID INTEGER,
+        NotificationID INTEGER,
+        Payload TEXT NOT NULL,
+        Status TEXT DEFAULT 'Pending',
+        Attempts INTEGER DEFAULT 0,
+        AvailableAt TIMESTAMP,
+        ClaimedBy TEXT,
+        LastError TEXT,
+        CreatedAt TIMESTAMP,
+        DeliveredAt TIMESTAMP
+    );
+"""
+
+
+class SQLiteOutboxDatabase(SQLiteDatabase):
+    """SQLite database with just the outbox table"""
+
+    def __init__(self):
+        super().__init__(OUTBOX_SCHEMA)
+
+    def statuses(self):
+        return dict(
+            self.connection.execute("SELECT OutboxID, Status FROM NotificationOutbox")
+        )
+
+
+class TestNotificationOutbox(unittest.TestCase):
+    """Claim, complete, fail and reclaim outbox rows"""
+
+    def setUp(self):
+        """Create an outbox with three pending emails"""
+        self.db = SQLiteOutboxDatabase()
+        self.outbox = NotificationOutbox(
+            self.db, visibility_timeout=60, max_attempts=2, backoff_seconds=0
+        )
+        self.outbox.enqueue_now(
+            [("email", i, 100 + i, {"to_email": f"user{i}@denso.com"}) for i in range(3)]
+        )
+
+    def test_rolled_back_enqueue_leaves_nothing(self):
+        """Rows written on a failed transaction are never delivered"""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction() as cursor:
+                self.outbox.enqueue(cursor, [("email", 9, 109, {})])
+                raise RuntimeError("notification insert failed")
+        self.assertEqual(len(self.db.statuses()), 3)
+
+    def test_claim_hides_rows_until_timeout(self):
+        """Claimed rows are invisible to other workers until the timeout lapses"""
+        rows = self.outbox.claim(2, "worker-a")
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["Payload"]["to_email"], "user0@denso.com")
+        self.assertEqual(len(self.outbox.claim(10, "worker-b")), 1)
+        self.assertEqual(self.outbox.claim(10, "worker-b"), [])
+
+        # worker-a died: expire its claim and the rows come back
+        self.db.connection.execute(
+            "UPDATE NotificationOutbox SET AvailableAt = ? WHERE ClaimedBy = 'worker-a'",
+            (datetime.now() - timedelta(seconds=1),),
+        )
+        reclaimed = self.outbox.claim(10, "worker-c")
+        self.assertEqual(len(reclaimed), 2)
+        self.assertTrue(all(row["Attempts"] == 2 for row in reclaimed))
+
+    def test_dispatcher_completes_and_retries(self):
+        """Delivered rows finish, failures retry until max_attempts"""
+        calls = []
+
+        def handler(rows):
+            calls.append(len(rows))
+            return {
+                row["OutboxID"]: None if row["UserID"] else "mailbox unavailable"
+                for row in rows
+            }
+
+        dispatcher = OutboxDispatcher(self.outbox, {"email": handler}, batch_size=10)
+        self.assertEqual(dispatcher.run_once(), 3)
+        self.assertEqual(dispatcher.run_once(), 1)
+        self.assertEqual(dispatcher.run_once(), 0)
+
+        self.assertEqual(calls, [3, 1])
+        self.assertEqual(
+            sorted(self.db.statuses().values()), ["Delivered", "Delivered", "Failed"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
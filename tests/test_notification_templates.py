@@ -0,0 +1,75 @@
+# tests/test_notification_templates.py
+"""
+Notification Template Tests for DENSO Project Manager Pro
+Tests compiled rendering, locale validation and batch rendering
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.notification_templates import CompiledTemplate, NotificationTemplateRegistry
+
+
+class TestNotificationTemplates(unittest.TestCase):
+    """Template registry behaviour"""
+
+    def setUp(self):
+        """Register a template with English and broken German locales"""
+        self.registry = NotificationTemplateRegistry(
+            {
+                "task_assigned": {
+                    "title": "งานใหม่ได้รับมอบหมาย",
+                    "in_app": 'งาน "{task_title}" ในโครงการ "{project_name}"',
+                    "email_subject": "DENSO - {task_title}",
+                    "email_body": "<p>สวัสดี {user_name}</p>",
+                    "locales": {
+                        "en": {"in_app": 'Task "{task_title}"'},
+                        "de": {"in_app": "Aufgabe {task_name}"},
+                    },
+                }
+            }
+        )
+
+    def test_matches_str_format(self):
+        """Compiled rendering gives the same text as str.format"""
+        values = {"x": 1.5, "name": "DENSO", "items": [1, 2]}
+        for source in [
+            "plain {{braces}}",
+            "{name} {x:.2f} {name!r:>10}",
+            "{items[1]} of {name.lower}",
+        ]:
+            self.assertEqual(
+                CompiledTemplate(source).render(values), source.format(**values)
+            )
+
+    def test_locale_fallback_and_validation(self):
+        """Unknown variables reject a locale; region codes fall back to the language"""
+        english = self.registry.get("task_assigned", "en-US")
+        self.assertEqual(english.render("in_app", {"task_title": "A"}), 'Task "A"')
+        # "de" needs task_name, which the default never uses
+        german = self.registry.get("task_assigned", "de")
+        self.assertIs(german, self.registry.get("task_assigned"))
+        self.assertEqual(german.required, {"task_title", "project_name", "user_name"})
+
+    def test_render_batch(self):
+        """Shared parts render once per locale, recipient fields per user"""
+        data = {"task_title": "Review", "project_name": "SDX"}
+        recipients = [
+            {"FirstName": "Somchai", "LastName": "K", "Language": "th"},
+            {"FirstName": "Anna", "LastName": "B", "Language": "en"},
+        ]
+        rendered = self.registry.render_batch(
+            "task_assigned", data, recipients, ["in_app", "email_body"]
+        )
+        self.assertEqual(rendered[0]["in_app"], 'งาน "Review" ในโครงการ "SDX"')
+        self.assertEqual(rendered[1]["in_app"], 'Task "Review"')
+        self.assertEqual(rendered[0]["email_body"], "<p>สวัสดี Somchai K</p>")
+        self.assertEqual(rendered[1]["email_body"], "<p>สวัสดี Anna B</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
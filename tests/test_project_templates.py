@@ -0,0 +1,184 @@
+# tests/test_project_templates.py
+"""
+Project Template Tests for DENSO Project Manager Pro
+Tests template validation and bulk instantiation against in-memory SQLite
+"""
+
+import unittest
+import sys
+import os
+import json
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.project_templates import ProjectTemplateEngine
+from tests.helpers import SQLiteDatabase
+
+PROJECTS_SCHEMA = """
+    CREATE TABLE ProjectTemplates (
+        TemplateID INTEGER PRIMARY KEY, TemplateName TEXT, ProjectType TEXT,
+        DefaultDuration INTEGER, TemplateData TEXT, IsActive INTEGER DEFAULT 1
+    );
+    CREATE TABLE Projects (
+        ProjectID INTEGER PRIMARY KEY AUTOINCREMENT,
+        ProjectCode TEXT UNIQUE, Name TEXT, Description TEXT,
+        StartDate DATE, EndDate DATE, Status TEXT, Priority TEXT, Type TEXT,
+        Category TEXT, Budget REAL, RiskLevel TEXT, ProjectManager INTEGER,
+        TemplateID INTEGER, CreatedBy INTEGER, CreatedAt TIMESTAMP, UpdatedAt TIMESTAMP
+    );
+    CREATE TABLE ProjectMilestones (
+        MilestoneID INTEGER PRIMARY KEY AUTOINCREMENT,
+        ProjectID INTEGER, Name TEXT, Description TEXT, DueDate DATE, Status TEXT,
+        BudgetAllocation REAL, CreatedBy INTEGER, CreatedAt TIMESTAMP
+    );
+    CREATE TABLE Tasks (
+        TaskID INTEGER PRIMARY KEY AUTOINCREMENT,
+        TaskCode TEXT, Title TEXT, Description TEXT, ProjectID INTEGER,
+        ParentTaskID INTEGER, AssignedTo INTEGER, Status TEXT, Priority TEXT,
+        Type TEXT, EstimatedHours REAL, StartDate DATE, DueDate DATE,
+        MilestoneID INTEGER, CompletionPercentage INTEGER,
+        CreatedBy INTEGER, CreatedAt TIMESTAMP, UpdatedAt TIMESTAMP
+    );
+    CREATE TABLE TaskDependencies (
+        DependencyID INTEGER PRIMARY KEY AUTOINCREMENT,
+        TaskID INTEGER, DependsOnTaskID INTEGER,
+        DependencyType TEXT CHECK (DependencyType IN ('finish_to_start',
+            'start_to_start', 'finish_to_finish', 'start_to_finish')),
+        LagDays INTEGER, CreatedBy INTEGER, CreatedAt TIMESTAMP,
+        UNIQUE (TaskID, DependsOnTaskID)
+    );
+    CREATE TABLE ProjectTeamMembers (
+        ProjectID INTEGER, UserID INTEGER, Role TEXT, AllocationPercentage REAL,
+        Status TEXT, AddedBy INTEGER, AddedAt TIMESTAMP,
+        UNIQUE (ProjectID, UserID)
+    );
+"""
+
+TEMPLATE_DATA = {
+    "milestones": [
+        {"key": "design", "name": "Design Freeze", "offset_days": 20},
+        {"key": "launch", "name": "Launch", "offset_days": 60},
+    ],
+    "tasks": [
+        {"key": "spec", "title": "Specification", "milestone": "design"},
+        {"key": "sub", "title": "Sub-spec", "parent": "spec", "role": "Engineer"},
+        {"key": "leaf", "title": "Review", "parent": "sub", "depends_on": ["sub"]},
+        {
+            "key": "build",
+            "title": "Build",
+            "offset_days": 21,
+            "milestone": "launch",
+            "depends_on": [{"key": "spec", "type": "start_to_start", "lag_days": 2}],
+        },
+    ],
+    "team": [{"role": "Engineer", "allocation": 50}],
+}
+
+
+class TestProjectTemplates(unittest.TestCase):
+    """Validation and level-by-level instantiation"""
+
+    def setUp(self):
+        """One active three-level template"""
+        self.db = SQLiteDatabase(PROJECTS_SCHEMA)
+        self.db.execute_query(
+            "INSERT INTO ProjectTemplates VALUES (1, 'Product', 'Development', 60, ?, 1)",
+            (json.dumps(TEMPLATE_DATA),),
+        )
+        self.engine = ProjectTemplateEngine(self.db)
+
+    def compile(self, tasks):
+        return ProjectTemplateEngine.compile_template(1, "T", None, 30, {"tasks": tasks})
+
+    def test_rejects_bad_dependencies(self):
+        """Unknown dependency types and duplicate edges fail at compile time"""
+        with self.assertRaises(ValueError):
+            self.compile(
+                [{"key": "a", "title": "A"},
+                 {"key": "b", "title": "B", "depends_on": [{"key": "a", "type": "after"}]}]
+            )
+        with self.assertRaises(ValueError):
+            self.compile(
+                [{"key": "a", "title": "A"},
+                 {"key": "b", "title": "B", "depends_on": ["a", {"key": "a", "lag_days": 1}]}]
+            )
+
+    def test_instantiates_two_projects(self):
+        """Parents, milestones and dependencies point at each project's own rows"""
+        results = self.engine.instantiate_many(
+            1,
+            [
+                {"Name": "Alpha", "StartDate": date(2026, 1, 5), "ProjectManager": 10,
+                 "TeamAssignments": {"Engineer": 20}},
+                {"Name": "Beta", "StartDate": "2026-02-02", "ProjectManager": 11},
+            ],
+            created_by=10,
+        )
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len({r["ProjectCode"] for r in results}), 2)
+
+        for r in results:
+            tasks = {
+                row["TaskID"]: row
+                for row in self.db.fetch_all(
+                    "SELECT * FROM Tasks WHERE ProjectID = ?", (r["ProjectID"],)
+                )
+            }
+            ids = r["TaskIDs"]
+            self.assertEqual(set(ids.values()), set(tasks))
+            self.assertIsNone(tasks[ids["spec"]]["ParentTaskID"])
+            self.assertEqual(tasks[ids["sub"]]["ParentTaskID"], ids["spec"])
+            self.assertEqual(tasks[ids["leaf"]]["ParentTaskID"], ids["sub"])
+            self.assertEqual(tasks[ids["spec"]]["MilestoneID"], r["MilestoneIDs"]["design"])
+            self.assertEqual(tasks[ids["build"]]["MilestoneID"], r["MilestoneIDs"]["launch"])
+
+            milestones = self.db.fetch_all(
+                "SELECT MilestoneID FROM ProjectMilestones WHERE ProjectID = ?",
+                (r["ProjectID"],),
+            )
+            self.assertEqual(
+                {m["MilestoneID"] for m in milestones}, set(r["MilestoneIDs"].values())
+            )
+
+            edges = self.db.fetch_all(
+                """
+                SELECT td.TaskID, td.DependsOnTaskID, td.DependencyType, td.LagDays
+                FROM TaskDependencies td JOIN Tasks t ON t.TaskID = td.TaskID
+                WHERE t.ProjectID = ?
+                """,
+                (r["ProjectID"],),
+            )
+            self.assertCountEqual(
+                [tuple(e.values()) for e in edges],
+                [
+                    (ids["leaf"], ids["sub"], "finish_to_start", 0),
+                    (ids["build"], ids["spec"], "start_to_start", 2),
+                ],
+            )
+
+        self.assertEqual(
+            self.db.fetch_one(
+                "SELECT AssignedTo FROM Tasks WHERE TaskID = ?",
+                (results[0]["TaskIDs"]["sub"],),
+            )["AssignedTo"],
+            20,
+        )
+
+    def test_project_codes_skip_deleted_numbers(self):
+        """Codes continue after the highest suffix, not the row count"""
+        project = {"Name": "Alpha", "StartDate": "2026-01-05", "ProjectManager": 10}
+        first, second = self.engine.instantiate_many(1, [project, project], 10)
+        self.db.execute_query(
+            "DELETE FROM Projects WHERE ProjectID = ?", (first["ProjectID"],)
+        )
+
+        third = self.engine.instantiate(1, project, 10)
+        self.assertEqual(first["ProjectCode"][-3:], "001")
+        self.assertEqual(second["ProjectCode"][-3:], "002")
+        self.assertEqual(third["ProjectCode"][-3:], "003")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# tests/test_rescheduler.py
+"""
+Incremental Rescheduler Tests for DENSO Project Manager Pro
+Tests that single-task edits match a full CPM recomputation
+"""
+
+import unittest
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.critical_path import CriticalPathEngine, START_TO_START
+from modules.rescheduler import IncrementalRescheduler
+
+
+class TestIncrementalRescheduler(unittest.TestCase):
+    """Compare incremental state against CriticalPathEngine.compute"""
+
+    def setUp(self):
+        """Set up a random layered network"""
+        rng = random.Random(7)
+        self.n = 400
+        self.base = date(2025, 1, 1)
+        self.durations = [rng.randint(1, 6) for _ in range(self.n)]
+        self.earliest = [rng.randint(0, 40) for _ in range(self.n)]
+        self.preds, self.succs, self.kinds, self.lags = [], [], [], []
+        for s in range(1, self.n):
+            for p in rng.sample(range(max(0, s - 30), s), min(s, 2)):
+                self.preds.append(p)
+                self.succs.append(s)
+                self.kinds.append(START_TO_START if rng.random() < 0.2 else 0)
+                self.lags.append(rng.randint(0, 2))
+        self.ids = [f"task_{i}" for i in range(self.n)]
+
+    def full(self, durations, earliest):
+        return CriticalPathEngine().compute(
+            durations,
+            self.preds,
+            self.succs,
+            self.lags,
+            self.kinds,
+            earliest,
+            self.ids,
+            self.base,
+        )
+
+    def test_edits_match_full_recompute(self):
+        """Random start/duration edits leave the same dates and float"""
+        engine = IncrementalRescheduler(
+            self.durations,
+            self.preds,
+            self.succs,
+            self.lags,
+            self.kinds,
+            self.earliest,
+            self.ids,
+            self.base,
+        )
+        durations = list(self.durations)
+        earliest = list(self.earliest)
+        rng = random.Random(11)
+        previous = {r["id"]: r for r in self.full(durations, earliest).to_records()}
+
+        for _ in range(40):
+            i = rng.randrange(self.n)
+            new_start = rng.randint(0, 60)
+            new_duration = rng.randint(1, 8)
+            earliest[i] = new_start
+            durations[i] = new_duration
+            result = engine.reschedule(
+                self.ids[i],
+                start=self.base + timedelta(days=new_start),
+                duration=new_duration,
+            )
+
+            expected = self.full(durations, earliest)
+            self.assertEqual(engine.es, expected.early_start.tolist())
+            self.assertEqual(engine.lf, expected.late_finish.tolist())
+            self.assertEqual(
+                engine.total_float().tolist(), expected.total_float.tolist()
+            )
+            reported = {r["id"]: r for r in result.changed}
+            for record in expected.to_records():
+                if record["id"] in reported:
+                    self.assertEqual(reported[record["id"]], record)
+                else:
+                    # Anything not reported must be unchanged
+                    self.assertEqual(previous[record["id"]], record)
+                previous[record["id"]] = record
+
+    def test_only_descendants_are_visited(self):
+        """Moving the last task of a chain touches no upstream work"""
+        n = 1000
+        engine = IncrementalRescheduler(
+            [1] * n,
+            list(range(n - 1)),
+            list(range(1, n)),
+            base_date=self.base,
+            ids=list(range(n)),
+        )
+        result = engine.reschedule(n - 1, duration=3)
+
+        self.assertLessEqual(result.visited, 3)
+        self.assertEqual(result.moved, {n - 1})
+        self.assertEqual(result.project_finish, self.base + timedelta(days=n + 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1050,23 +1050,35 @@ class ProjectsUI:
                 st.info("ไม่มีข้อมูลโครงการ")
                 return
 
-            # Prepare data for health matrix
-            health_data = []
-            for project in projects:
-                health_score = project.get("health_score", 75)
-                budget_utilization = project.get("budget_utilization", 50)
-
-                health_data.append(
-                    {
-                        "name": project["name"],
-                        "health": health_score,
-                        "budget": budget_utilization,
-                        "status": project.get("status", "Unknown"),
-                        "progress": project.get("progress", 0),
-                    }
-                )
+            # Score all projects in one vectorized pass
+            scored = self.project_manager.health_scorer.score_frame(
+                pd.DataFrame(projects),
+                columns={
+                    "start_date": "start_date",
+                    "end_date": "end_date",
+                    "completion": "progress",
+                    "task_count": "task_count",
+                    "completed_tasks": "completed_tasks",
+                },
+            )
 
-            df = pd.DataFrame(health_data)
+            df = pd.DataFrame(
+                {
+                    "name": scored["name"],
+                    "health": scored["HealthScore"],
+                    "budget": (
+                        scored["budget_utilization"]
+                        if "budget_utilization" in scored
+                        else 50
+                    ),
+                    "status": (
+                        scored["status"] if "status" in scored else "Unknown"
+                    ),
+                    "progress": (
+                        scored["progress"].fillna(0) if "progress" in scored else 0
+                    ),
+                }
+            )
 
             # Create scatter plot for health matrix
             fig = px.scatter(